@@ -0,0 +1,254 @@
+"""
+Analysis Archive
+Cold tier for bulky image analysis payloads. Once a field data entry is older
+than ANALYSIS_ARCHIVE_AFTER_DAYS, its `analysis_results` and the heavy part of
+its per-image metadata (EXIF, hashes) move into the
+`field_data_archive` collection as one zlib-compressed BSON blob. The hot
+document keeps:
+- slim image entries (id, blob_id, url, thumbnail_url, filename, ...), so
+  image serving and new analysis jobs still work
+- an `analysis_archive` summary: counts, score range, anomalies and sizes
+
+Reads that need the full payload rehydrate it from the archive in memory.
+Writes that add analyses restore it into the hot document first. With
+ANALYSIS_ARCHIVE_TTL_DAYS set, archived payloads expire and only the summary
+remains.
+
+The move is two writes without a transaction: archive first, then trim the hot
+document only if its analysis is not running. A crash in between leaves a
+spare archive copy that the next run overwrites.
+"""
+
+import asyncio
+import logging
+import os
+import zlib
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Optional
+
+import bson
+from pymongo import ReplaceOne, UpdateOne
+
+logger = logging.getLogger(__name__)
+
+# Archive configuration
+ANALYSIS_ARCHIVE_AFTER_DAYS = int(os.environ.get('ANALYSIS_ARCHIVE_AFTER_DAYS', '180'))  # 0 disables
+ANALYSIS_ARCHIVE_SECONDS = int(os.environ.get('ANALYSIS_ARCHIVE_SECONDS', '86400'))  # 0 disables the background run
+ANALYSIS_ARCHIVE_BATCH = int(os.environ.get('ANALYSIS_ARCHIVE_BATCH', '500'))
+ANALYSIS_ARCHIVE_TTL_DAYS = int(os.environ.get('ANALYSIS_ARCHIVE_TTL_DAYS', '0'))  # 0 keeps archives forever
+ANALYSIS_ARCHIVE_COMPRESSION = int(os.environ.get('ANALYSIS_ARCHIVE_COMPRESSION', '6'))  # zlib level 1-9
+
+ARCHIVE_COLLECTION = "field_data_archive"
+ARCHIVE_FIELDS = ("analysis_results", "image_metadata")
+# Image entry fields that stay on the hot document; the rest is archived
+IMAGE_SUMMARY_FIELDS = ("id", "blob_id", "url", "filename", "content_type", "size", "sha256", "uploaded_at",
+                        "thumbnail_blob_id", "thumbnail_url")
+
+
+def compress(payload: Dict[str, Any]) -> bytes:
+    return zlib.compress(bson.encode(payload), ANALYSIS_ARCHIVE_COMPRESSION)
+
+
+def decompress(blob: bytes) -> Dict[str, Any]:
+    return bson.decode(zlib.decompress(blob))
+
+
+def slim_image(image: Dict[str, Any]) -> Dict[str, Any]:
+    return {field: image[field] for field in IMAGE_SUMMARY_FIELDS if field in image}
+
+
+def archive_summary(doc: Dict[str, Any], archived_at: datetime, size: int, compressed: int) -> Dict[str, Any]:
+    """What stays on the hot document in place of the archived payload"""
+    results = doc.get("analysis_results") or []
+    scores = [result["credibility_score"] for result in results
+              if isinstance(result.get("credibility_score"), (int, float))]
+    return {
+        "archived_at": archived_at,
+        "results": len(results),
+        "images": len(doc.get("image_metadata") or []),
+        "credibility_min": min(scores) if scores else None,
+        "credibility_max": max(scores) if scores else None,
+        "anomalies": sum(1 for result in results if (result.get("analysis") or {}).get("anomalies_detected")),
+        "size_bytes": size,
+        "compressed_bytes": compressed,
+    }
+
+
+class AnalysisArchive:
+    """Moves old analysis payloads to the cold collection and brings them back"""
+
+    def __init__(self, db, after_days: int = ANALYSIS_ARCHIVE_AFTER_DAYS,
+                 interval: int = ANALYSIS_ARCHIVE_SECONDS, ttl_days: int = ANALYSIS_ARCHIVE_TTL_DAYS):
+        self.db = db
+        self.archive = db[ARCHIVE_COLLECTION]
+        self.after_days = after_days
+        self.interval = interval
+        self.ttl_days = ttl_days
+        self.task: Optional[asyncio.Task] = None
+
+    def candidates(self, older_than: datetime) -> Dict[str, Any]:
+        return {
+            "created_at": {"$lt": older_than},
+            "analysis_results.0": {"$exists": True},
+            "analysis_archive": None,
+            "analysis_status": {"$ne": "pending"},  # a queued job would write into the archived fields
+        }
+
+    async def archive_batch(self, older_than: datetime, limit: int = ANALYSIS_ARCHIVE_BATCH) -> Dict[str, int]:
+        """Archive up to `limit` eligible entries"""
+        docs = await self.db.field_data.find(
+            self.candidates(older_than),
+            {"_id": 0, "id": 1, "project_id": 1, "created_at": 1, **{field: 1 for field in ARCHIVE_FIELDS}}
+        ).limit(limit).to_list(limit)
+        if not docs:
+            return {"archived": 0, "skipped": 0, "bytes_before": 0, "bytes_after": 0}
+
+        archived_at = datetime.now(timezone.utc)
+        expire_at = archived_at + timedelta(days=self.ttl_days) if self.ttl_days > 0 else None
+        cold, hot, summaries = [], [], {}
+        for doc in docs:
+            payload = {field: doc.get(field) or [] for field in ARCHIVE_FIELDS}
+            blob = compress(payload)
+            summary = archive_summary(doc, archived_at, len(bson.encode(payload)), len(blob))
+            summaries[doc["id"]] = summary
+            cold.append(ReplaceOne({"field_data_id": doc["id"]}, {
+                "field_data_id": doc["id"],
+                "project_id": doc.get("project_id"),
+                "created_at": doc.get("created_at"),
+                "archived_at": archived_at,
+                "expire_at": expire_at,
+                "codec": "zlib+bson",
+                "payload": bson.Binary(blob),
+            }, upsert=True))
+            hot.append(UpdateOne(
+                {"id": doc["id"], "analysis_archive": None, "analysis_status": {"$ne": "pending"}},
+                {
+                    "$set": {
+                        "image_metadata": [slim_image(image) for image in doc.get("image_metadata") or []],
+                        "analysis_archive": summary,
+                    },
+                    "$unset": {"analysis_results": ""},
+                }
+            ))
+
+        await self.archive.bulk_write(cold, ordered=False)
+        result = await self.db.field_data.bulk_write(hot, ordered=False)
+
+        skipped = len(docs) - result.modified_count
+        if skipped:
+            # Entries that started an analysis since they were read keep their hot payload,
+            # so their archive copy is dropped (unless another run archived them meanwhile)
+            untrimmed = [
+                doc["id"] async for doc in self.db.field_data.find(
+                    {"id": {"$in": list(summaries)}, "analysis_archive": None}, {"_id": 0, "id": 1}
+                )
+            ]
+            await self.archive.delete_many({"field_data_id": {"$in": untrimmed}, "archived_at": archived_at})
+        return {
+            "archived": result.modified_count,
+            "skipped": skipped,
+            "bytes_before": sum(summary["size_bytes"] for summary in summaries.values()),
+            "bytes_after": sum(summary["compressed_bytes"] for summary in summaries.values()),
+        }
+
+    async def run(self, older_than_days: Optional[int] = None, max_batches: Optional[int] = None) -> Dict[str, int]:
+        """Archive everything older than `older_than_days`, one batch at a time"""
+        days = self.after_days if older_than_days is None else older_than_days
+        older_than = datetime.now(timezone.utc) - timedelta(days=days)
+        totals = {"archived": 0, "skipped": 0, "bytes_before": 0, "bytes_after": 0}
+        batches = 0
+        while max_batches is None or batches < max_batches:
+            batch = await self.archive_batch(older_than)
+            for key in totals:
+                totals[key] += batch[key]
+            batches += 1
+            if batch["archived"] == 0:
+                break
+        return totals
+
+    async def load(self, field_data_id: str) -> Optional[Dict[str, Any]]:
+        """The archived payload, or None if there is none (or it expired)"""
+        doc = await self.archive.find_one({"field_data_id": field_data_id}, {"_id": 0, "payload": 1})
+        return decompress(doc["payload"]) if doc else None
+
+    async def rehydrate(self, doc: Dict[str, Any]) -> Dict[str, Any]:
+        """A copy of a field data document with its archived payload filled back in, for reads"""
+        if not doc.get("analysis_archive"):
+            return doc
+        payload = await self.load(doc["id"])
+        if payload is None:
+            return doc
+        archived_ids = {image.get("id") for image in payload["image_metadata"]}
+        return {
+            **doc,
+            "analysis_results": payload["analysis_results"] + (doc.get("analysis_results") or []),
+            "image_metadata": payload["image_metadata"] + [
+                image for image in doc.get("image_metadata") or [] if image.get("id") not in archived_ids
+            ],
+        }
+
+    async def restore(self, field_data_id: str) -> bool:
+        """Move an archived payload back into the hot document before it is written to"""
+        payload = await self.load(field_data_id)
+        if payload is None:
+            # Expired (or never archived); the summary stays and new results are added beside it
+            return False
+        archived_ids = [image.get("id") for image in payload["image_metadata"]]
+        # Images attached since archiving stay; their archived entries replace the slim copies
+        await self.db.field_data.update_one(
+            {"id": field_data_id, "analysis_archive": {"$ne": None}},
+            [{"$set": {
+                "analysis_results": {"$concatArrays": [
+                    {"$literal": payload["analysis_results"]}, {"$ifNull": ["$analysis_results", []]}
+                ]},
+                "image_metadata": {"$concatArrays": [
+                    {"$literal": payload["image_metadata"]},
+                    {"$filter": {
+                        "input": {"$ifNull": ["$image_metadata", []]},
+                        "as": "img",
+                        "cond": {"$not": [{"$in": ["$$img.id", {"$literal": archived_ids}]}]}
+                    }}
+                ]},
+                "analysis_archive": None
+            }}]
+        )
+        await self.archive.delete_one({"field_data_id": field_data_id})
+        return True
+
+    async def discard(self, field_data_id: str) -> None:
+        await self.archive.delete_one({"field_data_id": field_data_id})
+
+    def start(self) -> None:
+        if self.after_days > 0 and self.interval > 0 and self.task is None:
+            self.task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self.task:
+            self.task.cancel()
+            try:
+                await self.task
+            except asyncio.CancelledError:
+                pass
+            self.task = None
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                totals = await self.run()
+                if totals["archived"]:
+                    logger.info(f"✅ Archived analysis payloads for {totals['archived']} field data entries "
+                                f"({totals['bytes_before']} -> {totals['bytes_after']} bytes)")
+            except Exception as e:
+                logger.error(f"❌ Analysis archival failed: {e}")
+            await asyncio.sleep(self.interval)
+
+
+# Initialize singleton instance
+_analysis_archive: Optional[AnalysisArchive] = None
+
+
+def get_analysis_archive(db) -> AnalysisArchive:
+    global _analysis_archive
+    if _analysis_archive is None:
+        _analysis_archive = AnalysisArchive(db)
+    return _analysis_archive
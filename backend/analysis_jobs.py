@@ -0,0 +1,228 @@
+"""
+Analysis Job Queue
+MongoDB-backed queue for image analysis that runs after an upload has been
+acknowledged. Jobs are claimed atomically with a lease, so several API
+processes can drain the same queue and a crashed worker's job is retried
+once its lease runs out, up to ANALYSIS_JOB_MAX_ATTEMPTS attempts in all.
+A job that fails for good is handed to the `on_failed` callback, so the caller
+can record the failure where users see it. Settled jobs expire after
+ANALYSIS_JOB_TTL_DAYS.
+"""
+
+import asyncio
+import logging
+import os
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from pymongo import ReturnDocument
+
+logger = logging.getLogger(__name__)
+
+# Worker configuration
+ANALYSIS_WORKERS = int(os.environ.get('ANALYSIS_WORKERS', '2'))
+ANALYSIS_JOB_LEASE_SECONDS = int(os.environ.get('ANALYSIS_JOB_LEASE_SECONDS', '300'))
+ANALYSIS_JOB_MAX_ATTEMPTS = int(os.environ.get('ANALYSIS_JOB_MAX_ATTEMPTS', '3'))
+ANALYSIS_POLL_SECONDS = float(os.environ.get('ANALYSIS_POLL_SECONDS', '2'))
+ANALYSIS_JOB_TTL_DAYS = int(os.environ.get('ANALYSIS_JOB_TTL_DAYS', '7'))  # 0 keeps settled jobs forever
+
+TERMINAL_STATUSES = ("completed", "failed")
+
+
+def job_status(job: Dict[str, Any]) -> Dict[str, Any]:
+    """Client-facing view of a job"""
+    return {
+        "job_id": job["id"],
+        "type": job["type"],
+        "status": job["status"],
+        "field_data_id": job.get("field_data_id"),
+        "image_ids": job.get("image_ids", []),
+        "attempts": job.get("attempts", 0),
+        "created_at": job.get("created_at"),
+        "started_at": job.get("started_at"),
+        "finished_at": job.get("finished_at"),
+        "result": job.get("result"),
+        "error": job.get("error"),
+    }
+
+
+class AnalysisJobQueue:
+    """Enqueue, claim and settle jobs stored in the `analysis_jobs` collection"""
+
+    def __init__(self, collection, workers: int = ANALYSIS_WORKERS):
+        self.collection = collection
+        self.workers = workers
+        self.tasks: List[asyncio.Task] = []
+        self.wakeup = asyncio.Event()
+        self.on_failed: Optional[Callable[[Dict[str, Any]], Awaitable[None]]] = None
+
+    async def enqueue(self, job_type: str, payload: Dict[str, Any]) -> Dict[str, Any]:
+        job = {
+            "id": str(uuid.uuid4()),
+            "type": job_type,
+            "status": "queued",
+            "attempts": 0,
+            "lease_until": None,
+            "created_at": datetime.now(timezone.utc),
+            **payload,
+        }
+        await self.collection.insert_one(dict(job))
+        # Local workers pick it up immediately; other processes poll
+        self.wakeup.set()
+        return job
+
+    async def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        return await self.collection.find_one({"id": job_id}, {"_id": 0})
+
+    def _settled(self, now: datetime) -> Dict[str, Any]:
+        """Fields every settled job gets, including when the TTL index removes it"""
+        expire_at = now + timedelta(days=ANALYSIS_JOB_TTL_DAYS) if ANALYSIS_JOB_TTL_DAYS > 0 else None
+        return {"lease_until": None, "lease_id": None, "finished_at": now, "expire_at": expire_at}
+
+    async def _failed(self, job: Dict[str, Any]):
+        if self.on_failed is None:
+            return
+        try:
+            await self.on_failed(job)
+        except Exception as e:
+            logger.error(f"Could not record the failure of analysis job {job['id']}: {e}")
+
+    async def expire_exhausted(self) -> int:
+        """Fail jobs whose last allowed attempt let its lease run out (a crash or hang every time)"""
+        now = datetime.now(timezone.utc)
+        error = f"Lease expired on attempt {ANALYSIS_JOB_MAX_ATTEMPTS} of {ANALYSIS_JOB_MAX_ATTEMPTS}"
+        expired = await self.collection.find(
+            {"status": "running", "lease_until": {"$lt": now}, "attempts": {"$gte": ANALYSIS_JOB_MAX_ATTEMPTS}},
+            {"_id": 0}
+        ).to_list(None)
+        failed = 0
+        for job in expired:
+            update = await self.collection.update_one(
+                self._leased(job),
+                {"$set": {"status": "failed", "error": error, **self._settled(now)}}
+            )
+            if update.modified_count == 1:
+                failed += 1
+                await self._failed({**job, "status": "failed", "error": error})
+        return failed
+
+    async def claim(self) -> Optional[Dict[str, Any]]:
+        """
+        Atomically take the oldest runnable job, including expired leases with
+        attempts left. The returned job carries a fresh `lease_id`; only the
+        holder of that lease can settle the job.
+        """
+        await self.expire_exhausted()
+        now = datetime.now(timezone.utc)
+        return await self.collection.find_one_and_update(
+            {"$or": [
+                {"status": "queued"},
+                {"status": "running", "lease_until": {"$lt": now},
+                 "attempts": {"$lt": ANALYSIS_JOB_MAX_ATTEMPTS}},
+            ]},
+            {
+                "$set": {
+                    "status": "running",
+                    "started_at": now,
+                    "lease_until": now + timedelta(seconds=ANALYSIS_JOB_LEASE_SECONDS),
+                    "lease_id": str(uuid.uuid4()),
+                },
+                "$inc": {"attempts": 1},
+            },
+            sort=[("created_at", 1)],
+            projection={"_id": 0},
+            return_document=ReturnDocument.AFTER,
+        )
+
+    def _leased(self, job: Dict[str, Any]) -> Dict[str, Any]:
+        # Matches only while this worker still holds the lease it claimed
+        return {"id": job["id"], "status": "running", "lease_id": job.get("lease_id")}
+
+    async def complete(self, job: Dict[str, Any], result: Dict[str, Any]) -> bool:
+        """Settle a job; False if its lease was lost to another worker meanwhile"""
+        update = await self.collection.update_one(
+            self._leased(job),
+            {"$set": {
+                "status": "completed",
+                "result": result,
+                "error": None,
+                **self._settled(datetime.now(timezone.utc)),
+            }}
+        )
+        return update.modified_count == 1
+
+    async def fail(self, job: Dict[str, Any], error: str) -> bool:
+        """Requeue a failed job until it runs out of attempts; False if its lease was lost"""
+        final = job.get("attempts", 1) >= ANALYSIS_JOB_MAX_ATTEMPTS
+        if final:
+            settle = {"status": "failed", "error": error, **self._settled(datetime.now(timezone.utc))}
+        else:
+            settle = {"status": "queued", "error": error, "lease_until": None, "lease_id": None, "finished_at": None}
+        update = await self.collection.update_one(self._leased(job), {"$set": settle})
+        if update.modified_count != 1:
+            return False
+        if final:
+            await self._failed({**job, "status": "failed", "error": error})
+        return True
+
+    def start(self, handler: Callable[[Dict[str, Any]], Awaitable[Dict[str, Any]]],
+              on_failed: Optional[Callable[[Dict[str, Any]], Awaitable[None]]] = None):
+        """
+        Start background workers that run `handler` for each claimed job
+        `on_failed` gets each job that fails for good, with its final `error`
+        """
+        self.on_failed = on_failed
+        if self.tasks:
+            return
+        for i in range(self.workers):
+            self.tasks.append(asyncio.create_task(self._worker(i, handler)))
+        logger.info(f"✅ Started {self.workers} analysis job worker(s)")
+
+    async def stop(self):
+        for task in self.tasks:
+            task.cancel()
+        await asyncio.gather(*self.tasks, return_exceptions=True)
+        self.tasks = []
+
+    async def _worker(self, number: int, handler):
+        while True:
+            # Clear before claiming so an enqueue during the claim is not missed
+            self.wakeup.clear()
+            try:
+                job = await self.claim()
+            except Exception as e:
+                logger.error(f"Analysis worker {number} could not claim a job: {e}")
+                job = None
+
+            if job is None:
+                try:
+                    await asyncio.wait_for(self.wakeup.wait(), ANALYSIS_POLL_SECONDS)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            try:
+                result = await handler(job)
+                settled = await self.complete(job, result)
+            except asyncio.CancelledError:
+                # Leave the lease to expire so another worker retries the job
+                raise
+            except Exception as e:
+                logger.error(f"Analysis job {job['id']} failed (attempt {job['attempts']}): {e}")
+                settled = await self.fail(job, str(e))
+            if not settled:
+                logger.warning(f"Analysis job {job['id']} lease expired before attempt {job['attempts']} finished")
+
+
+# Initialize singleton instance
+job_queue = None
+
+def get_job_queue(db) -> AnalysisJobQueue:
+    """Get or create the analysis job queue for a database"""
+    global job_queue
+
+    if job_queue is None:
+        job_queue = AnalysisJobQueue(db.analysis_jobs)
+
+    return job_queue
@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+Benchmark analysis archival: hot field_data documents before and after their
+analysis payloads move to the cold tier (analysis_archive.py)
+Seeds field data entries carrying realistic analysis results and image metadata
+(EXIF, hashes, thumbnail references). It measures, before and after archiving:
+- collection and average document size
+- the time to read list pages of full documents
+
+It also reports archive throughput, the compression ratio, and the latency of
+the rare rehydrating read.
+
+Needs a running MongoDB; MONGO_URL defaults to mongodb://localhost:27017.
+
+Usage:
+    python benchmarks/bench_analysis_archive.py --entries 5000 --images 6
+"""
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import sys
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+
+from motor.motor_asyncio import AsyncIOMotorClient
+
+# Add backend to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from analysis_archive import AnalysisArchive
+from db_indexes import ensure_indexes
+from pagination import paginate
+
+
+def make_entry(images: int, created_at: datetime) -> dict:
+    image_metadata, analysis_results = [], []
+    for _ in range(images):
+        blob_id, thumbnail_id = uuid.uuid4().hex[:24], uuid.uuid4().hex[:24]
+        image_metadata.append({
+            "id": blob_id, "blob_id": blob_id, "url": f"/api/images/{blob_id}", "filename": "plot.jpg",
+            "content_type": "image/jpeg", "size": random.randint(2_000_000, 6_000_000),
+            "sha256": uuid.uuid4().hex * 2, "uploaded_at": created_at,
+            "width": 4032, "height": 3024, "format": "JPEG",
+            "exif": {"Make": "Apple", "Model": "iPhone 13", "DateTimeOriginal": "2024:03:01 10:30:00",
+                     "GPSInfo": {"lat": 21.9 + random.random() / 100, "lng": 89.1 + random.random() / 100},
+                     "Software": "17.2", "LensModel": "iPhone 13 back dual wide camera 5.1mm f/1.6"},
+            "phash": f"{random.getrandbits(64):016x}",
+            "thumbnail_blob_id": thumbnail_id, "thumbnail_url": f"/api/images/{thumbnail_id}",
+        })
+        analysis_results.append({
+            "image_id": blob_id, "filename": "plot.jpg",
+            "credibility_score": round(random.uniform(0.4, 0.98), 3),
+            "analysis": {"vegetation_detected": True, "anomalies_detected": random.random() < 0.1,
+                         "features": {f"feature_{i}": random.random() for i in range(24)}},
+            "exif_gps_check": {"status": "match", "distance_m": round(random.uniform(0, 40), 1)},
+            "recommendations": ["Photo metadata consistent with reported plot"],
+            "timings": {"decode_ms": 12.4, "resize_ms": 3.1, "inference_ms": 8.7},
+        })
+    return {
+        "id": str(uuid.uuid4()), "project_id": "project-0", "plot_id": f"P-{random.randint(1, 500)}",
+        "gps_coordinates": {"lat": 21.9, "lng": 89.1}, "canopy_cover": random.uniform(20, 90),
+        "images": [image["url"] for image in image_metadata], "image_metadata": image_metadata,
+        "analysis_results": analysis_results, "analysis_status": "completed", "analysis_archive": None,
+        "credibility_score": statistics.mean(result["credibility_score"] for result in analysis_results),
+        "collector_id": "collector-0", "validated": True, "created_at": created_at,
+    }
+
+
+async def collection_size(collection):
+    stats = await collection.aggregate([{"$collStats": {"storageStats": {}}}]).to_list(1)
+    storage_stats = stats[0]["storageStats"]
+    return storage_stats.get("size", 0), storage_stats.get("avgObjSize", 0), storage_stats.get("storageSize", 0)
+
+
+async def read_pages(collection, pages: int, limit: int) -> float:
+    """Milliseconds per list page of full documents, newest first"""
+    started = time.perf_counter()
+    cursor = None
+    for _ in range(pages):
+        _, cursor = await paginate(collection, {"project_id": "project-0"}, cursor, limit)
+        if not cursor:
+            break
+    return (time.perf_counter() - started) * 1000 / pages
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--entries", type=int, default=5000)
+    parser.add_argument("--images", type=int, default=6)
+    parser.add_argument("--pages", type=int, default=20)
+    parser.add_argument("--page-size", type=int, default=50)
+    parser.add_argument("--db", default="bench_analysis_archive")
+    args = parser.parse_args()
+    random.seed(42)
+
+    client = AsyncIOMotorClient(os.environ.get("MONGO_URL", "mongodb://localhost:27017"))
+    await client.drop_database(args.db)
+    db = client[args.db]
+    await ensure_indexes(db)
+
+    now = datetime.now(timezone.utc)
+    entries = [make_entry(args.images, now - timedelta(days=random.randint(200, 900))) for _ in range(args.entries)]
+    for offset in range(0, len(entries), 500):
+        await db.field_data.insert_many(entries[offset:offset + 500])
+
+    print("\n" + "=" * 60)
+    print("🧊 Analysis Archive")
+    print("=" * 60)
+    print(f"{args.entries} field data entries x {args.images} analyzed images, all older than 180 days")
+
+    size_before, avg_before, storage_before = await collection_size(db.field_data)
+    await read_pages(db.field_data, 2, args.page_size)  # warm the cache
+    page_before = await read_pages(db.field_data, args.pages, args.page_size)
+
+    archive = AnalysisArchive(db, after_days=180, interval=0)
+    started = time.perf_counter()
+    totals = await archive.run()
+    elapsed = time.perf_counter() - started
+
+    await db.command("compact", "field_data")  # return freed space so storage sizes compare
+    size_after, avg_after, storage_after = await collection_size(db.field_data)
+    page_after = await read_pages(db.field_data, args.pages, args.page_size)
+    archive_size, _, archive_storage = await collection_size(db.field_data_archive)
+
+    sample = random.sample([entry["id"] for entry in entries], min(200, len(entries)))
+    rehydrate_ms = []
+    for field_data_id in sample:
+        started = time.perf_counter()
+        doc = await db.field_data.find_one({"id": field_data_id}, {"_id": 0})
+        await archive.rehydrate(doc)
+        rehydrate_ms.append((time.perf_counter() - started) * 1000)
+
+    mb = 2 ** 20
+    print(f"\narchived {totals['archived']} entries in {elapsed:.2f}s "
+          f"({totals['archived'] / elapsed:,.0f}/s), payloads {totals['bytes_before'] / mb:.1f} MB -> "
+          f"{totals['bytes_after'] / mb:.1f} MB compressed "
+          f"({totals['bytes_before'] / max(totals['bytes_after'], 1):.1f}x)")
+    print(f"\n{'':<28}{'before':>12}{'after':>12}")
+    print(f"{'field_data data size':<28}{size_before / mb:>9.1f} MB{size_after / mb:>9.1f} MB")
+    print(f"{'field_data on disk':<28}{storage_before / mb:>9.1f} MB{storage_after / mb:>9.1f} MB")
+    print(f"{'average document':<28}{avg_before / 1024:>9.1f} KB{avg_after / 1024:>9.1f} KB")
+    print(f"{'list page of ' + str(args.page_size):<28}{page_before:>9.1f} ms{page_after:>9.1f} ms")
+    print(f"\ncold tier: {archive_size / mb:.1f} MB data, {archive_storage / mb:.1f} MB on disk")
+    print(f"rehydrating read: p50 {statistics.median(rehydrate_ms):.2f} ms, "
+          f"p95 {sorted(rehydrate_ms)[int(len(rehydrate_ms) * 0.95) - 1]:.2f} ms")
+
+    await client.drop_database(args.db)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
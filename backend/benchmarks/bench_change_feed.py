@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Benchmark change-feed push against REST polling
+Seeds projects for N users, subscribes one feed client per user (plus a few
+admins), then updates project statuses and measures how long each change takes
+to reach its owner. For comparison it times the list query a polling client
+runs and reports how many of them the same clients would issue at a given
+poll interval.
+
+Needs a MongoDB replica set (docker-compose.replica.yml);
+MONGO_URL defaults to mongodb://localhost:27017/?directConnection=true.
+
+Usage:
+    python benchmarks/bench_change_feed.py --users 200 --updates 500 --poll-seconds 5
+"""
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import sys
+import time
+import uuid
+from datetime import datetime, timezone
+
+import orjson
+from motor.motor_asyncio import AsyncIOMotorClient
+
+# Add backend to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from change_feed import ChangeFeed, Subscription, CHANGE_FEED_COLLECTIONS
+from db_indexes import ensure_indexes
+from pagination import paginate
+
+STATUSES = ["draft", "in_review", "monitoring", "issued"]
+
+
+async def drain(subscription, sent, latencies):
+    while True:
+        message = orjson.loads(await subscription.get())
+        if message.get("type") != "change":
+            continue
+        started = sent.get(message.get("changes", {}).get("seq"))
+        if started is not None and not subscription.privileged:
+            latencies.append(time.perf_counter() - started)
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=200)
+    parser.add_argument("--admins", type=int, default=5)
+    parser.add_argument("--projects-per-user", type=int, default=5)
+    parser.add_argument("--updates", type=int, default=500)
+    parser.add_argument("--poll-seconds", type=float, default=5.0)
+    parser.add_argument("--db", default="bench_change_feed")
+    args = parser.parse_args()
+    random.seed(42)
+
+    client = AsyncIOMotorClient(os.environ.get("MONGO_URL", "mongodb://localhost:27017/?directConnection=true"))
+    await client.drop_database(args.db)
+    db = client[args.db]
+
+    print("\n" + "=" * 60)
+    print("📡 Change Feed Benchmark")
+    print("=" * 60)
+
+    users = [str(uuid.uuid4()) for _ in range(args.users)]
+    projects = []
+    for user_id in users:
+        for _ in range(args.projects_per_user):
+            projects.append({"id": str(uuid.uuid4()), "owner_id": user_id, "status": "draft",
+                             "title": "Mangrove restoration", "created_at": datetime.now(timezone.utc)})
+    await db.projects.insert_many(projects)
+    await ensure_indexes(db)
+
+    feed = ChangeFeed(db)
+    subscriptions = [Subscription(user_id, False, CHANGE_FEED_COLLECTIONS) for user_id in users]
+    subscriptions += [Subscription(f"admin{i}", True, CHANGE_FEED_COLLECTIONS) for i in range(args.admins)]
+    for subscription in subscriptions:
+        feed.subscribe(subscription)
+    while feed.available is None:
+        await asyncio.sleep(0.05)
+    if not feed.available:
+        print("❌ Change streams unavailable - start MongoDB as a replica set")
+        return
+    await asyncio.sleep(0.5)  # let the stream open before writing
+
+    sent, latencies = {}, []
+    drains = [asyncio.create_task(drain(s, sent, latencies)) for s in subscriptions]
+
+    started = time.perf_counter()
+    for seq in range(args.updates):
+        project = random.choice(projects)
+        sent[seq] = time.perf_counter()
+        await db.projects.update_one({"id": project["id"]}, {"$set": {"status": random.choice(STATUSES), "seq": seq}})
+        await asyncio.sleep(0.005)
+    while len(latencies) < args.updates and time.perf_counter() - started < 60:
+        await asyncio.sleep(0.05)
+    elapsed = time.perf_counter() - started
+
+    for task in drains:
+        task.cancel()
+    await feed.stop()
+
+    # What one polling client does every interval
+    poll_latencies = []
+    for user_id in random.sample(users, min(50, len(users))):
+        poll_started = time.perf_counter()
+        await paginate(db.projects, {"owner_id": user_id})
+        poll_latencies.append(time.perf_counter() - poll_started)
+    polls = int((args.users + args.admins) * elapsed / args.poll_seconds)
+
+    latencies.sort()
+    print(f"{args.updates} project updates over {elapsed:.1f}s, {len(subscriptions)} subscribed clients")
+    print(f"  delivered to owner   {len(latencies)}/{args.updates}")
+    print(f"  push latency p50     {statistics.median(latencies) * 1000:.1f} ms")
+    print(f"  push latency p95     {latencies[int(len(latencies) * 0.95) - 1] * 1000:.1f} ms")
+    print(f"  polling at {args.poll_seconds:g}s       {polls:,} list queries "
+          f"(~{statistics.median(poll_latencies) * 1000:.2f} ms each), "
+          f"mean staleness {args.poll_seconds / 2 * 1000:.0f} ms")
+
+    await client.drop_database(args.db)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Benchmark credit creation and issuance: one request per credit vs the batch
+endpoints (POST /api/credits/batch and POST /api/credits/batch-issue)
+Drives the real app in-process over ASGI against a scratch database, so
+validation, status checks, metric updates and the writes are all included.
+
+Needs a running MongoDB; MONGO_URL defaults to mongodb://localhost:27017.
+
+Usage:
+    python benchmarks/bench_credit_batch.py --credits 5000 --concurrency 16
+"""
+import argparse
+import asyncio
+import os
+import random
+import sys
+import time
+import uuid
+from collections import Counter
+from datetime import datetime, timezone
+
+import httpx
+from motor.motor_asyncio import AsyncIOMotorClient
+
+# Add backend to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("MONGO_URL", "mongodb://localhost:27017")
+
+import server
+from db_indexes import ensure_indexes
+
+
+def make_credit(project_id: str) -> dict:
+    return {
+        "project_id": project_id,
+        "amount": round(random.uniform(1, 500), 2),
+        "vintage": "2024",
+        "methodology": "VM0033",
+        "metadata": {
+            "mrv_hash": uuid.uuid4().hex,
+            "data_bundle_uri": "ipfs://bundle",
+            "uncertainty_class": "A",
+            "verification_standard": "VCS",
+            "project_id": project_id,
+        },
+    }
+
+
+async def gather_limited(requests, concurrency):
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def run(request):
+        async with semaphore:
+            return await request
+
+    return await asyncio.gather(*[run(request) for request in requests])
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--credits", type=int, default=5000)
+    parser.add_argument("--projects", type=int, default=20)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--db", default="bench_credit_batch")
+    args = parser.parse_args()
+    random.seed(42)
+
+    client = AsyncIOMotorClient(os.environ["MONGO_URL"])
+    await client.drop_database(args.db)
+    server.db = client[args.db]
+    await ensure_indexes(server.db)
+
+    print("\n" + "=" * 60)
+    print("🪙 Batch Credit Benchmark")
+    print("=" * 60)
+
+    admin = server.User(email="registry@example.org", username="registry", full_name="Registry Admin",
+                        role=server.UserRole.ADMIN)
+    await server.db.users.insert_one(admin.model_dump())
+    headers = {"Authorization": f"Bearer {server.create_access_token({'sub': admin.username})}"}
+    project_ids = [str(uuid.uuid4()) for _ in range(args.projects)]
+    await server.db.projects.insert_many([{
+        "id": project_id, "owner_id": admin.id, "title": "Mangrove restoration", "status": "monitoring",
+        "created_at": datetime.now(timezone.utc),
+    } for project_id in project_ids])
+    credits = [make_credit(random.choice(project_ids)) for _ in range(args.credits)]
+
+    transport = httpx.ASGITransport(app=server.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as http:
+        started = time.perf_counter()
+        responses = await gather_limited(
+            [http.post("/api/credits", json=credit, headers=headers) for credit in credits], args.concurrency)
+        create_single = time.perf_counter() - started
+        ids = [response.json()["id"] for response in responses]
+
+        started = time.perf_counter()
+        issued = await gather_limited(
+            [http.put(f"/api/credits/{credit_id}/issue", params={"issued_to": admin.id}, headers=headers)
+             for credit_id in ids], args.concurrency)
+        issue_single = time.perf_counter() - started
+        single_statuses = Counter(response.status_code for response in issued)
+
+        await server.db.credits.delete_many({})
+        started = time.perf_counter()
+        body = (await http.post("/api/credits/batch", json={"credits": credits}, headers=headers)).json()
+        create_batch = time.perf_counter() - started
+        ids = [result["id"] for result in body["results"] if result["status"] == "created"]
+
+        # Issue one credit twice to show the per-item outcome
+        items = [{"credit_id": credit_id, "issued_to": admin.id} for credit_id in ids] + [
+            {"credit_id": ids[0], "issued_to": admin.id}]
+        started = time.perf_counter()
+        body = (await http.post("/api/credits/batch-issue", json={"items": items}, headers=headers)).json()
+        issue_batch = time.perf_counter() - started
+        outcomes = Counter(result["status"] for result in body["results"])
+
+    print(f"{args.credits:,} credits across {args.projects} projects (concurrency {args.concurrency})")
+    print(f"  create  one per request {create_single:>7.2f} s   batch {create_batch:>6.2f} s   "
+          f"{create_single / create_batch:>5.1f}x")
+    print(f"  issue   one per request {issue_single:>7.2f} s   batch {issue_batch:>6.2f} s   "
+          f"{issue_single / issue_batch:>5.1f}x")
+    print(f"  single issue statuses {dict(single_statuses)}, batch outcomes {dict(outcomes)}")
+
+    await client.drop_database(args.db)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+Benchmark credit statistics: Python loops over fetched documents vs the
+$group aggregation used by /api/credits/stats/summary
+Seeds N credits into a scratch database, builds the declared indexes and
+reports latency, correctness and whether the aggregation plan is covered.
+
+Needs a running MongoDB; MONGO_URL defaults to mongodb://localhost:27017.
+
+Usage:
+    python benchmarks/bench_credit_stats.py --size 1000000 --runs 5
+"""
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import sys
+import time
+import uuid
+
+from motor.motor_asyncio import AsyncIOMotorClient
+
+# Add backend to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from db_indexes import ensure_indexes
+
+STATUSES = ["draft", "pending", "issued", "retired", "cancelled"]
+
+
+def stats_pipeline(query):
+    # Mirrors server.aggregate_credit_stats
+    pipeline = [{"$match": query}]
+    if not query:
+        pipeline.append({"$sort": {"status": 1}})
+    return pipeline + [
+        {"$project": {"_id": 0, "status": 1, "amount": 1}},
+        {"$group": {"_id": "$status", "count": {"$sum": 1}, "amount": {"$sum": "$amount"}}},
+    ]
+
+
+async def python_loops(db, query, cap):
+    credits = await db.credits.find(query).to_list(cap)
+    return {
+        "total_credits": len(credits),
+        "issued_credits": len([c for c in credits if c["status"] == "issued"]),
+        "retired_credits": len([c for c in credits if c["status"] == "retired"]),
+        "pending_credits": len([c for c in credits if c["status"] == "pending"]),
+        "total_amount": sum(c["amount"] for c in credits),
+        "issued_amount": sum(c["amount"] for c in credits if c["status"] == "issued"),
+        "retired_amount": sum(c["amount"] for c in credits if c["status"] == "retired"),
+    }
+
+
+async def aggregation(db, query):
+    by_status = {row["_id"]: row async for row in db.credits.aggregate(stats_pipeline(query))}
+    return {
+        "total_credits": sum(r["count"] for r in by_status.values()),
+        "issued_credits": by_status.get("issued", {}).get("count", 0),
+        "total_amount": sum(r["amount"] for r in by_status.values()),
+    }
+
+
+async def timed(fn, runs):
+    latencies, result = [], None
+    for _ in range(runs):
+        started = time.perf_counter()
+        result = await fn()
+        latencies.append(time.perf_counter() - started)
+    return statistics.median(latencies) * 1000, result
+
+
+def plan_stages(explain):
+    """Flatten the stage names of an aggregate explain"""
+    stages = []
+
+    def walk(node):
+        if isinstance(node, dict):
+            if "stage" in node:
+                stages.append(node["stage"])
+            for value in node.values():
+                walk(value)
+        elif isinstance(node, list):
+            for value in node:
+                walk(value)
+
+    walk(explain)
+    return stages
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--size", type=int, default=1_000_000)
+    parser.add_argument("--projects", type=int, default=10_000)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--db", default="bench_credit_stats")
+    args = parser.parse_args()
+    random.seed(42)
+
+    client = AsyncIOMotorClient(os.environ.get("MONGO_URL", "mongodb://localhost:27017"))
+    await client.drop_database(args.db)
+    db = client[args.db]
+
+    print("\n" + "=" * 60)
+    print("📊 Credit Statistics Benchmark")
+    print("=" * 60)
+
+    project_ids = [str(uuid.uuid4()) for _ in range(args.projects)]
+    # 50 projects per owner
+    owners = {project_id: f"owner{i // 50}" for i, project_id in enumerate(project_ids)}
+    started = time.perf_counter()
+    for start in range(0, args.size, 10000):
+        batch = [random.choice(project_ids) for _ in range(min(10000, args.size - start))]
+        await db.credits.insert_many([{
+            "id": str(uuid.uuid4()),
+            "project_id": project_id,
+            "owner_id": owners[project_id],
+            "status": random.choice(STATUSES),
+            "amount": round(random.uniform(1, 1000), 2),
+            "vintage": str(random.randint(2015, 2025)),
+            "methodology": "VM0033",
+            "metadata": {"mrv_hash": "0x" + "0" * 64, "data_bundle_uri": "ipfs://bundle"},
+        } for project_id in batch], ordered=False)
+    await ensure_indexes(db)
+    print(f"Seeded {args.size:,} credits in {time.perf_counter() - started:.1f}s")
+
+    scopes = {
+        "all credits": {},
+        "one owner (50 projects)": {"owner_id": owners[project_ids[0]]},
+    }
+    for label, query in scopes.items():
+        print(f"\n{label}")
+        loop_ms, capped = await timed(lambda: python_loops(db, query, 1000), args.runs)
+        full_ms, full = await timed(lambda: python_loops(db, query, None), max(args.runs // 2, 1))
+        agg_ms, agg = await timed(lambda: aggregation(db, query), args.runs)
+
+        explain = await db.command("aggregate", "credits", pipeline=stats_pipeline(query), explain=True)
+        stages = plan_stages(explain)
+        covered = "FETCH" not in stages and "COLLSCAN" not in stages
+
+        print(f"  to_list(1000) + loops  {loop_ms:>9.1f} ms  total_credits={capped['total_credits']:,} (truncated)")
+        print(f"  to_list(None) + loops  {full_ms:>9.1f} ms  total_credits={full['total_credits']:,}")
+        print(f"  $group aggregation     {agg_ms:>9.1f} ms  total_credits={agg['total_credits']:,}  "
+              f"covered={covered} ({' > '.join(dict.fromkeys(stages))})")
+        assert agg["total_credits"] == full["total_credits"]
+        assert abs(agg["total_amount"] - full["total_amount"]) < 1e-3 * max(full["total_amount"], 1)
+
+    await client.drop_database(args.db)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Benchmark field data ingest: one POST /api/field-data per row vs a single
+POST /api/field-data/bulk
+Drives the real app in-process over ASGI against a scratch database, so
+request parsing, validation, access checks and the writes are all included.
+The bulk run mixes in a few invalid and unauthorized rows to show per-row
+outcomes.
+
+Needs a running MongoDB; MONGO_URL defaults to mongodb://localhost:27017.
+
+Usage:
+    python benchmarks/bench_field_data_bulk.py --rows 10000 --concurrency 16
+"""
+import argparse
+import asyncio
+import os
+import random
+import sys
+import time
+import uuid
+from collections import Counter
+from datetime import datetime, timezone
+
+import httpx
+from motor.motor_asyncio import AsyncIOMotorClient
+
+# Add backend to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("MONGO_URL", "mongodb://localhost:27017")
+
+import server
+from db_indexes import ensure_indexes
+
+
+def make_row(project_id: str) -> dict:
+    return {
+        "project_id": project_id,
+        "plot_id": f"P-{random.randint(1, 5000)}",
+        "gps_coordinates": {"lat": 21.9 + random.random() / 100, "lng": 89.1 + random.random() / 100, "accuracy": 4.0},
+        "species": random.choice(["Rhizophora mucronata", "Avicennia marina", "Sonneratia alba"]),
+        "canopy_cover": round(random.uniform(0, 100), 1),
+        "soil_type": "Clay",
+        "measurements": f"dbh={random.randint(5, 40)}cm",
+    }
+
+
+async def one_by_one(http, rows, headers, concurrency):
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def post(row):
+        async with semaphore:
+            response = await http.post("/api/field-data", json=row, headers=headers)
+            return response.status_code
+
+    return Counter(await asyncio.gather(*[post(row) for row in rows]))
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--projects", type=int, default=20)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--db", default="bench_field_data_bulk")
+    args = parser.parse_args()
+    random.seed(42)
+
+    client = AsyncIOMotorClient(os.environ["MONGO_URL"])
+    await client.drop_database(args.db)
+    server.db = client[args.db]
+    await ensure_indexes(server.db)
+
+    print("\n" + "=" * 60)
+    print("📥 Bulk Field Data Benchmark")
+    print("=" * 60)
+
+    user = server.User(email="collector@example.org", username="collector", full_name="Field Collector")
+    await server.db.users.insert_one(user.model_dump())
+    headers = {"Authorization": f"Bearer {server.create_access_token({'sub': user.username})}"}
+    project_ids = [str(uuid.uuid4()) for _ in range(args.projects)]
+    await server.db.projects.insert_many([{
+        "id": project_id, "owner_id": user.id, "title": "Mangrove restoration", "status": "monitoring",
+        "created_at": datetime.now(timezone.utc),
+    } for project_id in project_ids])
+    rows = [make_row(random.choice(project_ids)) for _ in range(args.rows)]
+
+    transport = httpx.ASGITransport(app=server.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as http:
+        started = time.perf_counter()
+        statuses = await one_by_one(http, rows, headers, args.concurrency)
+        single_seconds = time.perf_counter() - started
+
+        await server.db.field_data.delete_many({})
+        # A few rows a real campaign file might contain
+        bulk_rows = list(rows)
+        bulk_rows[1] = {**rows[1], "canopy_cover": "n/a"}
+        bulk_rows[2] = {**rows[2], "project_id": str(uuid.uuid4())}
+        started = time.perf_counter()
+        response = await http.post("/api/field-data/bulk", json={"rows": bulk_rows}, headers=headers)
+        bulk_seconds = time.perf_counter() - started
+        body = response.json()
+
+    stored = await server.db.field_data.count_documents({})
+    outcomes = Counter(result["status"] for result in body["results"])
+    print(f"{args.rows:,} rows across {args.projects} projects")
+    print(f"  one request per row   {single_seconds:>8.2f} s  {args.rows / single_seconds:>9,.0f} rows/s  "
+          f"(concurrency {args.concurrency}, statuses {dict(statuses)})")
+    print(f"  bulk request          {bulk_seconds:>8.2f} s  {args.rows / bulk_seconds:>9,.0f} rows/s  "
+          f"(outcomes {dict(outcomes)}, {stored:,} stored)")
+    print(f"  speedup               {single_seconds / bulk_seconds:>8.1f}x")
+
+    await client.drop_database(args.db)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
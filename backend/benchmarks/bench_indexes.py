@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+Benchmark the API's hot lookups with and without the declared indexes
+Seeds a scratch database with N projects, users and credits, times the
+queries behind get_current_user, project lookups, "my projects" and credit
+filters as collection scans, then runs ensure_indexes() and times them again.
+
+Needs a running MongoDB; MONGO_URL defaults to mongodb://localhost:27017.
+
+Usage:
+    python benchmarks/bench_indexes.py --size 1000000 --queries 200
+"""
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import sys
+import time
+import uuid
+
+from motor.motor_asyncio import AsyncIOMotorClient
+
+# Add backend to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from db_indexes import ensure_indexes
+
+STATUSES = ["draft", "in_review", "monitoring", "issued", "rejected"]
+CREDIT_STATUSES = ["draft", "pending", "issued", "retired"]
+VINTAGES = [str(year) for year in range(2015, 2026)]
+
+
+async def seed(db, size: int, batch: int = 10000):
+    owners = max(size // 100, 1)
+    users = [{"id": str(uuid.uuid4()), "username": f"user{i}", "email": f"user{i}@example.org"} for i in range(owners)]
+    for start in range(0, owners, batch):
+        await db.users.insert_many(users[start:start + batch], ordered=False)
+
+    project_ids = []
+    for start in range(0, size, batch):
+        docs = []
+        for _ in range(min(batch, size - start)):
+            project_id = str(uuid.uuid4())
+            project_ids.append(project_id)
+            docs.append({
+                "id": project_id,
+                "owner_id": random.choice(users)["id"],
+                "status": random.choice(STATUSES),
+                "title": "Mangrove restoration",
+                "vintage": random.choice(VINTAGES),
+            })
+        await db.projects.insert_many(docs, ordered=False)
+
+    for start in range(0, size, batch):
+        docs = [{
+            "id": str(uuid.uuid4()),
+            "project_id": random.choice(project_ids),
+            "status": random.choice(CREDIT_STATUSES),
+            "vintage": random.choice(VINTAGES),
+            "amount": random.uniform(1, 1000),
+        } for _ in range(min(batch, size - start))]
+        await db.credits.insert_many(docs, ordered=False)
+
+    return users, project_ids
+
+
+def workload(users, project_ids, count: int):
+    """(label, collection, filter) triples mirroring server.py queries"""
+    queries = []
+    for _ in range(count):
+        user = random.choice(users)
+        project_id = random.choice(project_ids)
+        queries.extend([
+            ("users by username", "users", {"username": user["username"]}),
+            ("projects by id", "projects", {"id": project_id}),
+            ("projects by owner+status", "projects", {"owner_id": user["id"], "status": random.choice(STATUSES)}),
+            ("validation queue", "projects", {"status": "in_review"}),
+            ("credits by project+status", "credits", {"project_id": project_id, "status": "issued"}),
+        ])
+    return queries
+
+
+async def run(db, queries):
+    timings = {}
+    for label, collection, query in queries:
+        limit = 50 if label == "validation queue" else 0
+        started = time.perf_counter()
+        await db[collection].find(query, {"_id": 1}).limit(limit).to_list(None)
+        timings.setdefault(label, []).append(time.perf_counter() - started)
+    return timings
+
+
+async def explain(db, collection, query):
+    plan = await db.command("explain", {"find": collection, "filter": query}, verbosity="executionStats")
+    stats = plan["executionStats"]
+    stage = plan["queryPlanner"]["winningPlan"]
+    while "inputStage" in stage:
+        stage = stage["inputStage"]
+    return stage["stage"], stats["totalDocsExamined"]
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--size", type=int, default=1_000_000)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--db", default="bench_indexes")
+    args = parser.parse_args()
+    random.seed(42)
+
+    client = AsyncIOMotorClient(os.environ.get("MONGO_URL", "mongodb://localhost:27017"))
+    await client.drop_database(args.db)
+    db = client[args.db]
+
+    print("\n" + "=" * 60)
+    print("🗂️  Index Benchmark")
+    print("=" * 60)
+
+    started = time.perf_counter()
+    users, project_ids = await seed(db, args.size)
+    print(f"Seeded {args.size:,} projects and credits, {len(users):,} users in {time.perf_counter() - started:.1f}s")
+
+    # Collection scans are slow; a fraction of the workload is enough
+    scan_queries = workload(users, project_ids, max(args.queries // 20, 5))
+    before = await run(db, scan_queries)
+    samples = {label: (collection, query) for label, collection, query in scan_queries}
+    plans_before = {label: await explain(db, *samples[label]) for label in samples}
+
+    started = time.perf_counter()
+    failed = await ensure_indexes(db)
+    print(f"Built indexes in {time.perf_counter() - started:.1f}s{' (failed: ' + str(failed) + ')' if failed else ''}")
+
+    after = await run(db, workload(users, project_ids, args.queries))
+    plans_after = {label: await explain(db, *samples[label]) for label in samples}
+
+    print(f"\n{'query':<28}{'scan p50':>12}{'index p50':>12}{'speedup':>10}   plan (docs examined)")
+    for label in before:
+        scan = statistics.median(before[label]) * 1000
+        indexed = statistics.median(after[label]) * 1000
+        (stage_before, docs_before), (stage_after, docs_after) = plans_before[label], plans_after[label]
+        print(f"{label:<28}{scan:>10.2f}ms{indexed:>10.3f}ms{scan / indexed:>9.0f}x   "
+              f"{stage_before}({docs_before:,}) -> {stage_after}({docs_after:,})")
+
+    await client.drop_database(args.db)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
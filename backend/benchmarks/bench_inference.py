@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Benchmark CNN credibility inference on CPU
+Measures throughput and latency of the micro-batched worker pool against
+unbatched (batch size 1) inference for a burst of concurrent uploads.
+
+Usage:
+    python benchmarks/bench_inference.py --images 256 --concurrency 32
+    CNN_MODEL_PATH=model.onnx python benchmarks/bench_inference.py
+"""
+import argparse
+import asyncio
+import io
+import os
+import statistics
+import sys
+import time
+
+import numpy as np
+from PIL import Image
+
+# Add backend to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from credibility_inference import CredibilityInferenceService, INFERENCE_WORKERS, MODEL_PATH
+
+
+def make_jpeg(seed: int, size=(1600, 1200)) -> bytes:
+    """Generate a synthetic field photo"""
+    rng = np.random.default_rng(seed)
+    pixels = rng.integers(0, 255, (size[1] // 8, size[0] // 8, 3), dtype=np.uint8)
+    pixels[..., 1] = np.clip(pixels[..., 1].astype(int) + 60, 0, 255)
+    img = Image.fromarray(pixels).resize(size, Image.BILINEAR)
+    buffer = io.BytesIO()
+    img.save(buffer, format="JPEG", quality=85)
+    return buffer.getvalue()
+
+
+async def run(service: CredibilityInferenceService, images, concurrency: int):
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = []
+
+    async def one(content):
+        async with semaphore:
+            started = time.perf_counter()
+            await service.analyze(content)
+            latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    await asyncio.gather(*[one(c) for c in images])
+    elapsed = time.perf_counter() - started
+    return elapsed, sorted(latencies)
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--images", type=int, default=128)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--workers", type=int, default=INFERENCE_WORKERS)
+    parser.add_argument("--batch-sizes", default="1,4,16")
+    args = parser.parse_args()
+
+    print("\n" + "=" * 60)
+    print("🧠 Credibility Inference Benchmark (CPU)")
+    print("=" * 60)
+    print(f"Model: {MODEL_PATH or 'heuristic fallback'}")
+    print(f"Workers: {args.workers}  Images: {args.images}  Concurrency: {args.concurrency}\n")
+
+    images = [make_jpeg(i) for i in range(min(args.images, 16))]
+    images = [images[i % len(images)] for i in range(args.images)]
+
+    for batch_size in [int(b) for b in args.batch_sizes.split(",")]:
+        service = CredibilityInferenceService(workers=args.workers, max_batch_size=batch_size)
+        warm_start = time.perf_counter()
+        await service.start()
+        warm_up = time.perf_counter() - warm_start
+
+        elapsed, latencies = await run(service, images, args.concurrency)
+        await service.stop()
+
+        p50 = statistics.median(latencies) * 1000
+        p95 = latencies[int(len(latencies) * 0.95) - 1] * 1000
+        avg_batch = service.stats["images"] / max(1, service.stats["batches"])
+        print(
+            f"batch<={batch_size:<3} warm-up {warm_up:5.2f}s  "
+            f"throughput {len(images) / elapsed:7.1f} img/s  "
+            f"p50 {p50:7.1f} ms  p95 {p95:7.1f} ms  avg batch {avg_batch:4.1f}"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
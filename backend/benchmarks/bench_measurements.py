@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+Benchmark monitoring measurements: time-series collection vs a plain collection
+Loads the same synthetic readings (daily NDVI per project, weekly canopy cover
+per plot) into two scratch databases. In one, `measurements` is the time-series
+collection from measurements.py. In the other it is a regular collection with
+the same declared indexes. The script then compares:
+- ingest time
+- storage and index size
+- dashboard range queries
+- weekly bucket aggregations
+It uses the same helpers the API calls.
+
+Needs a running MongoDB 5.0+; MONGO_URL defaults to mongodb://localhost:27017.
+
+Usage:
+    python benchmarks/bench_measurements.py --projects 200 --days 365 --plots 5
+"""
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+
+from motor.motor_asyncio import AsyncIOMotorClient
+
+# Add backend to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from db_indexes import ensure_indexes
+from measurements import (
+    MEASUREMENTS_COLLECTION, ensure_measurements_collection, measurement, satellite_measurement,
+    record_measurements, measurement_range, measurement_buckets
+)
+
+START = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+
+def readings(project_ids, days, plots):
+    """Daily NDVI per project and weekly canopy cover per plot, in arrival (time) order"""
+    for day in range(days):
+        observed_at = START + timedelta(days=day, hours=10, minutes=random.randint(0, 59))
+        for project_id in project_ids:
+            mean = 0.4 + 0.3 * random.random()
+            yield satellite_measurement(project_id, observed_at, {
+                "mean": mean, "min": mean - 0.2, "max": mean + 0.2, "stDev": 0.05
+            })
+            if day % 7 == 0:
+                for plot in range(plots):
+                    yield measurement(project_id, observed_at, "field",
+                                      {"canopy_cover": random.uniform(20, 90)}, f"plot-{plot}")
+
+
+async def load(db, docs, batch_size):
+    started = time.perf_counter()
+    for offset in range(0, len(docs), batch_size):
+        # insert_many adds _id to the dicts it is given, so each database gets copies
+        await record_measurements(db, [dict(doc) for doc in docs[offset:offset + batch_size]])
+    return time.perf_counter() - started
+
+
+async def storage(db):
+    stats = await db[MEASUREMENTS_COLLECTION].aggregate([{"$collStats": {"storageStats": {}}}]).to_list(1)
+    storage_stats = stats[0]["storageStats"]
+    return storage_stats.get("storageSize", 0), storage_stats.get("totalIndexSize", 0)
+
+
+async def timed(query, repeat):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        await query()
+        timings.append((time.perf_counter() - started) * 1000)
+    return statistics.median(timings)
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--projects", type=int, default=200)
+    parser.add_argument("--days", type=int, default=365)
+    parser.add_argument("--plots", type=int, default=5)
+    parser.add_argument("--batch-size", type=int, default=5000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+    random.seed(42)
+
+    client = AsyncIOMotorClient(os.environ.get("MONGO_URL", "mongodb://localhost:27017"))
+    project_ids = [f"project-{index:05d}" for index in range(args.projects)]
+    docs = list(readings(project_ids, args.days, args.plots))
+
+    print("\n" + "=" * 60)
+    print("📈 Measurements: time-series vs plain collection")
+    print("=" * 60)
+    print(f"{len(docs)} readings: {args.projects} projects x {args.days} days, {args.plots} plots each")
+
+    results = {}
+    for label, timeseries in (("time-series", True), ("plain", False)):
+        db = client[f"bench_measurements_{'ts' if timeseries else 'plain'}"]
+        await client.drop_database(db.name)
+        if timeseries and not await ensure_measurements_collection(db):
+            raise SystemExit("❌ Server does not support time-series collections (MongoDB 5.0+ required)")
+        await ensure_indexes(db)
+
+        ingest = await load(db, docs, args.batch_size)
+        storage_size, index_size = await storage(db)
+
+        project_id = project_ids[len(project_ids) // 2]
+        quarter_start, quarter_end = START + timedelta(days=90), START + timedelta(days=180)
+        results[label] = {
+            "ingest_s": ingest,
+            "storage_mb": storage_size / 2 ** 20,
+            "index_mb": index_size / 2 ** 20,
+            "range_ms": await timed(lambda: measurement_range(
+                db, project_id, "ndvi_mean", quarter_start, quarter_end), args.repeat),
+            "plot_range_ms": await timed(lambda: measurement_range(
+                db, project_id, "canopy_cover", plot_id="plot-0"), args.repeat),
+            "weekly_ms": await timed(lambda: measurement_buckets(
+                db, project_id, "ndvi_mean", "week"), args.repeat),
+            "monthly_ms": await timed(lambda: measurement_buckets(
+                db, project_id, "canopy_cover", "month"), args.repeat),
+        }
+        await client.drop_database(db.name)
+
+    rows = [
+        ("ingest", "ingest_s", "s"),
+        ("storage", "storage_mb", "MB"),
+        ("indexes", "index_mb", "MB"),
+        ("NDVI, one quarter", "range_ms", "ms"),
+        ("canopy, one plot", "plot_range_ms", "ms"),
+        ("NDVI weekly buckets", "weekly_ms", "ms"),
+        ("canopy monthly buckets", "monthly_ms", "ms"),
+    ]
+    print(f"\n{'':<24}{'time-series':>14}{'plain':>14}{'ratio':>9}")
+    for title, key, unit in rows:
+        ts, plain = results["time-series"][key], results["plain"][key]
+        ratio = f"{plain / ts:.1f}x" if ts else "-"
+        print(f"{title:<24}{ts:>11.2f} {unit:<2}{plain:>11.2f} {unit:<2}{ratio:>9}")
+    print("(ratio = plain / time-series; above 1x means the time-series collection is smaller or faster)")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
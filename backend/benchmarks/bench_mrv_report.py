@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Benchmark MRV report persistence: the previous one-write-per-step sequence vs
+MrvReportStore (one transaction per phase, or paired writes on a standalone)
+Each report goes through both phases with a confirmed blockchain result, so
+the legacy path makes five round trips (project read, report insert, project
+update, report update, project update).
+
+Transactions need a replica set (docker-compose.replica.yml); against a
+standalone only the legacy and paired-write modes run.
+MONGO_URL defaults to mongodb://localhost:27017/?directConnection=true.
+
+Usage:
+    python benchmarks/bench_mrv_report.py --reports 500
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+import uuid
+from datetime import datetime, timezone
+
+from motor.motor_asyncio import AsyncIOMotorClient
+
+# Add backend to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from db_indexes import ensure_indexes
+from mrv_reports import MrvReportStore, project_update
+
+REPORTED_METRICS = {"hectares_monitored": 1.5, "biomass_estimate": 0.8}
+CHAIN = {"transaction_hash": "0x" + "ab" * 32, "block_number": 123, "explorer_url": "https://example.org/tx"}
+
+
+def new_report(project_id: str) -> dict:
+    return {
+        "id": str(uuid.uuid4()), "project_id": project_id, "validator_id": "validator",
+        "analysis_data": {"areaChange": 1.5, "biomass": 0.8, "co2": 12.0}, "reported_metrics": REPORTED_METRICS,
+        "mrv_hash": "0x" + uuid.uuid4().hex * 2, "created_at": datetime.now(timezone.utc),
+        "blockchain_status": "pending",
+    }
+
+
+async def legacy(db, project_id: str) -> None:
+    report = new_report(project_id)
+    now = datetime.now(timezone.utc)
+    await db.projects.find_one({"id": project_id})
+    await db.mrv_reports.insert_one(report)
+    await db.projects.update_one({"id": project_id}, project_update(report["mrv_hash"], REPORTED_METRICS, now))
+    await db.mrv_reports.update_one({"id": report["id"]}, {"$set": {
+        "blockchain_status": "confirmed", "blockchain_tx_hash": CHAIN["transaction_hash"],
+        "blockchain_block": CHAIN["block_number"], "blockchain_explorer_url": CHAIN["explorer_url"],
+    }})
+    await db.projects.update_one({"id": project_id}, {"$set": {
+        "blockchain_tx_hash": CHAIN["transaction_hash"], "blockchain_verified": True,
+    }})
+
+
+async def stored(store: MrvReportStore, project_id: str) -> None:
+    report = new_report(project_id)
+    await store.create(report, REPORTED_METRICS, datetime.now(timezone.utc))
+    await store.settle(report["id"], {
+        "blockchain_status": "confirmed", "blockchain_tx_hash": CHAIN["transaction_hash"],
+        "blockchain_block": CHAIN["block_number"], "blockchain_explorer_url": CHAIN["explorer_url"],
+    }, project_id, {"blockchain_tx_hash": CHAIN["transaction_hash"], "blockchain_verified": True})
+
+
+async def timed(label: str, runs: int, write) -> None:
+    latencies = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        await write()
+        latencies.append((time.perf_counter() - started) * 1000)
+    latencies.sort()
+    print(f"  {label:<24} p50 {statistics.median(latencies):>6.2f} ms   "
+          f"p95 {latencies[int(len(latencies) * 0.95) - 1]:>6.2f} ms")
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--reports", type=int, default=500)
+    parser.add_argument("--db", default="bench_mrv_report")
+    args = parser.parse_args()
+
+    client = AsyncIOMotorClient(os.environ.get("MONGO_URL", "mongodb://localhost:27017/?directConnection=true"))
+    await client.drop_database(args.db)
+    db = client[args.db]
+    await ensure_indexes(db)
+
+    print("\n" + "=" * 60)
+    print("🧾 MRV Report Persistence Benchmark")
+    print("=" * 60)
+
+    project_id = str(uuid.uuid4())
+    await db.projects.insert_one({"id": project_id, "owner_id": "owner", "title": "Mangrove restoration",
+                                  "status": "monitoring", "created_at": datetime.now(timezone.utc)})
+
+    transactional = MrvReportStore(db)
+    paired = MrvReportStore(db)
+    paired.supports_transactions = False
+
+    print(f"{args.reports} reports, generate + confirmed blockchain result each")
+    await timed("legacy (5 round trips)", args.reports, lambda: legacy(db, project_id))
+    await timed("paired writes", args.reports, lambda: stored(paired, project_id))
+    if await transactional.transactions():
+        await timed("transactions", args.reports, lambda: stored(transactional, project_id))
+    else:
+        print("  transactions             skipped - start MongoDB as a replica set")
+
+    await client.drop_database(args.db)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
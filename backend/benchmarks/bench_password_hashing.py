@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+Benchmark concurrent logins: bcrypt on the event loop vs the password hashing pool
+Drives the real app in-process over ASGI against a scratch database. A burst
+of POST /api/auth/login requests runs while a probe polls GET /api/health. The
+script reports:
+- login throughput and latency
+- event loop lag: how late a 10 ms timer fires, i.e. how long hashing blocks
+  every other request
+- GET /api/health latency during the burst
+
+The inline mode runs bcrypt on the event loop, as the handlers used to. It
+is followed by one run per --threads value on the pool.
+
+Needs a running MongoDB; MONGO_URL defaults to mongodb://localhost:27017.
+
+Usage:
+    python benchmarks/bench_password_hashing.py --logins 200 --concurrency 32 --threads 1,2,4 --rounds 12
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+
+import httpx
+from motor.motor_asyncio import AsyncIOMotorClient
+
+# Add backend to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("MONGO_URL", "mongodb://localhost:27017")
+
+import passwords
+import server
+from db_indexes import ensure_indexes
+
+
+def percentile(values, q):
+    values = sorted(values)
+    return values[max(0, int(len(values) * q) - 1)]
+
+
+async def login_burst(http, users, logins, concurrency):
+    """(elapsed seconds, login latencies ms, loop lag ms, health latencies ms, statuses)"""
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies, statuses = [], []
+
+    async def login(index):
+        async with semaphore:
+            started = time.perf_counter()
+            response = await http.post("/api/auth/login", json={"username": users[index % len(users)],
+                                                                 "password": "correct horse battery"})
+            latencies.append((time.perf_counter() - started) * 1000)
+            statuses.append(response.status_code)
+
+    lag, health, done = [], [], asyncio.Event()
+
+    async def probe():
+        while not done.is_set():
+            started = time.perf_counter()
+            await asyncio.sleep(0.01)
+            lag.append(max(0.0, (time.perf_counter() - started) * 1000 - 10))
+            started = time.perf_counter()
+            await http.get("/api/health")
+            health.append((time.perf_counter() - started) * 1000)
+
+    prober = asyncio.create_task(probe())
+    started = time.perf_counter()
+    await asyncio.gather(*[login(index) for index in range(logins)])
+    elapsed = time.perf_counter() - started
+    done.set()
+    await prober
+    return elapsed, latencies, lag, health, statuses
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--logins", type=int, default=200)
+    parser.add_argument("--users", type=int, default=50)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--threads", default="1,2,4")
+    parser.add_argument("--rounds", type=int, default=passwords.BCRYPT_ROUNDS)
+    parser.add_argument("--db", default="bench_password_hashing")
+    args = parser.parse_args()
+
+    client = AsyncIOMotorClient(os.environ["MONGO_URL"])
+    await client.drop_database(args.db)
+    server.db = client[args.db]
+    await ensure_indexes(server.db)
+
+    print("\n" + "=" * 60)
+    print("🔐 Concurrent Login Benchmark")
+    print("=" * 60)
+    print(f"{args.logins} logins, {args.concurrency} concurrent, bcrypt cost {args.rounds}, {os.cpu_count()} CPUs")
+
+    seed = passwords.PasswordHasher(rounds=args.rounds, threads=os.cpu_count() or 1, max_pending=10 ** 6)
+    password_hash = await seed.hash("correct horse battery")
+    users = [f"user{index}" for index in range(args.users)]
+    await server.db.users.insert_many([{
+        **server.User(email=f"{username}@example.org", username=username, full_name=username).model_dump(),
+        "password": password_hash,
+    } for username in users])
+
+    pooled_verify = server.verify_password
+
+    async def inline_verify(plain_password, hashed_password):
+        return seed.context.verify_and_update(plain_password, hashed_password)
+
+    modes = [("inline", None)] + [(f"pool x{threads}", int(threads)) for threads in args.threads.split(",")]
+    print(f"\n{'mode':<12}{'logins/s':>10}{'p50 ms':>10}{'p95 ms':>10}{'lag p95':>10}{'lag max':>10}"
+          f"{'health p95':>12}  statuses")
+    transport = httpx.ASGITransport(app=server.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as http:
+        for label, threads in modes:
+            if threads is None:
+                server.verify_password = inline_verify
+            else:
+                server.verify_password = pooled_verify
+                passwords.close_password_hasher()
+                passwords._password_hasher = passwords.PasswordHasher(
+                    rounds=args.rounds, threads=threads, max_pending=max(args.concurrency, 1))
+            elapsed, latencies, lag, health, statuses = await login_burst(http, users, args.logins, args.concurrency)
+            counts = ", ".join(f"{code}: {statuses.count(code)}" for code in sorted(set(statuses)))
+            print(f"{label:<12}{args.logins / elapsed:>10.1f}{statistics.median(latencies):>10.0f}"
+                  f"{percentile(latencies, 0.95):>10.0f}{percentile(lag, 0.95):>10.1f}{max(lag):>10.1f}"
+                  f"{percentile(health, 0.95):>12.1f}  {counts}")
+
+    passwords.close_password_hasher()
+    seed.executor.shutdown()
+    await client.drop_database(args.db)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Benchmark near-duplicate queries on the perceptual hash index
+Builds an index of N random 64-bit hashes, plants near-duplicates, and
+measures query latency against a brute-force scan.
+
+Usage:
+    python benchmarks/bench_phash_index.py --size 1000000 --queries 2000
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+
+# Add backend to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from phash_index import PHashIndex, PHASH_DUPLICATE_RADIUS
+
+
+def flip_bits(value: int, count: int) -> int:
+    for bit in random.sample(range(64), count):
+        value ^= 1 << bit
+    return value
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--size", type=int, default=1_000_000)
+    parser.add_argument("--queries", type=int, default=2000)
+    parser.add_argument("--radius", type=int, default=PHASH_DUPLICATE_RADIUS)
+    args = parser.parse_args()
+    random.seed(42)
+
+    print("\n" + "=" * 60)
+    print("🔎 Perceptual Hash Index Benchmark")
+    print("=" * 60)
+
+    index = PHashIndex(radius=args.radius)
+    started = time.perf_counter()
+    for i in range(args.size):
+        index.add(f"{random.getrandbits(64):016x}", f"img_{i}")
+    print(f"Built index of {len(index):,} hashes in {time.perf_counter() - started:.1f}s")
+
+    # Half the queries are planted near-duplicates, half are fresh photos
+    queries = []
+    for i in range(args.queries):
+        if i % 2 == 0:
+            source = index.hashes[random.randrange(args.size)]
+            queries.append((f"{flip_bits(source, random.randint(0, args.radius)):016x}", True))
+        else:
+            queries.append((f"{random.getrandbits(64):016x}", False))
+
+    latencies, found = [], 0
+    for phash, planted in queries:
+        t = time.perf_counter()
+        matches = index.query(phash)
+        latencies.append(time.perf_counter() - t)
+        found += planted and bool(matches)
+    latencies.sort()
+
+    print(f"Radius {args.radius}: recall on planted duplicates {found / (args.queries // 2 + args.queries % 2):.3f}")
+    print(f"Index query  p50 {statistics.median(latencies) * 1000:.3f} ms  "
+          f"p99 {latencies[int(len(latencies) * 0.99) - 1] * 1000:.3f} ms")
+
+    # Brute force reference on a handful of queries
+    sample = queries[:20]
+    t = time.perf_counter()
+    for phash, _ in sample:
+        value = int(phash, 16)
+        [i for i, h in enumerate(index.hashes) if (h ^ value).bit_count() <= args.radius]
+    print(f"Linear scan  avg {(time.perf_counter() - t) / len(sample) * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
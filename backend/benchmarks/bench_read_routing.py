@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+"""
+Check per-route read routing against a three-node replica set
+Drives the real app in-process over ASGI and records which server answered
+each route's reads, then times the routed endpoints while a writer keeps the
+primary busy.
+- Routes listed in SECONDARY_READ_ROUTES should be served by a secondary.
+- Single-document reads and writes must stay on the primary.
+
+Needs the replica set from docker-compose.replica3.yml; the routing-check
+service there runs this script inside the compose network.
+
+Usage:
+    SECONDARY_READ_ROUTES=stats,exports,validation_queue,lists \\
+    MONGO_URL="mongodb://mongo1:27017,mongo2:27017,mongo3:27017/?replicaSet=rs0" \\
+        python benchmarks/bench_read_routing.py --seconds 10
+"""
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import sys
+import threading
+import time
+import uuid
+from datetime import datetime, timezone
+
+import httpx
+from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import monitoring
+from pymongo.write_concern import WriteConcern
+
+# Add backend to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import server
+from db_indexes import ensure_indexes
+from read_routing import SECONDARY_READ_ROUTES
+
+READ_COMMANDS = {"find", "aggregate", "getMore", "count"}
+
+
+class ServedBy(monitoring.CommandListener):
+    """Which server each read on a collection went to"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.reads = []
+
+    def started(self, event):
+        collection = event.command.get(event.command_name)
+        if event.command_name in READ_COMMANDS and isinstance(collection, str):
+            with self.lock:
+                self.reads.append((collection, "%s:%s" % event.connection_id))
+
+    def succeeded(self, event):
+        pass
+
+    def failed(self, event):
+        pass
+
+    def take(self, collection: str) -> set:
+        with self.lock:
+            servers = {address for name, address in self.reads if name == collection}
+            self.reads.clear()
+        return servers
+
+
+async def wait_for_secondaries(client, timeout: float = 120) -> str:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            hello = await client.admin.command("hello")
+            if hello.get("primary") and len(client.secondaries) >= 2:
+                return hello["primary"]
+        except Exception:
+            pass
+        await asyncio.sleep(1)
+    raise SystemExit("❌ Replica set has no primary and two secondaries - is docker-compose.replica3.yml up?")
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--projects", type=int, default=2000)
+    parser.add_argument("--credits", type=int, default=20000)
+    parser.add_argument("--seconds", type=float, default=10)
+    parser.add_argument("--db", default="bench_read_routing")
+    args = parser.parse_args()
+    random.seed(42)
+
+    served_by = ServedBy()
+    client = AsyncIOMotorClient(os.environ["MONGO_URL"], event_listeners=[served_by])
+    primary = await wait_for_secondaries(client)
+    await client.drop_database(args.db)
+    server.db = client[args.db]
+    await ensure_indexes(server.db)
+
+    print("\n" + "=" * 60)
+    print("🔀 Read Routing Check")
+    print("=" * 60)
+    print(f"primary {primary}, secondaries {', '.join(sorted('%s:%s' % a for a in client.secondaries))}")
+    print(f"SECONDARY_READ_ROUTES={','.join(sorted(SECONDARY_READ_ROUTES))}")
+
+    # Majority writes, so the secondaries hold the seed data before reads start
+    majority = server.db.with_options(write_concern=WriteConcern("majority"))
+    admin = server.User(email="admin@example.org", username="admin", full_name="Admin", role=server.UserRole.ADMIN)
+    await majority.users.insert_one(admin.model_dump())
+    headers = {"Authorization": f"Bearer {server.create_access_token({'sub': admin.username})}"}
+    now = datetime.now(timezone.utc)
+    projects = [{
+        "id": str(uuid.uuid4()), "owner_id": admin.id, "title": "Mangrove restoration", "description": "",
+        "methodology": "VM0033", "ecosystem_type": "Mangrove", "location": {}, "area_hectares": 10.0,
+        "status": random.choice(["draft", "in_review", "monitoring"]), "vintage": "2024",
+        "created_at": now, "updated_at": now,
+    } for _ in range(args.projects)]
+    await majority.projects.insert_many(projects)
+    await majority.credits.insert_many([{
+        "id": str(uuid.uuid4()), "project_id": random.choice(projects)["id"], "owner_id": admin.id,
+        "amount": round(random.uniform(1, 500), 2), "vintage": "2024", "methodology": "VM0033",
+        "status": random.choice(["draft", "issued", "retired"]), "created_at": now, "updated_at": now,
+    } for _ in range(args.credits)])
+
+    project_id = projects[0]["id"]
+    routes = [
+        ("stats", "GET", "/api/credits/stats/summary", "credits"),
+        ("exports", "GET", "/api/exports/credits", "credits"),
+        ("validation_queue", "GET", "/api/validation/queue", "projects"),
+        ("lists", "GET", "/api/projects?view=summary", "projects"),
+        (None, "GET", f"/api/projects/{project_id}", "projects"),
+        (None, "GET", f"/api/projects/{project_id}/metrics", "projects"),
+    ]
+
+    failures = 0
+    transport = httpx.ASGITransport(app=server.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as http:
+        for route, method, path, collection in routes:
+            served_by.take(collection)
+            response = await http.request(method, path, headers=headers)
+            servers = served_by.take(collection)
+            expected = "secondary" if route in SECONDARY_READ_ROUTES else "primary"
+            actual = "primary" if servers == {primary} else "secondary" if primary not in servers else "mixed"
+            ok = response.status_code == 200 and actual == expected
+            failures += not ok
+            print(f"  {'✅' if ok else '❌'} {path:<40} {response.status_code}  "
+                  f"expected {expected:<9} read from {', '.join(sorted(servers)) or '-'}")
+
+        # Latency of the routed endpoints while a writer keeps the primary busy
+        stop = asyncio.Event()
+
+        async def writer():
+            while not stop.is_set():
+                await server.db.credits.update_many({"status": "draft", "vintage": "2024"},
+                                                    {"$set": {"updated_at": datetime.now(timezone.utc)}})
+
+        writers = [asyncio.create_task(writer()) for _ in range(4)]
+        latencies = {route: [] for route, *_ in routes[:4]}
+        deadline = time.perf_counter() + args.seconds
+        while time.perf_counter() < deadline:
+            for route, method, path, _ in routes[:4]:
+                started = time.perf_counter()
+                await http.request(method, path, headers=headers)
+                latencies[route].append((time.perf_counter() - started) * 1000)
+        stop.set()
+        await asyncio.gather(*writers)
+
+    print(f"under write load ({args.seconds:g}s, 4 writers on the primary)")
+    for route, values in latencies.items():
+        values.sort()
+        where = "secondary" if route in SECONDARY_READ_ROUTES else "primary"
+        print(f"  {route:<18} {where:<9}  p50 {statistics.median(values):>7.1f} ms   "
+              f"p95 {values[int(len(values) * 0.95) - 1]:>7.1f} ms")
+
+    await client.drop_database(args.db)
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""
+Benchmark response serialization for Project, FieldData and Credit pages
+Builds a page of documents as Motor returns them and times three paths:
+  validated  Model(**doc) per item, then FastAPI re-validates the page against
+             response_model and renders it with the stdlib json encoder
+  orjson     the same double validation, rendered with ORJSONResponse
+  trusted    trusted_page(): each document shaped by trusted() and rendered
+             by ORJSONResponse, which is what the read endpoints now do
+Each path's body is checked against the validated one. No database needed.
+
+Usage:
+    python benchmarks/bench_serialization.py --items 200 --runs 20
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import statistics
+import sys
+import time
+import uuid
+from datetime import datetime
+
+from fastapi.responses import JSONResponse, ORJSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_response_field
+
+# Add backend to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("MONGO_URL", "mongodb://localhost:27017")
+
+from server import (
+    Project, ProjectPage, FieldData, FieldDataPage, Credit, CreditPage, trusted_page
+)
+
+
+def now():
+    # Motor returns naive UTC datetimes
+    return datetime.utcnow().replace(microsecond=random.randint(0, 999999))
+
+
+def make_project() -> dict:
+    return {
+        "id": str(uuid.uuid4()),
+        "title": "Mangrove restoration, Sundarbans block " + str(random.randint(1, 999)),
+        "description": "Community-led replanting of degraded mangrove. " * 10,
+        "methodology": "VM0033",
+        "ecosystem_type": "Mangrove",
+        "location": {"lat": 21.9, "lng": 89.1, "address": "Sundarbans, West Bengal"},
+        "area_hectares": random.uniform(10, 5000),
+        "status": "monitoring",
+        "vintage": "2024",
+        "owner_id": str(uuid.uuid4()),
+        "validator_id": None,
+        "metrics": {"hectares_monitored": 120.0, "credits_issued": 50.0, "credits_retired": 5.0, "biomass_estimate": 900.0},
+        "blockchain_hash": None,
+        "images": [f"/api/images/{uuid.uuid4().hex}" for _ in range(4)],
+        "image_metadata": [{"id": uuid.uuid4().hex, "filename": f"plot-{i}.jpg", "size": 3_000_000,
+                            "uploaded_at": now()} for i in range(4)],
+        "created_at": now(),
+        "updated_at": now(),
+    }
+
+
+def make_field_data() -> dict:
+    images = [uuid.uuid4().hex for _ in range(3)]
+    return {
+        "id": str(uuid.uuid4()),
+        "project_id": str(uuid.uuid4()),
+        "plot_id": f"P-{random.randint(1, 500)}",
+        "gps_coordinates": {"lat": 21.9, "lng": 89.1, "accuracy": 4.5},
+        "species": "Rhizophora mucronata",
+        "canopy_cover": random.uniform(0, 100),
+        "soil_type": "Clay",
+        "notes": "Healthy regrowth along the creek",
+        "images": [f"/api/images/{image}" for image in images],
+        "image_metadata": [{"id": image, "filename": "plot.jpg", "size": 2_500_000} for image in images],
+        "measurements": "dbh=12cm",
+        "credibility_score": random.random(),
+        "analysis_results": [{"image_id": image, "credibility_score": random.random(),
+                              "predictions": {"mangrove": 0.9, "water": 0.1}} for image in images],
+        "analysis_status": "completed",
+        "collector_id": str(uuid.uuid4()),
+        "validated": False,
+        "validator_id": None,
+        "created_at": now(),
+    }
+
+
+def make_credit() -> dict:
+    project_id = str(uuid.uuid4())
+    return {
+        "id": str(uuid.uuid4()),
+        "project_id": project_id,
+        "amount": round(random.uniform(1, 1000), 2),
+        "vintage": "2024",
+        "methodology": "VM0033",
+        "status": "issued",
+        "metadata": {"mrv_hash": "0x" + uuid.uuid4().hex * 2, "data_bundle_uri": "ipfs://bundle",
+                     "uncertainty_class": "low", "verification_standard": "VCS", "project_id": project_id},
+        "owner_id": str(uuid.uuid4()),
+        "blockchain_tx_hash": None,
+        "blockchain_token_id": None,
+        "issued_to": "0xabc",
+        "retired_by": None,
+        "retired_at": None,
+        "created_at": now(),
+        "updated_at": now(),
+    }
+
+
+MODELS = {
+    "Project": (Project, ProjectPage, make_project),
+    "FieldData": (FieldData, FieldDataPage, make_field_data),
+    "Credit": (Credit, CreditPage, make_credit),
+}
+
+
+def validated_path(model, page_model, field, response_class):
+    async def run(docs):
+        page = page_model(items=[model(**doc) for doc in docs], next_cursor=None)
+        # What FastAPI does with a returned model when response_model is set
+        content = await serialize_response(field=field, response_content=page, is_coroutine=True)
+        return response_class(content).body
+    return run
+
+
+def trusted_path(model, page_model):
+    async def run(docs):
+        return trusted_page(page_model, model, docs, None).body
+    return run
+
+
+async def measure(fn, docs, runs):
+    await fn(docs)  # warm up
+    latencies, body = [], b""
+    for _ in range(runs):
+        started = time.perf_counter()
+        body = await fn(docs)
+        latencies.append(time.perf_counter() - started)
+    return statistics.median(latencies) * 1000, body
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--items", type=int, default=200)
+    parser.add_argument("--runs", type=int, default=20)
+    args = parser.parse_args()
+    random.seed(42)
+
+    print("\n" + "=" * 60)
+    print("⚡ Serialization Benchmark")
+    print("=" * 60)
+
+    for name, (model, page_model, make) in MODELS.items():
+        docs = [make() for _ in range(args.items)]
+        field = create_response_field(name=f"Response_{name}", type_=page_model, mode="serialization")
+        paths = {
+            "validated": validated_path(model, page_model, field, JSONResponse),
+            "orjson": validated_path(model, page_model, field, ORJSONResponse),
+            "trusted": trusted_path(model, page_model),
+        }
+        results = {label: await measure(fn, docs, args.runs) for label, fn in paths.items()}
+        expected = json.loads(results["validated"][1])
+
+        print(f"\n{name}: page of {args.items}")
+        baseline = results["validated"][0]
+        for label, (ms, body) in results.items():
+            same = json.loads(body) == expected
+            print(f"  {label:<10} {ms:>8.2f} ms  {baseline / ms:>5.1f}x  {len(body) / 1024:>8.1f} KiB  "
+                  f"{'identical' if same else 'DIFFERS'}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Benchmark full vs summary list responses for a page of projects
+Builds N project documents as MongoDB returns them, then times what
+GET /api/projects does with each: the full view validates every document into
+Project and re-validates the page against response_model; the summary view
+receives projected documents and constructs ProjectSummary items directly.
+Reports serialization time and payload size. No database needed.
+
+Usage:
+    python benchmarks/bench_summary_views.py --projects 500 --images 4
+"""
+import argparse
+import base64
+import json
+import os
+import random
+import statistics
+import sys
+import time
+import uuid
+from datetime import datetime, timezone
+
+from pydantic import TypeAdapter
+
+# Add backend to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("MONGO_URL", "mongodb://localhost:27017")
+
+from server import (
+    Project, ProjectPage, ProjectSummary, ProjectSummaryPage, trusted_page
+)
+
+
+def make_project(images: int, legacy_images: bool) -> dict:
+    now = datetime.now(timezone.utc)
+    if legacy_images:
+        # Pre-GridFS projects embed base64 data URLs
+        urls = [f"data:image/jpeg;base64,{base64.b64encode(os.urandom(48 * 1024)).decode()}" for _ in range(images)]
+    else:
+        urls = [f"/api/images/{uuid.uuid4().hex}" for _ in range(images)]
+    return {
+        "id": str(uuid.uuid4()),
+        "title": "Mangrove restoration, Sundarbans block " + str(random.randint(1, 999)),
+        "description": "Community-led replanting of degraded mangrove. " * 20,
+        "methodology": "VM0033",
+        "ecosystem_type": "Mangrove",
+        "location": {"lat": 21.9, "lng": 89.1, "address": "Sundarbans, West Bengal",
+                     "polygon": [[21.9 + i / 1000, 89.1 + i / 1000] for i in range(50)]},
+        "area_hectares": random.uniform(10, 5000),
+        "status": "monitoring",
+        "vintage": "2024",
+        "owner_id": str(uuid.uuid4()),
+        "validator_id": None,
+        "metrics": {"hectares_monitored": 120.0, "credits_issued": 50.0, "credits_retired": 5.0, "biomass_estimate": 900.0},
+        "blockchain_hash": None,
+        "images": urls,
+        "image_metadata": [{"id": uuid.uuid4().hex, "filename": f"plot-{i}.jpg", "size": 3_000_000,
+                            "uploaded_at": now, "exif": {"camera": "Pixel 7"}} for i in range(images)],
+        "created_at": now,
+        "updated_at": now,
+    }
+
+
+def project_summary(doc: dict) -> dict:
+    """What PROJECT_SUMMARY_PROJECTION returns for a document"""
+    summary = {field: doc[field] for field in ProjectSummary.model_fields if field in doc}
+    first = doc["images"][0] if doc["images"] else ""
+    summary["cover_image"] = None if first[:5] in ("", "data:") else first
+    summary["image_count"] = len(doc["images"])
+    return summary
+
+
+def full_view(docs) -> bytes:
+    page = ProjectPage(items=[Project(**doc) for doc in docs], next_cursor=None)
+    # FastAPI validates the returned page against response_model, then dumps it
+    adapter = TypeAdapter(ProjectPage)
+    content = adapter.dump_python(adapter.validate_python(page), mode="json")
+    return json.dumps(content).encode()
+
+
+def summary_view(docs) -> bytes:
+    return trusted_page(ProjectSummaryPage, ProjectSummary, docs, None).body
+
+
+def measure(fn, docs, runs):
+    latencies, body = [], b""
+    for _ in range(runs):
+        started = time.perf_counter()
+        body = fn(docs)
+        latencies.append(time.perf_counter() - started)
+    return statistics.median(latencies) * 1000, len(body)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--projects", type=int, default=500)
+    parser.add_argument("--images", type=int, default=4)
+    parser.add_argument("--runs", type=int, default=10)
+    args = parser.parse_args()
+    random.seed(42)
+
+    print("\n" + "=" * 60)
+    print("📋 Summary View Benchmark")
+    print("=" * 60)
+
+    for legacy in (False, True):
+        docs = [make_project(args.images, legacy) for _ in range(args.projects)]
+        summaries = [project_summary(doc) for doc in docs]
+        full_ms, full_bytes = measure(full_view, docs, args.runs)
+        summary_ms, summary_bytes = measure(summary_view, summaries, args.runs)
+
+        label = "base64 data URL images" if legacy else "GridFS image URLs"
+        print(f"\n{args.projects} projects, {args.images} {label}")
+        print(f"  full view     {full_ms:>8.1f} ms  {full_bytes / 1024:>10.1f} KiB")
+        print(f"  summary view  {summary_ms:>8.1f} ms  {summary_bytes / 1024:>10.1f} KiB")
+        print(f"  reduction     {full_ms / summary_ms:>8.1f}x    {full_bytes / summary_bytes:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,202 @@
+"""
+Change Feed
+Pushes project, credit and MRV report changes to WebSocket clients. One
+MongoDB change stream per API process watches the three collections and fans
+each event out to the subscribers allowed to see it, so clients stop polling
+the REST endpoints to notice approvals, issuance or blockchain confirmations.
+
+Change streams need a replica set (see docker-compose.replica.yml). On a
+standalone server the feed reports itself unavailable and clients keep polling.
+"""
+
+import asyncio
+import logging
+import os
+from typing import Any, Dict, Iterable, Optional, Set
+
+import orjson
+from pymongo.errors import OperationFailure
+
+logger = logging.getLogger(__name__)
+
+# Feed configuration
+CHANGE_FEED_QUEUE_SIZE = int(os.environ.get('CHANGE_FEED_QUEUE_SIZE', '100'))  # per client
+CHANGE_FEED_RETRY_SECONDS = float(os.environ.get('CHANGE_FEED_RETRY_SECONDS', '5'))
+
+CHANGE_FEED_COLLECTIONS = ("projects", "credits", "mrv_reports")
+
+# Image payloads can run to megabytes; clients refetch the document if they need them
+OMITTED_FIELDS = {"_id", "images", "image_metadata"}
+
+# Deletes carry no document to check visibility against, so they are not pushed
+WATCH_PIPELINE = [{"$match": {
+    "ns.coll": {"$in": list(CHANGE_FEED_COLLECTIONS)},
+    "operationType": {"$in": ["insert", "update", "replace"]},
+}}]
+
+NOT_REPLICA_SET = 40573  # $changeStream is only supported on replica sets
+
+RESYNC = orjson.dumps({"type": "resync"}).decode()
+UNAVAILABLE = orjson.dumps({"type": "unavailable"}).decode()
+
+
+def change_message(event: Dict[str, Any]) -> Dict[str, Any]:
+    """Client-facing delta for a change event"""
+    collection = event["ns"]["coll"]
+    doc = event.get("fullDocument") or {}
+    message = {
+        "type": "change",
+        "collection": collection,
+        "operation": event["operationType"],
+        "id": doc.get("id"),
+        "project_id": doc.get("id") if collection == "projects" else doc.get("project_id"),
+    }
+    if event["operationType"] == "update":
+        description = event.get("updateDescription") or {}
+        message["changes"] = {
+            path: value for path, value in (description.get("updatedFields") or {}).items()
+            if path.split(".")[0] not in OMITTED_FIELDS
+        }
+        message["removed"] = [
+            path for path in description.get("removedFields") or []
+            if path.split(".")[0] not in OMITTED_FIELDS
+        ]
+    else:
+        message["document"] = {key: value for key, value in doc.items() if key not in OMITTED_FIELDS}
+    return message
+
+
+class Subscription:
+    """One WebSocket client's filter and outgoing queue"""
+
+    def __init__(self, user_id: str, privileged: bool, collections: Iterable[str],
+                 project_id: Optional[str] = None):
+        self.user_id = user_id
+        self.privileged = privileged  # admins and validators see every change
+        self.collections = set(collections)
+        self.project_id = project_id
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=CHANGE_FEED_QUEUE_SIZE)
+
+    def wants(self, message: Dict[str, Any], owner_id: Optional[str]) -> bool:
+        if message["collection"] not in self.collections:
+            return False
+        if self.project_id and message["project_id"] != self.project_id:
+            return False
+        return self.privileged or (owner_id is not None and owner_id == self.user_id)
+
+    def push(self, payload: str) -> None:
+        try:
+            self.queue.put_nowait(payload)
+        except asyncio.QueueFull:
+            # A client that cannot keep up drops its backlog and refetches instead
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait(RESYNC)
+
+    async def get(self) -> str:
+        return await self.queue.get()
+
+
+class ChangeFeed:
+    """Single change stream fanned out to WebSocket subscriptions"""
+
+    def __init__(self, db):
+        self.db = db
+        self.subscribers: Set[Subscription] = set()
+        self.task: Optional[asyncio.Task] = None
+        self.resume_token = None
+        self.available: Optional[bool] = None  # None until the first watch attempt
+
+    def subscribe(self, subscription: Subscription) -> Subscription:
+        self.subscribers.add(subscription)
+        if self.available is False:
+            subscription.push(UNAVAILABLE)
+        elif self.task is None:
+            self.task = asyncio.create_task(self._run())
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        self.subscribers.discard(subscription)
+
+    async def stop(self) -> None:
+        if self.task:
+            self.task.cancel()
+            try:
+                await self.task
+            except asyncio.CancelledError:
+                pass
+            self.task = None
+
+    async def _owner_of(self, message: Dict[str, Any], event: Dict[str, Any]) -> Optional[str]:
+        doc = event.get("fullDocument") or {}
+        if doc.get("owner_id") or message["collection"] != "mrv_reports":
+            return doc.get("owner_id")
+        if not message["project_id"] or all(s.privileged for s in self.subscribers):
+            return None
+        project = await self.db.projects.find_one({"id": message["project_id"]}, {"_id": 0, "owner_id": 1})
+        return project["owner_id"] if project else None
+
+    async def _dispatch(self, event: Dict[str, Any]) -> None:
+        if not self.subscribers:
+            return
+        message = change_message(event)
+        owner_id = await self._owner_of(message, event)
+        payload = None
+        for subscription in list(self.subscribers):
+            if subscription.wants(message, owner_id):
+                # Encoded once, however many clients receive it
+                payload = payload or orjson.dumps(message, default=str).decode()
+                subscription.push(payload)
+
+    async def _run(self) -> None:
+        try:
+            while True:
+                await self._watch()
+                if self.available is False:
+                    return
+                await asyncio.sleep(CHANGE_FEED_RETRY_SECONDS)
+        finally:
+            # However the loop ends, the next subscribe() can start a new one
+            self.task = None
+
+    async def _watch(self) -> None:
+        try:
+            async with self.db.watch(WATCH_PIPELINE, full_document="updateLookup",
+                                     resume_after=self.resume_token) as stream:
+                if not self.available:
+                    logger.info("✅ Change feed watching projects, credits and MRV reports")
+                self.available = True
+                async for event in stream:
+                    self.resume_token = stream.resume_token
+                    try:
+                        await self._dispatch(event)
+                    except Exception as e:
+                        # One bad event must not stop the feed; clients refetch what they missed
+                        logger.error(f"❌ Change feed could not dispatch {event.get('operationType')} event: {e}")
+                        for subscription in list(self.subscribers):
+                            subscription.push(RESYNC)
+        except OperationFailure as e:
+            if e.code == NOT_REPLICA_SET:
+                logger.warning("⚠️ Change streams need a replica set - WebSocket updates disabled")
+                self.available = False
+                for subscription in list(self.subscribers):
+                    subscription.push(UNAVAILABLE)
+                return
+            logger.error(f"❌ Change feed error: {e}")
+            if e.code == 286:  # ChangeStreamHistoryLost: the resume point has rolled off the oplog
+                self.resume_token = None
+                for subscription in list(self.subscribers):
+                    subscription.push(RESYNC)
+        except Exception as e:
+            logger.error(f"❌ Change feed error: {e}")
+
+
+# Initialize singleton instance
+_change_feed: Optional[ChangeFeed] = None
+
+
+def get_change_feed(db) -> ChangeFeed:
+    global _change_feed
+    if _change_feed is None:
+        _change_feed = ChangeFeed(db)
+    return _change_feed
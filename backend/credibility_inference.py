@@ -0,0 +1,406 @@
+"""
+CNN Credibility Inference Service
+Scores field photos for credibility with a CPU model on a process pool.
+
+Images are decoded straight from the uploaded bytes (no temp files), requests
+from concurrent uploads are micro-batched, and each worker process loads the
+model once at start-up and keeps it warm for its lifetime.
+"""
+
+import asyncio
+import io
+import logging
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Dict, List, Optional, Union
+
+import numpy as np
+from PIL import Image
+
+logger = logging.getLogger(__name__)
+
+# Inference configuration
+MODEL_PATH = os.environ.get('CNN_MODEL_PATH', '')
+INPUT_SIZE = int(os.environ.get('CNN_INPUT_SIZE', '224'))
+INFERENCE_WORKERS = int(os.environ.get('INFERENCE_WORKERS', str(max(1, (os.cpu_count() or 2) // 2))))
+INFERENCE_MAX_BATCH = int(os.environ.get('INFERENCE_MAX_BATCH', '16'))
+INFERENCE_MAX_WAIT_MS = float(os.environ.get('INFERENCE_MAX_WAIT_MS', '10'))
+INFERENCE_THREADS_PER_WORKER = int(os.environ.get('INFERENCE_THREADS_PER_WORKER', '1'))
+
+# ImageNet normalisation used by the exported CNN
+IMAGENET_MEAN = np.array([0.485, 0.456, 0.406], dtype=np.float32).reshape(1, 3, 1, 1)
+IMAGENET_STD = np.array([0.229, 0.224, 0.225], dtype=np.float32).reshape(1, 3, 1, 1)
+
+
+class OnnxCredibilityModel:
+    """ONNX Runtime model returning one credibility probability per image"""
+
+    name = "onnx-cnn"
+
+    def __init__(self, model_path: str, threads: int = 1):
+        import onnxruntime as ort
+
+        options = ort.SessionOptions()
+        options.intra_op_num_threads = threads
+        options.inter_op_num_threads = 1
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        self.session = ort.InferenceSession(
+            model_path, sess_options=options, providers=["CPUExecutionProvider"]
+        )
+        self.input_name = self.session.get_inputs()[0].name
+        self.version = os.path.basename(model_path)
+
+    def predict(self, batch: np.ndarray) -> np.ndarray:
+        """
+        Run the CNN on a normalised NCHW batch
+
+        The model may emit either a single credibility logit per image or
+        two-class logits (index 1 = credible); both map to a probability.
+        """
+        outputs = self.session.run(None, {self.input_name: batch})[0]
+        outputs = np.asarray(outputs, dtype=np.float32).reshape(len(batch), -1)
+        if outputs.shape[1] == 1:
+            return 1.0 / (1.0 + np.exp(-outputs[:, 0]))
+        exp = np.exp(outputs - outputs.max(axis=1, keepdims=True))
+        return exp[:, 1] / exp.sum(axis=1)
+
+
+class HeuristicCredibilityModel:
+    """
+    Fallback scorer used when no CNN model is configured
+    Scores sharpness, exposure and vegetation cover computed from the batch
+    """
+
+    name = "heuristic"
+    version = "1"
+
+    def predict(self, batch: np.ndarray) -> np.ndarray:
+        features = image_features(batch)
+        quality = np.clip(features["sharpness"] / 0.02, 0.0, 1.0) * features["exposure"]
+        vegetation = np.clip(features["vegetation_fraction"] / 0.3, 0.0, 1.0)
+        return 0.2 + 0.5 * quality + 0.3 * vegetation
+
+
+def image_features(batch: np.ndarray) -> Dict[str, np.ndarray]:
+    """Compute cheap per-image quality and vegetation statistics for a batch"""
+    rgb = batch * IMAGENET_STD + IMAGENET_MEAN
+    r, g, b = rgb[:, 0], rgb[:, 1], rgb[:, 2]
+    gray = 0.299 * r + 0.587 * g + 0.114 * b
+
+    brightness = gray.mean(axis=(1, 2))
+    laplacian = (
+        gray[:, 1:-1, :-2] + gray[:, 1:-1, 2:] + gray[:, :-2, 1:-1] + gray[:, 2:, 1:-1]
+        - 4 * gray[:, 1:-1, 1:-1]
+    )
+    sharpness = laplacian.var(axis=(1, 2))
+    # Excess-green index picks out canopy, seagrass and marsh vegetation
+    excess_green = 2 * g - r - b
+    vegetation_fraction = (excess_green > 0.05).mean(axis=(1, 2))
+    # 1.0 for well exposed images, falling off towards black or blown out
+    exposure = np.clip(1.0 - np.abs(brightness - 0.5) * 2.0, 0.0, 1.0) ** 0.5
+
+    return {
+        "brightness": brightness,
+        "sharpness": sharpness,
+        "vegetation_fraction": vegetation_fraction,
+        "exposure": exposure,
+    }
+
+
+def image_to_tensor(img: Image.Image, size: int = INPUT_SIZE) -> np.ndarray:
+    """Convert an already decoded image into a normalised CHW float32 array"""
+    img = img.convert("RGB").resize((size, size), Image.BILINEAR)
+    array = np.asarray(img, dtype=np.float32).transpose(2, 0, 1) / 255.0
+    return (array - IMAGENET_MEAN[0]) / IMAGENET_STD[0]
+
+
+def preprocess_image(content: bytes, size: int = INPUT_SIZE) -> np.ndarray:
+    """Decode image bytes in memory into a normalised CHW float32 array"""
+    with Image.open(io.BytesIO(content)) as img:
+        # Let the JPEG decoder downscale while decoding instead of afterwards
+        img.draft("RGB", (size, size))
+        return image_to_tensor(img, size)
+
+
+def load_model(model_path: str = MODEL_PATH, threads: int = INFERENCE_THREADS_PER_WORKER):
+    """Load the configured CNN, falling back to the heuristic scorer"""
+    if model_path:
+        try:
+            return OnnxCredibilityModel(model_path, threads=threads)
+        except ImportError:
+            logger.warning("onnxruntime not installed - using heuristic credibility scorer")
+        except Exception as e:
+            logger.error(f"Error loading CNN model from {model_path}: {e}")
+    return HeuristicCredibilityModel()
+
+
+# Model instance owned by the current worker process
+_worker_model = None
+
+
+def _init_worker(model_path: str, threads: int, size: int):
+    """Process pool initializer: load the model once and warm it up"""
+    global _worker_model
+    _worker_model = load_model(model_path, threads)
+    _worker_model.predict(np.zeros((1, 3, size, size), dtype=np.float32))
+
+
+def _worker_ping() -> int:
+    """No-op task used to force every worker to start and load its model"""
+    return os.getpid()
+
+
+def _describe(score: float, confidence: float, features: Dict[str, float], model) -> Dict[str, Any]:
+    """Turn raw model output into the analysis document stored on field data"""
+    sharp = features["sharpness"] >= 0.002
+    exposed = features["exposure"] >= 0.5
+    vegetation = features["vegetation_fraction"] >= 0.05
+
+    if sharp and exposed:
+        image_quality = "good"
+    elif sharp or exposed:
+        image_quality = "fair"
+    else:
+        image_quality = "poor"
+
+    recommendations = []
+    if image_quality == "good":
+        recommendations.append("Image quality is good for analysis")
+    if not sharp:
+        recommendations.append("Image appears blurred - retake with a steady camera")
+    if not exposed:
+        recommendations.append("Image is badly exposed - retake in better light")
+    if vegetation:
+        recommendations.append("Vegetation patterns consistent with reported ecosystem type")
+    else:
+        recommendations.append("Little vegetation detected - confirm the plot was photographed")
+    if score < 0.5:
+        recommendations.append("Low credibility - manual review required")
+
+    return {
+        "credibility_score": round(float(score), 4),
+        "confidence": round(float(confidence), 4),
+        "analysis": {
+            "image_quality": image_quality,
+            "vegetation_detected": bool(vegetation),
+            "anomalies_detected": bool(score < 0.5),
+            "environmental_consistency": bool(vegetation and score >= 0.5),
+            "vegetation_fraction": round(float(features["vegetation_fraction"]), 4),
+            "sharpness": round(float(features["sharpness"]), 6),
+            "brightness": round(float(features["brightness"]), 4),
+        },
+        "recommendations": recommendations,
+        "model": {"name": model.name, "version": model.version},
+    }
+
+
+def failed_analysis(error: str) -> Dict[str, Any]:
+    """Analysis document recorded when an image cannot be scored"""
+    return {
+        "credibility_score": 0.0,
+        "confidence": 0.0,
+        "analysis": {"error": error},
+        "recommendations": ["Analysis failed - manual review required"]
+    }
+
+
+def infer_batch(items: List[Union[bytes, np.ndarray]], size: int = INPUT_SIZE, model=None) -> List[Dict[str, Any]]:
+    """
+    Score a batch of images; runs inside a worker process
+    Items are either raw image bytes or tensors already built by the ingest pass
+    """
+    model = model or _worker_model
+    if model is None:
+        model = load_model()
+
+    results: List[Optional[Dict[str, Any]]] = [None] * len(items)
+    arrays, positions = [], []
+    for i, item in enumerate(items):
+        try:
+            if isinstance(item, np.ndarray):
+                arrays.append(item)
+            else:
+                arrays.append(preprocess_image(item, size))
+            positions.append(i)
+        except Exception as e:
+            results[i] = failed_analysis(f"Could not decode image: {e}")
+
+    if arrays:
+        batch = np.stack(arrays).astype(np.float32, copy=False)
+        scores = np.clip(model.predict(batch), 0.0, 1.0)
+        features = image_features(batch)
+        for j, i in enumerate(positions):
+            score = float(scores[j])
+            if isinstance(model, HeuristicCredibilityModel):
+                confidence = 0.5 + 0.3 * abs(score - 0.5) * 2
+            else:
+                confidence = abs(score - 0.5) * 2
+            results[i] = _describe(
+                score, confidence, {k: float(v[j]) for k, v in features.items()}, model
+            )
+
+    return results
+
+
+class CredibilityInferenceService:
+    """Micro-batches credibility requests onto a pool of warm model workers"""
+
+    def __init__(
+        self,
+        model_path: str = MODEL_PATH,
+        workers: int = INFERENCE_WORKERS,
+        max_batch_size: int = INFERENCE_MAX_BATCH,
+        max_wait_ms: float = INFERENCE_MAX_WAIT_MS,
+        input_size: int = INPUT_SIZE,
+    ):
+        self.model_path = model_path
+        self.workers = workers
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait = max_wait_ms / 1000.0
+        self.input_size = input_size
+        self.executor = None
+        self.queue: Optional[asyncio.Queue] = None
+        self.batch_task: Optional[asyncio.Task] = None
+        self.in_flight: Optional[asyncio.Semaphore] = None
+        self.running = set()
+        self.start_lock = asyncio.Lock()
+        self.stats = {"batches": 0, "images": 0, "inference_seconds": 0.0, "pool_restarts": 0}
+
+    def _create_executor(self):
+        initargs = (self.model_path, INFERENCE_THREADS_PER_WORKER, self.input_size)
+        if self.workers > 0:
+            return ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker,
+                initargs=initargs,
+            )
+        # In-process mode for development: one thread owning the model
+        return ThreadPoolExecutor(max_workers=1, initializer=_init_worker, initargs=initargs)
+
+    async def start(self):
+        """Spawn the worker pool and load the model in every worker"""
+        # Concurrent first requests all land here; only one may build the pool
+        async with self.start_lock:
+            if self.batch_task is not None:
+                return
+
+            loop = asyncio.get_running_loop()
+            self.executor = self._create_executor()
+            started = time.perf_counter()
+            pids = await asyncio.gather(*[
+                loop.run_in_executor(self.executor, _worker_ping)
+                for _ in range(max(1, self.workers))
+            ])
+            logger.info(
+                f"✅ Credibility inference ready: {len(set(pids))} worker(s), "
+                f"batch<={self.max_batch_size}, warm-up {time.perf_counter() - started:.2f}s"
+            )
+
+            self.queue = asyncio.Queue()
+            self.in_flight = asyncio.Semaphore(max(1, self.workers))
+            self.batch_task = asyncio.create_task(self._batch_loop())
+
+    async def stop(self):
+        """Stop batching and shut the worker pool down"""
+        if self.batch_task:
+            self.batch_task.cancel()
+            try:
+                await self.batch_task
+            except asyncio.CancelledError:
+                pass
+            self.batch_task = None
+        if self.executor:
+            self.executor.shutdown(wait=False, cancel_futures=True)
+            self.executor = None
+
+    async def analyze(self, content: Union[bytes, np.ndarray]) -> Dict[str, Any]:
+        """
+        Score one image; concurrent calls are batched together
+        Accepts raw image bytes or a model tensor from the ingest pass
+        """
+        if self.batch_task is None:
+            await self.start()
+        future = asyncio.get_running_loop().create_future()
+        await self.queue.put((content, future))
+        return await future
+
+    async def _batch_loop(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            item = await self.queue.get()
+            batch = [item]
+            deadline = loop.time() + self.max_wait
+            while len(batch) < self.max_batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self.queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+
+            # Keep at most one batch per worker in flight
+            await self.in_flight.acquire()
+            task = asyncio.create_task(self._run_batch(batch))
+            self.running.add(task)
+            task.add_done_callback(self.running.discard)
+
+    def _restart_pool(self, broken) -> None:
+        """Replace a pool whose worker died; batches that were on it fail, later ones run"""
+        if self.executor is not broken:
+            return  # another batch on the same pool already replaced it
+        logger.error("❌ Credibility inference worker died - restarting the pool")
+        broken.shutdown(wait=False, cancel_futures=True)
+        self.executor = self._create_executor()
+        self.stats["pool_restarts"] += 1
+
+    async def _run_batch(self, batch):
+        loop = asyncio.get_running_loop()
+        started = time.perf_counter()
+        executor = self.executor
+        try:
+            results = await loop.run_in_executor(
+                executor, infer_batch, [item for item, _ in batch], self.input_size
+            )
+        except BrokenProcessPool as e:
+            self._restart_pool(executor)
+            results = [failed_analysis(f"Inference worker died: {e}") for _ in batch]
+        except Exception as e:
+            logger.error(f"Credibility inference batch failed: {e}")
+            results = [failed_analysis(str(e)) for _ in batch]
+        finally:
+            self.in_flight.release()
+
+        self.stats["batches"] += 1
+        self.stats["images"] += len(batch)
+        self.stats["inference_seconds"] += time.perf_counter() - started
+
+        for (_, future), result in zip(batch, results):
+            if not future.done():
+                future.set_result(result)
+
+
+# Initialize singleton instance
+inference_service = None
+
+def get_inference_service() -> CredibilityInferenceService:
+    """Get or create the credibility inference service"""
+    global inference_service
+
+    if inference_service is None:
+        inference_service = CredibilityInferenceService()
+
+    return inference_service
+
+
+async def analyze_image_credibility(content: Union[bytes, np.ndarray]) -> Dict[str, Any]:
+    """Score an uploaded image held in memory (bytes or prepared tensor)"""
+    try:
+        return await get_inference_service().analyze(content)
+    except Exception as e:
+        logger.error(f"Error analyzing image credibility: {e}")
+        return failed_analysis(str(e))
@@ -2,8 +2,11 @@ from fastapi import APIRouter, HTTPException, Depends
 from typing import List, Optional
 from .server import (
     Credit, CreditCreate, User, get_current_active_user, 
-    require_role, UserRole, db, logger, CreditStatus
+    require_role, UserRole, db, logger, CreditStatus, CreditPage,
+    fetch_page, PAGE_DEFAULT_LIMIT, aggregate_credit_stats, trusted_page, trusted_response,
+    CreditBatchCreate, CreditBatchIssue, CREDIT_BATCH_MAX_ITEMS, insert_credits, issue_credits, reader
 )
+from .project_metrics import apply_metrics_delta, credit_transition_delta
 from datetime import datetime, timezone
 
 router = APIRouter(prefix="/credits", tags=["credits"])
@@ -20,19 +23,43 @@ async def create_credit(
     if not project:
         raise HTTPException(status_code=404, detail="Project not found")
     
-    credit = Credit(**credit_data.dict())
+    credit = Credit(**credit_data.dict(), owner_id=project["owner_id"])
     await db.credits.insert_one(credit.dict())
+    await apply_metrics_delta(db.projects, credit.project_id,
+                              credit_transition_delta(None, credit.status, credit.amount))
     
     return credit
 
-@router.get("/", response_model=List[Credit])
+@router.post("/batch")
+async def create_credits_batch(
+    batch: CreditBatchCreate,
+    current_user: User = Depends(require_role([UserRole.ADMIN, UserRole.VALIDATOR]))
+):
+    """Create many credits in one request, with an outcome per item (admin/validator only)"""
+    if len(batch.credits) > CREDIT_BATCH_MAX_ITEMS:
+        raise HTTPException(status_code=413, detail=f"At most {CREDIT_BATCH_MAX_ITEMS} credits per request")
+    return await insert_credits(batch.credits)
+
+@router.post("/batch-issue")
+async def issue_credits_batch(
+    batch: CreditBatchIssue,
+    current_user: User = Depends(require_role([UserRole.ADMIN, UserRole.VALIDATOR]))
+):
+    """Issue many credits in one request, with an outcome per item (admin/validator only)"""
+    if len(batch.items) > CREDIT_BATCH_MAX_ITEMS:
+        raise HTTPException(status_code=413, detail=f"At most {CREDIT_BATCH_MAX_ITEMS} credits per request")
+    return await issue_credits(batch.items)
+
+@router.get("/", response_model=CreditPage)
 async def get_credits(
     project_id: Optional[str] = None,
     status: Optional[CreditStatus] = None,
     vintage: Optional[str] = None,
+    cursor: Optional[str] = None,
+    limit: int = PAGE_DEFAULT_LIMIT,
     current_user: User = Depends(get_current_active_user)
 ):
-    """Get carbon credits"""
+    """Get carbon credits, newest first, one page at a time"""
     query = {}
     
     if project_id:
@@ -54,13 +81,11 @@ async def get_credits(
     
     # Filter by user permissions
     if current_user.role == UserRole.USER:
-        # Get user's projects
-        user_projects = await db.projects.find({"owner_id": current_user.id}).to_list(1000)
-        project_ids = [p["id"] for p in user_projects]
-        query["project_id"] = {"$in": project_ids}
+        # Ownership is denormalized onto each credit
+        query["owner_id"] = current_user.id
     
-    credits = await db.credits.find(query).to_list(1000)
-    return [Credit(**credit) for credit in credits]
+    credits, next_cursor = await fetch_page(reader("lists").credits, query, cursor, limit)
+    return trusted_page(CreditPage, Credit, credits, next_cursor)
 
 @router.get("/{credit_id}", response_model=Credit)
 async def get_credit(
@@ -72,15 +97,11 @@ async def get_credit(
     if not credit_dict:
         raise HTTPException(status_code=404, detail="Credit not found")
     
-    credit = Credit(**credit_dict)
-    
     # Check permissions
-    if current_user.role == UserRole.USER:
-        project = await db.projects.find_one({"id": credit.project_id})
-        if not project or project["owner_id"] != current_user.id:
-            raise HTTPException(status_code=403, detail="Not authorized")
+    if current_user.role == UserRole.USER and credit_dict.get("owner_id") != current_user.id:
+        raise HTTPException(status_code=403, detail="Not authorized")
     
-    return credit
+    return trusted_response(Credit, credit_dict)
 
 @router.put("/{credit_id}/issue")
 async def issue_credit(
@@ -100,14 +121,18 @@ async def issue_credit(
     # TODO: Register on blockchain here
     # blockchain_result = await register_credit_on_blockchain(credit)
     
-    await db.credits.update_one(
-        {"id": credit_id},
+    result = await db.credits.update_one(
+        {"id": credit_id, "status": CreditStatus.PENDING},
         {"$set": {
             "status": CreditStatus.ISSUED,
             "issued_to": issued_to,
             "updated_at": datetime.now(timezone.utc)
         }}
     )
+    if result.modified_count == 0:
+        raise HTTPException(status_code=409, detail="Credit status changed, please retry")
+    await apply_metrics_delta(db.projects, credit.project_id,
+                              credit_transition_delta(CreditStatus.PENDING, CreditStatus.ISSUED, credit.amount))
     
     return {"message": "Credit issued successfully"}
 
@@ -130,8 +155,8 @@ async def retire_credit(
         credit.issued_to != current_user.id):
         raise HTTPException(status_code=403, detail="Not authorized to retire this credit")
     
-    await db.credits.update_one(
-        {"id": credit_id},
+    result = await db.credits.update_one(
+        {"id": credit_id, "status": CreditStatus.ISSUED},
         {"$set": {
             "status": CreditStatus.RETIRED,
             "retired_by": current_user.id,
@@ -139,6 +164,10 @@ async def retire_credit(
             "updated_at": datetime.now(timezone.utc)
         }}
     )
+    if result.modified_count == 0:
+        raise HTTPException(status_code=409, detail="Credit status changed, please retry")
+    await apply_metrics_delta(db.projects, credit.project_id,
+                              credit_transition_delta(CreditStatus.ISSUED, CreditStatus.RETIRED, credit.amount))
     
     return {"message": "Credit retired successfully"}
 
@@ -151,21 +180,6 @@ async def get_credit_stats(
     
     # Filter by user permissions
     if current_user.role == UserRole.USER:
-        user_projects = await db.projects.find({"owner_id": current_user.id}).to_list(1000)
-        project_ids = [p["id"] for p in user_projects]
-        query["project_id"] = {"$in": project_ids}
-    
-    # Get all credits for calculation
-    credits = await db.credits.find(query).to_list(1000)
-    
-    stats = {
-        "total_credits": len(credits),
-        "issued_credits": len([c for c in credits if c["status"] == CreditStatus.ISSUED]),
-        "retired_credits": len([c for c in credits if c["status"] == CreditStatus.RETIRED]),
-        "pending_credits": len([c for c in credits if c["status"] == CreditStatus.PENDING]),
-        "total_amount": sum(c["amount"] for c in credits),
-        "issued_amount": sum(c["amount"] for c in credits if c["status"] == CreditStatus.ISSUED),
-        "retired_amount": sum(c["amount"] for c in credits if c["status"] == CreditStatus.RETIRED)
-    }
-    
-    return stats
\ No newline at end of file
+        query["owner_id"] = current_user.id
+    
+    return await aggregate_credit_stats(query)
\ No newline at end of file
@@ -0,0 +1,195 @@
+"""
+Index Manager
+Declares the indexes the API's query paths rely on, creates them idempotently
+at startup and reports declared indexes that are missing and existing indexes
+that `$indexStats` shows are never used.
+"""
+
+import logging
+import os
+from typing import Any, Dict, List, Tuple
+
+from pymongo import ASCENDING, DESCENDING, GEOSPHERE, TEXT, IndexModel
+from pymongo.errors import OperationFailure
+
+logger = logging.getLogger(__name__)
+
+# Index configuration
+ENSURE_INDEXES = os.environ.get('ENSURE_INDEXES', 'true').lower() == 'true'
+
+
+def _index(*keys: Tuple[str, Any], unique: bool = False, **options: Any) -> IndexModel:
+    return IndexModel(list(keys), unique=unique, **options)
+
+
+# Keyset pages sort on (created_at, id) descending; see pagination.py
+PAGE_KEYS = (("created_at", DESCENDING), ("id", DESCENDING))
+
+# Every collection the API reads by something other than _id
+REQUIRED_INDEXES: Dict[str, List[IndexModel]] = {
+    "users": [
+        _index(("id", ASCENDING), unique=True),
+        _index(("username", ASCENDING), unique=True),  # get_current_user on every request
+        _index(("email", ASCENDING), unique=True),
+    ],
+    "projects": [
+        _index(("id", ASCENDING), unique=True),
+        _index(("owner_id", ASCENDING), ("status", ASCENDING), *PAGE_KEYS),  # "my projects" by status; exports
+        _index(("owner_id", ASCENDING), *PAGE_KEYS),  # "my projects", paged
+        _index(("status", ASCENDING), *PAGE_KEYS),  # validation queue, paged
+        _index(*PAGE_KEYS),
+        # Spatial project queries; see geo.py
+        _index(("location.geometry", GEOSPHERE)),
+        _index(("owner_id", ASCENDING), ("location.geometry", GEOSPHERE)),
+        # Project search; a collection can have only one text index
+        _index(("title", TEXT), ("description", TEXT), ("methodology", TEXT), ("ecosystem_type", TEXT),
+               name="project_search", weights={"title": 10, "methodology": 5, "ecosystem_type": 5}),
+    ],
+    "field_data": [
+        _index(("id", ASCENDING), unique=True),
+        _index(("collector_id", ASCENDING), ("project_id", ASCENDING), *PAGE_KEYS),  # one project's entries by a user; exports
+        _index(("collector_id", ASCENDING), *PAGE_KEYS),
+        _index(("project_id", ASCENDING), *PAGE_KEYS),
+        _index(*PAGE_KEYS),
+    ],
+    "credits": [
+        _index(("id", ASCENDING), unique=True),
+        _index(("project_id", ASCENDING), ("status", ASCENDING), ("vintage", ASCENDING)),
+        _index(("project_id", ASCENDING), *PAGE_KEYS),  # one project's credits, paged
+        _index(*PAGE_KEYS),
+        _index(("owner_id", ASCENDING), *PAGE_KEYS),  # a user's credits, paged
+        # Credit exports filtered by status, sorted without a blocking sort
+        _index(("status", ASCENDING), *PAGE_KEYS),
+        _index(("owner_id", ASCENDING), ("status", ASCENDING), *PAGE_KEYS),
+        _index(("project_id", ASCENDING), ("status", ASCENDING), *PAGE_KEYS),
+        # Cover the credit stats $group so it never fetches documents
+        _index(("status", ASCENDING), ("amount", ASCENDING)),
+        _index(("owner_id", ASCENDING), ("status", ASCENDING), ("amount", ASCENDING)),
+    ],
+    "mrv_reports": [
+        _index(("id", ASCENDING), unique=True),
+        _index(("project_id", ASCENDING), ("created_at", DESCENDING)),
+    ],
+    # Time-series collection, created by measurements.py before these indexes
+    "measurements": [
+        _index(("meta", ASCENDING), ("observed_at", ASCENDING)),  # created with the collection on MongoDB 6.3+
+        _index(("meta.project_id", ASCENDING), ("observed_at", ASCENDING)),  # project range and bucket queries
+    ],
+    # Cold tier for old analysis payloads; see analysis_archive.py
+    "field_data_archive": [
+        _index(("field_data_id", ASCENDING), unique=True),
+        _index(("expire_at", ASCENDING), expireAfterSeconds=0),  # only set with ANALYSIS_ARCHIVE_TTL_DAYS
+    ],
+    "image_hashes": [
+        _index(("image_id", ASCENDING), unique=True),
+        _index(("field_data_id", ASCENDING)),
+    ],
+    "upload_sessions": [
+        _index(("id", ASCENDING), unique=True),
+        _index(("status", ASCENDING), ("expires_at", ASCENDING)),
+    ],
+    "upload_parts": [
+        _index(("upload_id", ASCENDING), ("offset", ASCENDING), unique=True),
+    ],
+    "analysis_jobs": [
+        _index(("id", ASCENDING), unique=True),
+        _index(("status", ASCENDING), ("created_at", ASCENDING)),  # claim oldest queued job
+        _index(("status", ASCENDING), ("lease_until", ASCENDING)),  # reclaim expired leases
+        _index(("expire_at", ASCENDING), expireAfterSeconds=0),  # settled jobs, with ANALYSIS_JOB_TTL_DAYS
+    ],
+}
+
+
+def _key(keys) -> Tuple[Tuple[str, Any], ...]:
+    return tuple((field, direction) for field, direction in keys)
+
+
+def _declared_key(model: IndexModel) -> Tuple[Tuple[str, Any], ...]:
+    key = []
+    for field, direction in model.document["key"].items():
+        if direction != TEXT:
+            key.append((field, direction))
+        elif ("_fts", TEXT) not in key:
+            # The server reports a text index's fields as ("_fts", "text"), ("_ftsx", 1)
+            key += [("_fts", TEXT), ("_ftsx", 1)]
+    return tuple(key)
+
+
+def _declared(collection: str) -> Dict[Tuple, IndexModel]:
+    return {_declared_key(model): model for model in REQUIRED_INDEXES.get(collection, [])}
+
+
+async def ensure_indexes(db) -> Dict[str, List[str]]:
+    """
+    Create every declared index; existing identical indexes are a no-op
+    Returns index names that could not be built, per collection, e.g. a unique
+    index over data that already has duplicates or a same-named index with
+    different options. Those are logged and left for an operator to resolve.
+    """
+    failed: Dict[str, List[str]] = {}
+    for collection, models in REQUIRED_INDEXES.items():
+        for model in models:
+            name = model.document["name"]
+            try:
+                await db[collection].create_indexes([model])
+            except OperationFailure as e:
+                logger.error(f"❌ Could not create index {collection}.{name}: {e}")
+                failed.setdefault(collection, []).append(name)
+    return failed
+
+
+async def index_report(db) -> Dict[str, Any]:
+    """
+    Compare declared indexes with what exists and how often it is used
+
+    `unused` lists indexes with no operations since the server started
+    (`$indexStats` counters reset on restart, so check `since` before dropping).
+    `undeclared` lists indexes on managed collections that nothing in
+    REQUIRED_INDEXES asks for.
+    """
+    report: Dict[str, Any] = {}
+    names = set(await db.list_collection_names()) | set(REQUIRED_INDEXES)
+    for collection in sorted(names):
+        if collection.startswith("system."):
+            continue
+        declared = _declared(collection)
+        existing = await db[collection].index_information()
+        existing_keys = {_key(info["key"]): name for name, info in existing.items()}
+
+        try:
+            stats = await db[collection].aggregate([{"$indexStats": {}}]).to_list(None)
+        except OperationFailure as e:
+            logger.warning(f"$indexStats not available for {collection}: {e}")
+            stats = []
+        usage = {s["name"]: s["accesses"] for s in stats}
+
+        indexes = []
+        for name, info in existing.items():
+            accesses = usage.get(name, {})
+            indexes.append({
+                "name": name,
+                "key": dict(info["key"]),
+                "unique": info.get("unique", False),
+                "ops": accesses.get("ops"),
+                "since": accesses.get("since"),
+            })
+
+        report[collection] = {
+            "missing": [model.document["name"] for key, model in declared.items() if key not in existing_keys],
+            "unused": [i["name"] for i in indexes if i["name"] != "_id_" and i["ops"] == 0],
+            "undeclared": [name for key, name in existing_keys.items()
+                           if declared and name != "_id_" and key not in declared],
+            "indexes": indexes,
+        }
+    return report
+
+
+def summarize_report(report: Dict[str, Any],
+                     labels: Tuple[str, ...] = ("missing", "unused", "undeclared")) -> List[str]:
+    """One log line per collection with findings under any of `labels`"""
+    lines = []
+    for collection, entry in report.items():
+        parts = [f"{label}: {', '.join(entry[label])}" for label in labels if entry[label]]
+        if parts:
+            lines.append(f"{collection} -> {'; '.join(parts)}")
+    return lines
@@ -0,0 +1,281 @@
+"""
+Database Connection Metrics
+Connection pool settings for the Motor client, read from the environment, and
+pymongo event listeners that record what the pool and the server are doing:
+
+- per collection and command: latency histogram and failure count
+- commands sent to each server in the deployment
+- pool checkout wait histogram, checkout failures by reason, and connection
+  counts (open, in use, created, closed, pool clears)
+
+Listeners run on Motor's worker threads, so every update takes a lock. The
+cost is a dict lookup and a few integer adds per event.
+"""
+
+import bisect
+import logging
+import os
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from pymongo import monitoring
+
+logger = logging.getLogger(__name__)
+
+# Pool configuration; unset values keep the driver (or connection string) default
+POOL_SETTINGS = {
+    "maxPoolSize": ("MONGO_MAX_POOL_SIZE", int),  # driver default 100
+    "minPoolSize": ("MONGO_MIN_POOL_SIZE", int),
+    "maxIdleTimeMS": ("MONGO_MAX_IDLE_TIME_MS", int),
+    "maxConnecting": ("MONGO_MAX_CONNECTING", int),
+    "waitQueueTimeoutMS": ("MONGO_WAIT_QUEUE_TIMEOUT_MS", int),  # how long a request may wait for a connection
+    "connectTimeoutMS": ("MONGO_CONNECT_TIMEOUT_MS", int),
+    "socketTimeoutMS": ("MONGO_SOCKET_TIMEOUT_MS", int),
+    "serverSelectionTimeoutMS": ("MONGO_SERVER_SELECTION_TIMEOUT_MS", int),
+    "readPreference": ("MONGO_READ_PREFERENCE", str),  # primary, primaryPreferred, secondaryPreferred, ...
+    "maxStalenessSeconds": ("MONGO_MAX_STALENESS_SECONDS", int),  # at least 90 when set
+}
+DB_METRICS_ENABLED = os.environ.get('DB_METRICS_ENABLED', 'true').lower() == 'true'
+
+# Histogram bucket upper bounds in milliseconds; the last bucket is unbounded
+LATENCY_BUCKETS_MS = (0.5, 1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+
+
+def pool_options() -> Dict[str, Any]:
+    """MongoClient keyword arguments for the pool settings present in the environment"""
+    options = {}
+    for option, (variable, cast) in POOL_SETTINGS.items():
+        value = os.environ.get(variable)
+        if value:
+            options[option] = cast(value)
+    return options
+
+
+class Histogram:
+    """Fixed-bucket latency histogram in milliseconds"""
+
+    def __init__(self, buckets: Tuple[float, ...] = LATENCY_BUCKETS_MS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def observe(self, value_ms: float) -> None:
+        self.counts[bisect.bisect_left(self.buckets, value_ms)] += 1
+        self.count += 1
+        self.total += value_ms
+        self.max = max(self.max, value_ms)
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Upper bound of the bucket holding the q-th observation, capped at the largest seen"""
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank:
+                return min(self.buckets[index], self.max) if index < len(self.buckets) else self.max
+        return self.max
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "count": self.count,
+            "mean_ms": round(self.total / self.count, 3) if self.count else None,
+            "p50_ms": self.quantile(0.5),
+            "p95_ms": self.quantile(0.95),
+            "p99_ms": self.quantile(0.99),
+            "max_ms": round(self.max, 3),
+            # Cumulative counts per upper bound, Prometheus style
+            "buckets": {
+                **{f"le_{bound:g}": sum(self.counts[:index + 1]) for index, bound in enumerate(self.buckets)},
+                "le_inf": self.count,
+            },
+        }
+
+
+def _collection(event: monitoring.CommandStartedEvent) -> str:
+    target = event.command.get(event.command_name)
+    if event.command_name == "getMore":
+        target = event.command.get("collection")
+    # Database-level commands (aggregate: 1, hello, ping) have no collection
+    return target if isinstance(target, str) else "-"
+
+
+class CommandMetrics(monitoring.CommandListener):
+    """Latency histogram and failure count per (collection, command)"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.in_flight: Dict[Tuple[Any, int], Tuple[str, str]] = {}
+        self.latency: Dict[Tuple[str, str], Histogram] = {}
+        self.failures: Dict[Tuple[str, str], int] = {}
+        self.servers: Dict[str, int] = {}  # commands per "host:port", e.g. to see reads reach secondaries
+
+    def _finish(self, event, failed: bool) -> None:
+        with self.lock:
+            key = self.in_flight.pop((event.connection_id, event.request_id), None)
+            if key is None:
+                return
+            self.latency.setdefault(key, Histogram()).observe(event.duration_micros / 1000)
+            if failed:
+                self.failures[key] = self.failures.get(key, 0) + 1
+
+    def started(self, event: monitoring.CommandStartedEvent) -> None:
+        with self.lock:
+            self.in_flight[(event.connection_id, event.request_id)] = (_collection(event), event.command_name)
+            server = "%s:%s" % event.connection_id
+            self.servers[server] = self.servers.get(server, 0) + 1
+
+    def succeeded(self, event: monitoring.CommandSucceededEvent) -> None:
+        self._finish(event, failed=False)
+
+    def failed(self, event: monitoring.CommandFailedEvent) -> None:
+        self._finish(event, failed=True)
+
+    def snapshot(self) -> List[Dict[str, Any]]:
+        with self.lock:
+            return [
+                {"collection": collection, "command": command,
+                 "failures": self.failures.get((collection, command), 0), **histogram.snapshot()}
+                for (collection, command), histogram in sorted(self.latency.items())
+            ]
+
+    def server_counts(self) -> Dict[str, int]:
+        with self.lock:
+            return dict(self.servers)
+
+    def reset(self) -> None:
+        with self.lock:
+            self.latency.clear()
+            self.failures.clear()
+            self.servers.clear()
+
+
+class PoolMetrics(monitoring.ConnectionPoolListener):
+    """Checkout wait histogram and connection counts across all server pools"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.local = threading.local()  # checkout start, for drivers without event.duration
+        self.checkout_wait = Histogram()
+        self.checkout_failures: Dict[str, int] = {}
+        self.open = 0
+        self.in_use = 0
+        self.created = 0
+        self.closed = 0
+        self.cleared = 0
+
+    def _wait_ms(self, event) -> Optional[float]:
+        duration = getattr(event, "duration", None)  # seconds, pymongo 4.7+
+        if duration is not None:
+            return duration * 1000
+        started = getattr(self.local, "checkout_started", None)
+        return (time.perf_counter() - started) * 1000 if started is not None else None
+
+    def connection_check_out_started(self, event) -> None:
+        self.local.checkout_started = time.perf_counter()
+
+    def connection_checked_out(self, event) -> None:
+        wait_ms = self._wait_ms(event)
+        with self.lock:
+            self.in_use += 1
+            if wait_ms is not None:
+                self.checkout_wait.observe(wait_ms)
+
+    def connection_check_out_failed(self, event) -> None:
+        wait_ms = self._wait_ms(event)
+        with self.lock:
+            # reason is "timeout" when waitQueueTimeoutMS ran out with the pool saturated
+            self.checkout_failures[str(event.reason)] = self.checkout_failures.get(str(event.reason), 0) + 1
+            if wait_ms is not None:
+                self.checkout_wait.observe(wait_ms)
+
+    def connection_checked_in(self, event) -> None:
+        with self.lock:
+            self.in_use -= 1
+
+    def connection_created(self, event) -> None:
+        with self.lock:
+            self.open += 1
+            self.created += 1
+
+    def connection_closed(self, event) -> None:
+        with self.lock:
+            self.open -= 1
+            self.closed += 1
+
+    def pool_cleared(self, event) -> None:
+        with self.lock:
+            self.cleared += 1
+
+    def connection_ready(self, event) -> None:
+        pass
+
+    def pool_created(self, event) -> None:
+        pass
+
+    def pool_ready(self, event) -> None:
+        pass
+
+    def pool_closed(self, event) -> None:
+        pass
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self.lock:
+            return {
+                "connections_open": self.open,
+                "connections_in_use": self.in_use,
+                "connections_created": self.created,
+                "connections_closed": self.closed,
+                "pool_clears": self.cleared,
+                "checkout_failures": dict(self.checkout_failures),
+                "checkout_wait": self.checkout_wait.snapshot(),
+            }
+
+    def reset(self) -> None:
+        """Restart the histograms and event totals; open and in-use counts are kept"""
+        with self.lock:
+            self.checkout_wait = Histogram()
+            self.checkout_failures.clear()
+            self.created = self.closed = self.cleared = 0
+
+
+class DatabaseMetrics:
+    """Command and pool listeners for one MongoClient"""
+
+    def __init__(self):
+        self.commands = CommandMetrics()
+        self.pool = PoolMetrics()
+        self.since = time.time()
+
+    @property
+    def listeners(self) -> List[Any]:
+        return [self.commands, self.pool]
+
+    def snapshot(self, options: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            "since": self.since,
+            "pool_options": options,
+            "pool": self.pool.snapshot(),
+            "commands": self.commands.snapshot(),
+            "servers": self.commands.server_counts(),
+        }
+
+    def reset(self) -> None:
+        self.commands.reset()
+        self.pool.reset()
+        self.since = time.time()
+
+
+# Initialize singleton instance
+_database_metrics: Optional[DatabaseMetrics] = None
+
+
+def get_database_metrics() -> DatabaseMetrics:
+    global _database_metrics
+    if _database_metrics is None:
+        _database_metrics = DatabaseMetrics()
+    return _database_metrics
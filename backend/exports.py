@@ -0,0 +1,135 @@
+"""
+Dataset Exports
+Streams projects, field data and credits as NDJSON or CSV for registry
+partners. Documents are read from a Motor cursor in batches and written out
+as they arrive, so memory stays flat however large the collection is.
+Image blobs and image metadata are never exported.
+"""
+
+import csv
+import io
+import json
+import os
+from datetime import datetime
+from enum import Enum
+from typing import Any, AsyncIterator, Dict, List
+
+from pymongo import ASCENDING
+
+# Export configuration
+EXPORT_BATCH_SIZE = int(os.environ.get('EXPORT_BATCH_SIZE', '1000'))
+EXPORT_FLUSH_ROWS = 200  # rows joined into one chunk of the response body
+
+
+class ExportFormat(str, Enum):
+    NDJSON = "ndjson"
+    CSV = "csv"
+
+
+MEDIA_TYPES = {
+    ExportFormat.NDJSON: "application/x-ndjson",
+    ExportFormat.CSV: "text/csv; charset=utf-8",
+}
+
+# Heavy fields left out of every export
+EXCLUDED_FIELDS = {
+    "projects": ["images", "image_metadata"],
+    "field_data": ["images", "image_metadata"],
+    "credits": [],
+}
+
+# CSV columns; dotted names read nested fields
+CSV_COLUMNS = {
+    "projects": [
+        "id", "title", "description", "methodology", "ecosystem_type", "area_hectares",
+        "status", "vintage", "owner_id", "validator_id", "location",
+        "metrics.hectares_monitored", "metrics.credits_issued", "metrics.credits_retired",
+        "metrics.biomass_estimate", "blockchain_hash", "created_at", "updated_at",
+    ],
+    "field_data": [
+        "id", "project_id", "plot_id", "gps_coordinates.lat", "gps_coordinates.lng",
+        "gps_coordinates.accuracy", "species", "canopy_cover", "soil_type", "notes",
+        "measurements", "credibility_score", "analysis_status", "collector_id",
+        "validated", "validator_id", "created_at",
+    ],
+    "credits": [
+        "id", "project_id", "owner_id", "amount", "vintage", "methodology", "status",
+        "metadata.mrv_hash", "metadata.data_bundle_uri", "metadata.uncertainty_class",
+        "metadata.verification_standard", "blockchain_tx_hash", "blockchain_token_id",
+        "issued_to", "retired_by", "retired_at", "created_at", "updated_at",
+    ],
+}
+
+DATASETS = tuple(CSV_COLUMNS)
+
+
+def export_projection(dataset: str, export_format: ExportFormat) -> Dict[str, Any]:
+    if export_format == ExportFormat.CSV:
+        # Fetch only the column roots
+        projection = {column.split(".")[0]: 1 for column in CSV_COLUMNS[dataset]}
+        projection["_id"] = 0
+        return projection
+    return {"_id": 0, **{field: 0 for field in EXCLUDED_FIELDS[dataset]}}
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return str(value)
+
+
+def _cell(doc: Dict[str, Any], column: str) -> Any:
+    value: Any = doc
+    for part in column.split("."):
+        if not isinstance(value, dict):
+            return ""
+        value = value.get(part)
+    if value is None:
+        return ""
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, (dict, list)):
+        return json.dumps(value, default=_json_default, separators=(",", ":"))
+    return value
+
+
+async def ndjson_rows(cursor) -> AsyncIterator[str]:
+    lines: List[str] = []
+    async for doc in cursor:
+        lines.append(json.dumps(doc, default=_json_default, separators=(",", ":")))
+        if len(lines) >= EXPORT_FLUSH_ROWS:
+            yield "\n".join(lines) + "\n"
+            lines = []
+    if lines:
+        yield "\n".join(lines) + "\n"
+
+
+async def csv_rows(cursor, columns: List[str]) -> AsyncIterator[str]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(columns)
+    rows = 0
+    async for doc in cursor:
+        writer.writerow([_cell(doc, column) for column in columns])
+        rows += 1
+        if rows % EXPORT_FLUSH_ROWS == 0:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate(0)
+    yield buffer.getvalue()
+
+
+def stream_export(collection, dataset: str, query: Dict[str, Any],
+                  export_format: ExportFormat) -> AsyncIterator[str]:
+    """
+    Body iterator for an export of `query` over `collection`, oldest first
+    The export filters have matching (filter..., created_at, id) indexes in
+    db_indexes.py; allow_disk_use lets any other combination spill its sort to
+    disk instead of failing at the 100 MB in-memory sort limit
+    """
+    cursor = collection.find(query, export_projection(dataset, export_format), allow_disk_use=True) \
+        .sort([("created_at", ASCENDING), ("id", ASCENDING)]) \
+        .batch_size(EXPORT_BATCH_SIZE)
+    if export_format == ExportFormat.CSV:
+        return csv_rows(cursor, CSV_COLUMNS[dataset])
+    return ndjson_rows(cursor)
@@ -1,12 +1,18 @@
-from fastapi import APIRouter, HTTPException, Depends, UploadFile, File, Form
+from fastapi import APIRouter, HTTPException, Depends, UploadFile, File, Form, Response
 from typing import List, Optional
 import json
 from .server import (
     FieldData, FieldDataCreate, User, get_current_active_user, 
-    require_role, UserRole, db, logger
+    require_role, UserRole, db, logger, store_field_image,
+    queue_field_image_analysis, remove_image_hashes, FieldDataPage,
+    fetch_page, PAGE_DEFAULT_LIMIT, trusted_page, trusted_response,
+    FieldDataBulkCreate, insert_field_data_rows, FIELD_DATA_BULK_MAX_ROWS, reader,
+    record_readings
 )
-import os
-import tempfile
+from .measurements import field_data_measurement
+from .analysis_archive import get_analysis_archive
+from .image_store import get_image_store, blob_id_from_url
+from .resumable_uploads import discard_field_data_uploads
 import numpy as np
 from PIL import Image
 import base64
@@ -49,45 +55,6 @@ async def store_image_as_base64(file_content: bytes, filename: str) -> dict:
         logger.error(f"Error converting image to base64: {e}")
         return None
 
-async def analyze_image_credibility(image_path: str) -> dict:
-    """
-    Placeholder for CNN model integration
-    This function will integrate with your pre-trained CNN model
-    """
-    try:
-        # Placeholder analysis - replace with your CNN model
-        # For now, return mock credibility analysis
-        analysis_result = {
-            "credibility_score": 0.85,  # Score between 0-1
-            "confidence": 0.92,
-            "analysis": {
-                "image_quality": "good",
-                "vegetation_detected": True,
-                "anomalies_detected": False,
-                "environmental_consistency": True
-            },
-            "recommendations": [
-                "Image quality is good for analysis",
-                "Vegetation patterns consistent with reported ecosystem type"
-            ]
-        }
-        
-        # TODO: Replace this with actual CNN model inference
-        # model = tf.keras.models.load_model('path/to/your/cnn_model.h5')
-        # preprocessed_image = preprocess_image(image_path)
-        # prediction = model.predict(preprocessed_image)
-        # analysis_result = process_prediction(prediction)
-        
-        return analysis_result
-    except Exception as e:
-        logger.error(f"Error analyzing image credibility: {e}")
-        return {
-            "credibility_score": 0.0,
-            "confidence": 0.0,
-            "analysis": {"error": str(e)},
-            "recommendations": ["Analysis failed - manual review required"]
-        }
-
 @router.post("/", response_model=FieldData)
 async def create_field_data(
     field_data: FieldDataCreate,
@@ -108,97 +75,65 @@ async def create_field_data(
         collector_id=current_user.id
     )
     
-    await db.field_data.insert_one(field_data_obj.dict())
+    field_data_dict = field_data_obj.dict()
+    await db.field_data.insert_one(field_data_dict)
+    await record_readings([field_data_measurement(field_data_dict)])
     return field_data_obj
 
-@router.post("/{field_data_id}/upload-images")
+@router.post("/bulk")
+async def create_field_data_bulk(
+    batch: FieldDataBulkCreate,
+    current_user: User = Depends(get_current_active_user)
+):
+    """Create many field data entries in one request, with an outcome per row"""
+    if len(batch.rows) > FIELD_DATA_BULK_MAX_ROWS:
+        raise HTTPException(status_code=413, detail=f"At most {FIELD_DATA_BULK_MAX_ROWS} rows per request")
+    return await insert_field_data_rows(batch.rows, current_user)
+
+@router.post("/{field_data_id}/upload-images", status_code=202)
 async def upload_field_images(
     field_data_id: str,
+    response: Response,
     files: List[UploadFile] = File(...),
     current_user: User = Depends(get_current_active_user)
 ):
-    """Upload images for field data and analyze with CNN"""
+    """Upload images for field data and queue their CNN analysis"""
     
     # Get field data entry
-    field_data_dict = await db.field_data.find_one({"id": field_data_id})
+    field_data_dict = await db.field_data.find_one({"id": field_data_id}, {"collector_id": 1})
     if not field_data_dict:
         raise HTTPException(status_code=404, detail="Field data not found")
     
-    field_data_obj = FieldData(**field_data_dict)
-    
     # Check permissions
     if (current_user.role == UserRole.USER and 
-        field_data_obj.collector_id != current_user.id):
+        field_data_dict["collector_id"] != current_user.id):
         raise HTTPException(status_code=403, detail="Not authorized")
     
-    uploaded_images = []
-    analysis_results = []
-    
     for file in files:
         if not file.content_type.startswith('image/'):
             raise HTTPException(status_code=400, detail=f"File {file.filename} is not an image")
-        
-        # Read file content
-        content = await file.read()
-        
-        # Store image as base64
-        image_data = await store_image_as_base64(content, file.filename)
-        if image_data:
-            uploaded_images.append(image_data)
-            
-            # Save image temporarily for CNN analysis (optional)
-            with tempfile.NamedTemporaryFile(suffix='.jpg', delete=False) as tmp_file:
-                tmp_file.write(content)
-                tmp_file_path = tmp_file.name
-            
-            try:
-                # Analyze image credibility
-                analysis = await analyze_image_credibility(tmp_file_path)
-                analysis_results.append({
-                    "image_id": image_data["id"],
-                    "filename": file.filename,
-                    **analysis
-                })
-            finally:
-                # Clean up temporary file
-                os.unlink(tmp_file_path)
-    
-    # Calculate overall credibility score
-    if analysis_results:
-        avg_credibility = np.mean([r["credibility_score"] for r in analysis_results])
-    else:
-        avg_credibility = 0.0
     
-    # Get existing images list
-    existing_images = field_data_obj.images if isinstance(field_data_obj.images, list) else []
-    
-    # Update field data with images and analysis
-    update_data = {
-        "images": existing_images + [img["data_url"] for img in uploaded_images],
-        "image_metadata": uploaded_images,  # Store full metadata separately
-        "credibility_score": avg_credibility,
-        "analysis_results": analysis_results
-    }
-    
-    await db.field_data.update_one(
-        {"id": field_data_id},
-        {"$set": update_data}
-    )
+    # Persist the bytes now; analysis runs on the job workers
+    uploaded_images = []
+    for file in files:
+        content = await file.read()
+        uploaded_images.append(await store_field_image(
+            content, file.filename, file.content_type, field_data_id, current_user.id
+        ))
     
-    return {
-        "message": f"Uploaded {len(uploaded_images)} images successfully",
-        "images": uploaded_images,
-        "credibility_score": avg_credibility,
-        "analysis_results": analysis_results
-    }
+    accepted = await queue_field_image_analysis(field_data_id, uploaded_images, current_user.id)
+    response.headers["Location"] = accepted["status_url"]
+    return accepted
 
-@router.get("/", response_model=List[FieldData])
+@router.get("/", response_model=FieldDataPage)
 async def get_field_data(
     project_id: Optional[str] = None,
     validated: Optional[bool] = None,
+    cursor: Optional[str] = None,
+    limit: int = PAGE_DEFAULT_LIMIT,
     current_user: User = Depends(get_current_active_user)
 ):
-    """Get field data entries"""
+    """Get field data entries, newest first, one page at a time"""
     query = {}
     
     if project_id:
@@ -220,8 +155,8 @@ async def get_field_data(
     if current_user.role == UserRole.USER:
         query["collector_id"] = current_user.id
     
-    field_data_list = await db.field_data.find(query).to_list(1000)
-    return [FieldData(**data) for data in field_data_list]
+    field_data_list, next_cursor = await fetch_page(reader("lists").field_data, query, cursor, limit)
+    return trusted_page(FieldDataPage, FieldData, field_data_list, next_cursor)
 
 @router.get("/{field_data_id}", response_model=FieldData)
 async def get_field_data_by_id(
@@ -233,14 +168,40 @@ async def get_field_data_by_id(
     if not field_data_dict:
         raise HTTPException(status_code=404, detail="Field data not found")
     
-    field_data_obj = FieldData(**field_data_dict)
-    
     # Check permissions
     if (current_user.role == UserRole.USER and 
-        field_data_obj.collector_id != current_user.id):
+        field_data_dict["collector_id"] != current_user.id):
         raise HTTPException(status_code=403, detail="Not authorized")
     
-    return field_data_obj
+    return trusted_response(FieldData, field_data_dict)
+
+@router.get("/{field_data_id}/analysis")
+async def get_field_data_analysis(
+    field_data_id: str,
+    current_user: User = Depends(get_current_active_user)
+):
+    """Full analysis results and image metadata, read back from the archive if they were moved there"""
+    field_data_dict = await db.field_data.find_one(
+        {"id": field_data_id},
+        {"_id": 0, "id": 1, "collector_id": 1, "credibility_score": 1, "analysis_status": 1,
+         "analysis_results": 1, "image_metadata": 1, "analysis_archive": 1}
+    )
+    if not field_data_dict:
+        raise HTTPException(status_code=404, detail="Field data not found")
+    
+    if (current_user.role == UserRole.USER and 
+        field_data_dict["collector_id"] != current_user.id):
+        raise HTTPException(status_code=403, detail="Not authorized")
+    
+    field_data_dict = await get_analysis_archive(db).rehydrate(field_data_dict)
+    return {
+        "field_data_id": field_data_id,
+        "credibility_score": field_data_dict.get("credibility_score"),
+        "analysis_status": field_data_dict.get("analysis_status"),
+        "analysis_results": field_data_dict.get("analysis_results") or [],
+        "image_metadata": field_data_dict.get("image_metadata") or [],
+        "archive": field_data_dict.get("analysis_archive")
+    }
 
 @router.put("/{field_data_id}/validate")
 async def validate_field_data(
@@ -280,4 +241,15 @@ async def delete_field_data(
         raise HTTPException(status_code=403, detail="Not authorized")
     
     await db.field_data.delete_one({"id": field_data_id})
+    
+    # Deleted photos should no longer count as prior submissions
+    await remove_image_hashes(field_data_id)
+    await get_analysis_archive(db).discard(field_data_id)
+    await discard_field_data_uploads(db, field_data_id)
+    await get_image_store(db).delete_many(
+        [image.get(field) for image in field_data_obj.image_metadata or []
+         for field in ("blob_id", "thumbnail_blob_id")] +
+        [blob_id_from_url(url) for url in field_data_obj.images]
+    )
+    
     return {"message": "Field data deleted successfully"}
\ No newline at end of file
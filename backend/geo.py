@@ -0,0 +1,167 @@
+"""
+Project Geometry
+Normalizes the `location.polygon` point lists projects are created with into a
+GeoJSON Polygon stored at `location.geometry`, which the 2dsphere index in
+db_indexes.py covers. The original point list is kept as sent, since the
+satellite imagery endpoints and the map components read it.
+
+Also builds the $geoWithin / $geoIntersects / $near filters behind the
+spatial project queries.
+"""
+
+import logging
+import os
+from typing import Any, Dict, List, Optional, Sequence
+
+from pymongo import UpdateOne
+from pymongo.errors import BulkWriteError
+
+logger = logging.getLogger(__name__)
+
+# Spatial query configuration
+GEO_NEAR_MAX_METERS = float(os.environ.get('GEO_NEAR_MAX_METERS', '50000'))
+
+GEOMETRY_FIELD = "location.geometry"
+
+CANNOT_INDEX_GEOMETRY = 16755  # e.g. a ring that crosses itself
+BAD_VALUE = 2  # e.g. a query polygon MongoDB cannot build a loop from
+
+BBOX_MAX_SPAN = 180.0  # degrees of longitude or latitude
+
+# Returned by spatial queries; enough to draw and label a project on a map
+GEO_PROJECTION = {
+    "_id": 0, "id": 1, "title": 1, "status": 1, "ecosystem_type": 1,
+    "area_hectares": 1, "owner_id": 1, GEOMETRY_FIELD: 1,
+}
+
+
+class GeometryError(ValueError):
+    """Raised for point lists and GeoJSON that cannot be indexed"""
+
+
+def _position(point: Any) -> List[float]:
+    """[lng, lat] from a {lat, lng} dict or a [lng, lat] pair"""
+    try:
+        if isinstance(point, dict):
+            lng, lat = float(point["lng"]), float(point["lat"])
+        else:
+            lng, lat = (float(value) for value in point)
+    except (KeyError, TypeError, ValueError) as e:
+        raise GeometryError(f"Invalid polygon point: {point!r}") from e
+    if not (-180 <= lng <= 180 and -90 <= lat <= 90):
+        raise GeometryError(f"Polygon point out of range: {point!r}")
+    return [lng, lat]
+
+
+def polygon_geometry(points: Sequence[Any]) -> Dict[str, Any]:
+    """GeoJSON Polygon for a point list, dropping repeats and closing the ring"""
+    ring: List[List[float]] = []
+    for point in points:
+        position = _position(point)
+        if not ring or ring[-1] != position:
+            ring.append(position)
+    if len(ring) > 1 and ring[0] == ring[-1]:
+        ring.pop()
+    if len({tuple(position) for position in ring}) < 3:
+        raise GeometryError("A polygon needs at least three distinct points")
+    return {"type": "Polygon", "coordinates": [ring + [ring[0]]]}
+
+
+def normalize_location(location: Dict[str, Any]) -> Dict[str, Any]:
+    """location with `geometry` derived from `polygon`, or without it if there is no polygon"""
+    location = {key: value for key, value in location.items() if key != "geometry"}
+    if location.get("polygon"):
+        location["geometry"] = polygon_geometry(location["polygon"])
+    return location
+
+
+def bbox_geometry(bbox: str) -> Dict[str, Any]:
+    """GeoJSON Polygon for a "min_lng,min_lat,max_lng,max_lat" string"""
+    try:
+        min_lng, min_lat, max_lng, max_lat = (float(value) for value in bbox.split(","))
+    except ValueError as e:
+        raise GeometryError("bbox must be min_lng,min_lat,max_lng,max_lat") from e
+    if min_lng >= max_lng or min_lat >= max_lat:
+        raise GeometryError("bbox minimums must be below its maximums")
+    # Polygon edges are great circles, and MongoDB reads a polygon wider than a
+    # hemisphere as its complement (or rejects it), so wide boxes are refused
+    if max_lng - min_lng >= BBOX_MAX_SPAN or max_lat - min_lat >= BBOX_MAX_SPAN:
+        raise GeometryError(f"bbox must span less than {BBOX_MAX_SPAN:g} degrees; split wider areas into several boxes")
+    return polygon_geometry([[min_lng, min_lat], [max_lng, min_lat], [max_lng, max_lat], [min_lng, max_lat]])
+
+
+def point_geometry(point: str) -> Dict[str, Any]:
+    """GeoJSON Point for a "lng,lat" string"""
+    return {"type": "Point", "coordinates": _position(point.split(","))}
+
+
+def query_geometry(geometry: Dict[str, Any]) -> Dict[str, Any]:
+    """Validate a client-supplied GeoJSON Polygon or MultiPolygon"""
+    kind = geometry.get("type")
+    coordinates = geometry.get("coordinates")
+    if kind == "Polygon" and isinstance(coordinates, list) and coordinates:
+        return {"type": "Polygon", "coordinates": [polygon_geometry(ring)["coordinates"][0] for ring in coordinates]}
+    if kind == "MultiPolygon" and isinstance(coordinates, list) and coordinates:
+        return {"type": "MultiPolygon", "coordinates": [
+            query_geometry({"type": "Polygon", "coordinates": polygon})["coordinates"] for polygon in coordinates
+        ]}
+    raise GeometryError("geometry must be a GeoJSON Polygon or MultiPolygon")
+
+
+def within_filter(geometry: Dict[str, Any]) -> Dict[str, Any]:
+    return {GEOMETRY_FIELD: {"$geoWithin": {"$geometry": geometry}}}
+
+
+def intersects_filter(geometry: Dict[str, Any]) -> Dict[str, Any]:
+    return {GEOMETRY_FIELD: {"$geoIntersects": {"$geometry": geometry}}}
+
+
+def near_filter(point: Dict[str, Any], max_distance: Optional[float] = None) -> Dict[str, Any]:
+    """Nearest first; $near needs the 2dsphere index and sorts by distance itself"""
+    if max_distance is None:
+        distance = GEO_NEAR_MAX_METERS
+    elif max_distance > 0:
+        distance = min(max_distance, GEO_NEAR_MAX_METERS)
+    else:
+        raise GeometryError("max_distance must be a positive number of meters")
+    return {GEOMETRY_FIELD: {"$near": {"$geometry": point, "$maxDistance": distance}}}
+
+
+def feature(project: Dict[str, Any]) -> Dict[str, Any]:
+    """GeoJSON Feature for a project returned with GEO_PROJECTION"""
+    properties = {key: value for key, value in project.items() if key not in ("id", "location")}
+    return {
+        "type": "Feature",
+        "id": project["id"],
+        "geometry": (project.get("location") or {}).get("geometry"),
+        "properties": properties,
+    }
+
+
+async def backfill_geometry(db) -> int:
+    """Add `location.geometry` to projects stored before it was derived on write"""
+    requests = []
+    skipped = 0
+    async for project in db.projects.find(
+        {"location.polygon.0": {"$exists": True}, GEOMETRY_FIELD: {"$exists": False}},
+        {"_id": 0, "id": 1, "location.polygon": 1}
+    ):
+        try:
+            geometry = polygon_geometry(project["location"]["polygon"])
+        except GeometryError:
+            skipped += 1
+            continue
+        requests.append(UpdateOne({"id": project["id"]}, {"$set": {GEOMETRY_FIELD: geometry}}))
+    added = len(requests)
+    if requests:
+        try:
+            await db.projects.bulk_write(requests, ordered=False)
+        except BulkWriteError as e:
+            # Rings the index rejects; the rest are written regardless
+            failed = len(e.details.get("writeErrors", []))
+            added -= failed
+            skipped += failed
+        logger.info(f"✅ Added GeoJSON geometry to {added} projects")
+    if skipped:
+        logger.warning(f"⚠️ {skipped} projects have polygons that cannot be indexed")
+    return added
@@ -0,0 +1,185 @@
+"""
+Field Image Ingest
+Decodes each uploaded photo exactly once and derives everything the upload
+path needs from that single decode: EXIF (timestamp, GPS), a perceptual hash,
+a thumbnail and the normalised CNN input tensor, with per-stage timings.
+"""
+
+import asyncio
+import io
+import math
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Any, Dict, Optional, Union
+
+import numpy as np
+from PIL import Image, ImageOps
+
+from credibility_inference import INPUT_SIZE, image_to_tensor
+
+# Ingest configuration
+THUMBNAIL_SIZE = int(os.environ.get('THUMBNAIL_SIZE', '320'))
+THUMBNAIL_QUALITY = int(os.environ.get('THUMBNAIL_QUALITY', '80'))
+INGEST_THREADS = int(os.environ.get('INGEST_THREADS', '4'))
+EXIF_GPS_MAX_DISTANCE_M = float(os.environ.get('EXIF_GPS_MAX_DISTANCE_M', '500'))
+
+# EXIF tag ids
+EXIF_IFD = 0x8769
+GPS_IFD = 0x8825
+TAG_DATETIME = 0x0132
+TAG_DATETIME_ORIGINAL = 0x9003
+TAG_MAKE = 0x010F
+TAG_MODEL = 0x0110
+
+PHASH_SIZE = 32
+PHASH_LOW_FREQ = 8
+
+
+def _dct_matrix(n: int) -> np.ndarray:
+    """Orthonormal DCT-II basis used for the perceptual hash"""
+    k = np.arange(n).reshape(-1, 1)
+    i = np.arange(n).reshape(1, -1)
+    matrix = np.sqrt(2.0 / n) * np.cos(np.pi * (2 * i + 1) * k / (2 * n))
+    matrix[0] /= np.sqrt(2.0)
+    return matrix
+
+_DCT = _dct_matrix(PHASH_SIZE)
+
+
+def perceptual_hash(img: Image.Image) -> str:
+    """64-bit DCT perceptual hash (pHash) as a 16 character hex string"""
+    gray = img.convert("L").resize((PHASH_SIZE, PHASH_SIZE), Image.LANCZOS)
+    pixels = np.asarray(gray, dtype=np.float64)
+    low = (_DCT @ pixels @ _DCT.T)[:PHASH_LOW_FREQ, :PHASH_LOW_FREQ].flatten()
+    # Median excludes the DC term so overall brightness does not dominate
+    bits = low > np.median(low[1:])
+    return f"{int(''.join('1' if b else '0' for b in bits), 2):016x}"
+
+
+def _to_degrees(value, ref) -> Optional[float]:
+    try:
+        degrees, minutes, seconds = (float(v) for v in value)
+    except (TypeError, ValueError, ZeroDivisionError):
+        return None
+    decimal = degrees + minutes / 60.0 + seconds / 3600.0
+    return -decimal if ref in ("S", "W") else decimal
+
+
+def extract_exif(img: Image.Image) -> Dict[str, Any]:
+    """Read capture timestamp, GPS position and camera from EXIF"""
+    exif = img.getexif()
+    if not exif:
+        return {}
+
+    result: Dict[str, Any] = {}
+    taken = exif.get_ifd(EXIF_IFD).get(TAG_DATETIME_ORIGINAL) or exif.get(TAG_DATETIME)
+    if taken:
+        try:
+            result["taken_at"] = datetime.strptime(str(taken).strip("\x00"), "%Y:%m:%d %H:%M:%S").isoformat()
+        except ValueError:
+            result["taken_at_raw"] = str(taken)
+
+    gps = exif.get_ifd(GPS_IFD)
+    if gps:
+        lat = _to_degrees(gps.get(2), gps.get(1))
+        lng = _to_degrees(gps.get(4), gps.get(3))
+        if lat is not None and lng is not None:
+            result["gps"] = {"lat": round(lat, 7), "lng": round(lng, 7)}
+            if gps.get(6) is not None:
+                try:
+                    result["gps"]["alt"] = round(float(gps.get(6)), 2)
+                except (TypeError, ValueError, ZeroDivisionError):
+                    pass
+
+    camera = " ".join(str(exif.get(tag, "")).strip("\x00 ") for tag in (TAG_MAKE, TAG_MODEL)).strip()
+    if camera:
+        result["camera"] = camera
+    return result
+
+
+def gps_distance_m(a: Dict[str, float], b: Dict[str, float]) -> float:
+    """Great-circle distance in metres between two {lat, lng} points"""
+    lat1, lat2 = math.radians(a["lat"]), math.radians(b["lat"])
+    dlat = lat2 - lat1
+    dlng = math.radians(b["lng"] - a["lng"])
+    h = math.sin(dlat / 2) ** 2 + math.cos(lat1) * math.cos(lat2) * math.sin(dlng / 2) ** 2
+    return 6371000.0 * 2 * math.asin(math.sqrt(h))
+
+
+def check_exif_gps(exif: Dict[str, Any], reported: Optional[Dict[str, float]],
+                   max_distance_m: float = EXIF_GPS_MAX_DISTANCE_M) -> Dict[str, Any]:
+    """Compare the photo's EXIF position with the GPS reported for the plot"""
+    if not exif.get("gps"):
+        return {"status": "missing"}
+    if not reported or "lat" not in reported or "lng" not in reported:
+        return {"status": "unverified"}
+    distance = gps_distance_m(exif["gps"], reported)
+    return {
+        "status": "consistent" if distance <= max_distance_m else "inconsistent",
+        "distance_m": round(distance, 1),
+    }
+
+
+def ingest_image(content: Union[bytes, str], input_size: int = INPUT_SIZE,
+                 thumbnail_size: int = THUMBNAIL_SIZE) -> Dict[str, Any]:
+    """
+    Decode an image once and derive EXIF, pHash, thumbnail and model tensor
+    `content` is the image bytes or the path of an image file on disk
+
+    Returns a dict with `width`, `height`, `format`, `exif`, `phash`,
+    `thumbnail` (JPEG bytes), `tensor` (CHW float32) and `timings` in ms.
+    """
+    timings: Dict[str, float] = {}
+    started = time.perf_counter()
+
+    def lap(stage: str, since: float) -> float:
+        now = time.perf_counter()
+        timings[stage] = round((now - since) * 1000, 3)
+        return now
+
+    with Image.open(io.BytesIO(content) if isinstance(content, bytes) else content) as source:
+        width, height = source.size
+        image_format = source.format
+        exif = extract_exif(source)
+        t = lap("exif_ms", started)
+
+        # Single decode, letting JPEG scale down to the largest derivative we need
+        source.draft("RGB", (max(thumbnail_size, input_size),) * 2)
+        img = ImageOps.exif_transpose(source.convert("RGB"))
+        t = lap("decode_ms", t)
+
+    thumb = img.copy()
+    thumb.thumbnail((thumbnail_size, thumbnail_size), Image.LANCZOS)
+    buffer = io.BytesIO()
+    thumb.save(buffer, format="JPEG", quality=THUMBNAIL_QUALITY, optimize=True)
+    t = lap("thumbnail_ms", t)
+
+    # Hashing the thumbnail is equivalent for pHash and avoids a large resample
+    phash = perceptual_hash(thumb)
+    t = lap("phash_ms", t)
+
+    tensor = image_to_tensor(img, input_size)
+    lap("tensor_ms", t)
+    lap("total_ms", started)
+
+    return {
+        "width": width,
+        "height": height,
+        "format": image_format,
+        "exif": exif,
+        "phash": phash,
+        "thumbnail": buffer.getvalue(),
+        "tensor": tensor,
+        "timings": timings,
+    }
+
+
+# Pillow and numpy release the GIL for the heavy lifting, so threads suffice
+ingest_executor = ThreadPoolExecutor(max_workers=INGEST_THREADS, thread_name_prefix="ingest")
+
+async def ingest_image_async(content: Union[bytes, str]) -> Dict[str, Any]:
+    """Run the ingest pass off the event loop"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(ingest_executor, ingest_image, content)
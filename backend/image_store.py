@@ -0,0 +1,221 @@
+"""
+Image Blob Store
+Keeps uploaded images in GridFS instead of base64 inside MongoDB documents.
+Blobs are written and read in chunks so large photos never sit in memory whole.
+
+Blobs never change once written, so they are served with their sha256 as the
+ETag and an immutable Cache-Control. Images are only served to users who may
+see the project or field data entry that owns them, so the default
+Cache-Control is private: browsers keep them, shared caches and CDNs do not.
+Blobs are deleted along with the project or field data entry that references them.
+
+<img> tags cannot send the bearer token, so the API hands out signed URLs: an
+HMAC over the blob id and an expiry. Expiries are rounded up to the next
+IMAGE_URL_TTL_SECONDS window, so a URL stays the same (and cacheable) for a
+whole window and is valid for at least one more.
+"""
+
+import hashlib
+import hmac
+import os
+import time
+import uuid
+from datetime import timezone
+from email.utils import format_datetime
+from typing import Any, AsyncIterator, Dict, Iterable, Optional, Tuple
+
+from gridfs.errors import NoFile
+from motor.motor_asyncio import AsyncIOMotorGridFSBucket
+
+# Storage configuration
+IMAGE_BUCKET = os.environ.get('IMAGE_BUCKET', 'images')
+IMAGE_CHUNK_SIZE = int(os.environ.get('IMAGE_CHUNK_SIZE', str(255 * 1024)))
+IMAGE_CACHE_CONTROL = os.environ.get('IMAGE_CACHE_CONTROL', 'private, max-age=31536000, immutable')
+IMAGE_URL_TTL_SECONDS = int(os.environ.get('IMAGE_URL_TTL_SECONDS', '3600'))
+
+
+def image_url(blob_id: str) -> str:
+    """API path an image blob is served from"""
+    return f"/api/images/{blob_id}"
+
+
+def blob_id_from_url(url: Any) -> Optional[str]:
+    """Blob id an image_url() points at; None for legacy data URLs"""
+    prefix = image_url("")
+    return url[len(prefix):] if isinstance(url, str) and url.startswith(prefix) else None
+
+
+def image_signature(blob_id: str, expires: int, secret: str) -> str:
+    """HMAC binding a blob id to an expiry"""
+    message = f"{blob_id}:{expires}".encode()
+    return hmac.new(secret.encode(), message, hashlib.sha256).hexdigest()
+
+
+def signed_image_url(blob_id: str, secret: str, now: Optional[float] = None) -> Tuple[str, int]:
+    """Signed image_url() for <img> tags and the unix time it expires at"""
+    now = time.time() if now is None else now
+    expires = (int(now) // IMAGE_URL_TTL_SECONDS + 2) * IMAGE_URL_TTL_SECONDS
+    return f"{image_url(blob_id)}?exp={expires}&sig={image_signature(blob_id, expires, secret)}", expires
+
+
+def verify_image_signature(blob_id: str, expires: int, signature: str, secret: str) -> bool:
+    """Whether a signed URL is genuine and not yet expired"""
+    if expires <= time.time():
+        return False
+    return hmac.compare_digest(signature, image_signature(blob_id, expires, secret))
+
+
+def image_etag(grid_out) -> str:
+    """Strong ETag from the content hash recorded at write time"""
+    return f'"{getattr(grid_out, "sha256", None) or grid_out._id}"'
+
+
+def image_headers(grid_out) -> Dict[str, str]:
+    """Caching headers shared by full, partial and 304 responses"""
+    uploaded = grid_out.upload_date
+    if uploaded.tzinfo is None:
+        uploaded = uploaded.replace(tzinfo=timezone.utc)
+    return {
+        "ETag": image_etag(grid_out),
+        "Cache-Control": IMAGE_CACHE_CONTROL,
+        "Last-Modified": format_datetime(uploaded, usegmt=True),
+        "Accept-Ranges": "bytes",
+    }
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Weak comparison of an If-None-Match header against an ETag"""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    tags = [tag.strip() for tag in if_none_match.split(",")]
+    return any(tag.removeprefix("W/") == etag for tag in tags)
+
+
+def parse_byte_range(header: Optional[str], size: int) -> Optional[Tuple[int, int]]:
+    """
+    Parse a single-range `bytes=` header into an inclusive (start, end)
+    Returns None when the full body should be sent (no header, malformed or
+    multi-range); raises ValueError when the range cannot be satisfied
+    """
+    if not header or not header.startswith("bytes=") or "," in header:
+        return None
+    start, sep, end = header[len("bytes="):].strip().partition("-")
+    if not sep or not (start or end) or not all(part.isdigit() for part in (start, end) if part):
+        return None
+
+    if not start:
+        # Suffix range: the last N bytes
+        length = int(end)
+        if length == 0 or size == 0:
+            raise ValueError("Range cannot be satisfied")
+        return max(size - length, 0), size - 1
+
+    first = int(start)
+    last = int(end) if end else size - 1
+    if end and first > last:
+        return None
+    if first >= size:
+        raise ValueError("Range starts past the end of the image")
+    return first, min(last, size - 1)
+
+
+async def iter_blob(grid_out, start: int = 0, end: Optional[int] = None) -> AsyncIterator[bytes]:
+    """Yield bytes start..end (inclusive) of a blob one GridFS chunk at a time"""
+    end = grid_out.length - 1 if end is None else end
+    if start:
+        grid_out.seek(start)
+    remaining = end - start + 1
+    while remaining > 0:
+        chunk = await grid_out.readchunk()
+        if not chunk:
+            break
+        chunk = chunk[:remaining]
+        remaining -= len(chunk)
+        yield chunk
+
+
+class ImageStore:
+    """GridFS-backed store for image blobs keyed by random ids"""
+
+    def __init__(self, db, bucket_name: str = IMAGE_BUCKET):
+        self.bucket = AsyncIOMotorGridFSBucket(db, bucket_name=bucket_name, chunk_size_bytes=IMAGE_CHUNK_SIZE)
+        self.files = db[f"{bucket_name}.files"]
+
+    async def _write(self, chunks: AsyncIterator[bytes], filename: str, content_type: str,
+                     metadata: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        # Random ids; access is checked against the owner recorded in metadata
+        blob_id = uuid.uuid4().hex
+        digest = hashlib.sha256()
+        size = 0
+        grid_in = self.bucket.open_upload_stream_with_id(
+            blob_id, filename, metadata={"content_type": content_type, **(metadata or {})}
+        )
+        try:
+            async for chunk in chunks:
+                digest.update(chunk)
+                size += len(chunk)
+                await grid_in.write(chunk)
+        except BaseException:
+            await grid_in.abort()
+            raise
+
+        sha256 = digest.hexdigest()
+        await grid_in.set("sha256", sha256)
+        await grid_in.close()
+        return {"blob_id": blob_id, "sha256": sha256, "size": size, "content_type": content_type}
+
+    async def put_bytes(self, content: bytes, filename: str, content_type: str,
+                        metadata: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Store an in-memory image"""
+        async def chunks():
+            for start in range(0, len(content), IMAGE_CHUNK_SIZE):
+                yield content[start:start + IMAGE_CHUNK_SIZE]
+        return await self._write(chunks(), filename, content_type, metadata)
+
+    async def put_stream(self, chunks: AsyncIterator[bytes], filename: str, content_type: str,
+                         metadata: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Store an image from an async stream of chunks"""
+        return await self._write(chunks, filename, content_type, metadata)
+
+    async def metadata_many(self, blob_ids: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+        """Metadata of existing blobs by id, for access checks before signing"""
+        cursor = self.files.find({"_id": {"$in": list(set(blob_ids))}}, {"metadata": 1})
+        return {doc["_id"]: doc.get("metadata") or {} async for doc in cursor}
+
+    async def open(self, blob_id: str):
+        """Open a blob for streaming; raises gridfs.NoFile if missing"""
+        return await self.bucket.open_download_stream(blob_id)
+
+    async def read(self, blob_id: str) -> bytes:
+        """Read a whole blob, for consumers that need the bytes in memory"""
+        grid_out = await self.open(blob_id)
+        return await grid_out.read()
+
+    async def delete(self, blob_id: str):
+        await self.bucket.delete(blob_id)
+
+    async def delete_many(self, blob_ids: Iterable[Optional[str]]) -> int:
+        """Delete blobs, skipping empty ids and blobs already gone; returns how many were deleted"""
+        deleted = 0
+        for blob_id in {blob_id for blob_id in blob_ids if blob_id}:
+            try:
+                await self.bucket.delete(blob_id)
+                deleted += 1
+            except NoFile:
+                pass
+        return deleted
+
+
+# Initialize singleton instance
+image_store = None
+
+def get_image_store(db) -> ImageStore:
+    """Get or create the image store for a database"""
+    global image_store
+
+    if image_store is None:
+        image_store = ImageStore(db)
+
+    return image_store
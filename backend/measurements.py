@@ -0,0 +1,201 @@
+"""
+Monitoring Measurements
+Per-project readings over time (NDVI statistics, canopy cover, biomass) in a
+MongoDB time-series collection. The server groups readings that share a
+metaField value into compressed buckets, so a project's history is stored
+compactly and a date-range query reads a handful of buckets, not one document
+per reading.
+
+Readings arrive from three places:
+- field data: canopy cover from each plot survey
+- MRV reports: biomass from each report's analysis
+- the ingest endpoint: NDVI statistics from satellite processing
+
+The backend needs MongoDB 4.4+; time-series collections and `$dateTrunc` need
+5.0+. On 4.4 the collection is created as a regular one (no compression) and
+bucket queries compute bucket starts with `$dateFromParts` instead.
+"""
+
+import logging
+import os
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, Optional
+
+from pymongo.errors import CollectionInvalid, OperationFailure
+
+logger = logging.getLogger(__name__)
+
+# Collection configuration
+MEASUREMENTS_COLLECTION = "measurements"
+MEASUREMENTS_GRANULARITY = os.environ.get('MEASUREMENTS_GRANULARITY', 'hours')  # seconds|minutes|hours
+MEASUREMENTS_QUERY_LIMIT = int(os.environ.get('MEASUREMENTS_QUERY_LIMIT', '5000'))
+
+TIME_FIELD = "observed_at"
+META_FIELD = "meta"  # {"project_id", "plot_id", "source"}
+
+METRICS = ("ndvi_mean", "ndvi_min", "ndvi_max", "ndvi_std", "canopy_cover", "biomass")
+SOURCES = ("field", "mrv", "sentinel2", "manual")
+BUCKET_UNITS = ("day", "week", "month", "quarter", "year")
+INVALID_PIPELINE_OPERATOR = 168  # e.g. $dateTrunc before MongoDB 5.0
+
+# None until the first bucket query finds out
+_date_trunc_supported: Optional[bool] = None
+
+
+def measurement(project_id: str, observed_at: datetime, source: str,
+                values: Dict[str, Any], plot_id: Optional[str] = None) -> Optional[Dict[str, Any]]:
+    """A reading document, or None if none of `values` is a known numeric metric"""
+    readings = {
+        metric: float(value) for metric, value in values.items()
+        if metric in METRICS and isinstance(value, (int, float)) and not isinstance(value, bool)
+    }
+    if not readings:
+        return None
+    if observed_at.tzinfo is None:
+        observed_at = observed_at.replace(tzinfo=timezone.utc)
+    return {
+        TIME_FIELD: observed_at,
+        META_FIELD: {"project_id": project_id, "plot_id": plot_id, "source": source},
+        **readings,
+    }
+
+
+def field_data_measurement(field_data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """Canopy cover reading for a field data record"""
+    return measurement(field_data["project_id"], field_data["created_at"], "field",
+                       {"canopy_cover": field_data.get("canopy_cover")}, field_data.get("plot_id"))
+
+
+def satellite_measurement(project_id: str, observed_at: datetime, stats: Dict[str, Any],
+                          source: str = "sentinel2") -> Optional[Dict[str, Any]]:
+    """NDVI reading from Sentinel Hub statistics ({"mean", "min", "max", "stDev"}) for a project polygon"""
+    return measurement(project_id, observed_at, source, {
+        "ndvi_mean": stats.get("mean"),
+        "ndvi_min": stats.get("min"),
+        "ndvi_max": stats.get("max"),
+        "ndvi_std": stats.get("stDev"),
+    })
+
+
+def mrv_measurement(report: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """Biomass (and any NDVI statistics) carried in an MRV report's analysis data"""
+    analysis = report.get("analysis_data") or {}
+    values = {metric: analysis.get(metric) for metric in METRICS}
+    return measurement(report["project_id"], report["created_at"], "mrv", values)
+
+
+async def ensure_measurements_collection(db) -> bool:
+    """Create the time-series collection if it is missing; True if it is time-series"""
+    try:
+        await db.create_collection(MEASUREMENTS_COLLECTION, timeseries={
+            "timeField": TIME_FIELD,
+            "metaField": META_FIELD,
+            "granularity": MEASUREMENTS_GRANULARITY,
+        })
+        logger.info(f"✅ Created time-series collection {MEASUREMENTS_COLLECTION}")
+    except CollectionInvalid:
+        pass  # already exists
+    except OperationFailure as e:
+        logger.warning(f"⚠️ Time-series collections unavailable ({e}); storing measurements in a regular collection")
+        return False
+    options = await db[MEASUREMENTS_COLLECTION].options()
+    if "timeseries" not in options:
+        logger.warning(f"⚠️ {MEASUREMENTS_COLLECTION} is a regular collection; readings are stored uncompressed")
+    return "timeseries" in options
+
+
+async def record_measurements(db, docs: Iterable[Optional[Dict[str, Any]]]) -> int:
+    """Insert readings, skipping None; returns how many were written"""
+    docs = [doc for doc in docs if doc]
+    if docs:
+        await db[MEASUREMENTS_COLLECTION].insert_many(docs, ordered=False)
+    return len(docs)
+
+
+def range_filter(project_id: str, start: Optional[datetime] = None, end: Optional[datetime] = None,
+                 plot_id: Optional[str] = None, source: Optional[str] = None,
+                 metric: Optional[str] = None) -> Dict[str, Any]:
+    query: Dict[str, Any] = {f"{META_FIELD}.project_id": project_id}
+    if plot_id:
+        query[f"{META_FIELD}.plot_id"] = plot_id
+    if source:
+        query[f"{META_FIELD}.source"] = source
+    if start or end:
+        query[TIME_FIELD] = {**({"$gte": start} if start else {}), **({"$lt": end} if end else {})}
+    if metric:
+        query[metric] = {"$exists": True}
+    return query
+
+
+async def measurement_range(db, project_id: str, metric: str, start: Optional[datetime] = None,
+                            end: Optional[datetime] = None, plot_id: Optional[str] = None,
+                            source: Optional[str] = None,
+                            limit: int = MEASUREMENTS_QUERY_LIMIT) -> List[Dict[str, Any]]:
+    """One metric's readings in [start, end), oldest first"""
+    cursor = db[MEASUREMENTS_COLLECTION].find(
+        range_filter(project_id, start, end, plot_id, source, metric),
+        {"_id": 0, TIME_FIELD: 1, metric: 1, f"{META_FIELD}.plot_id": 1, f"{META_FIELD}.source": 1}
+    ).sort(TIME_FIELD, 1).limit(min(limit, MEASUREMENTS_QUERY_LIMIT))
+    return [
+        {"observed_at": doc[TIME_FIELD], "value": doc[metric],
+         "plot_id": doc[META_FIELD].get("plot_id"), "source": doc[META_FIELD].get("source")}
+        async for doc in cursor
+    ]
+
+
+async def measurement_buckets(db, project_id: str, metric: str, unit: str = "week",
+                              start: Optional[datetime] = None, end: Optional[datetime] = None,
+                              plot_id: Optional[str] = None, source: Optional[str] = None,
+                              timezone_name: str = "UTC") -> List[Dict[str, Any]]:
+    """Count, mean, min and max of one metric per calendar `unit`, oldest first"""
+    global _date_trunc_supported
+
+    def pipeline(bucket: Dict[str, Any]) -> List[Dict[str, Any]]:
+        return [
+            {"$match": range_filter(project_id, start, end, plot_id, source, metric)},
+            {"$group": {
+                "_id": bucket,
+                "count": {"$sum": 1},
+                "mean": {"$avg": f"${metric}"},
+                "min": {"$min": f"${metric}"},
+                "max": {"$max": f"${metric}"},
+            }},
+            {"$sort": {"_id": 1}},
+        ]
+
+    async def run(bucket: Dict[str, Any]) -> List[Dict[str, Any]]:
+        return [
+            {"bucket": row["_id"], "count": row["count"], "mean": row["mean"], "min": row["min"], "max": row["max"]}
+            async for row in db[MEASUREMENTS_COLLECTION].aggregate(pipeline(bucket))
+        ]
+
+    if _date_trunc_supported is not False:
+        try:
+            rows = await run({"$dateTrunc": {"date": f"${TIME_FIELD}", "unit": unit, "timezone": timezone_name}})
+            _date_trunc_supported = True
+            return rows
+        except OperationFailure as e:
+            if e.code != INVALID_PIPELINE_OPERATOR:
+                raise
+            logger.warning("⚠️ $dateTrunc needs MongoDB 5.0+ - bucketing measurements with $dateFromParts")
+            _date_trunc_supported = False
+    return await run(bucket_start(unit, timezone_name))
+
+
+def bucket_start(unit: str, timezone_name: str = "UTC") -> Dict[str, Any]:
+    """
+    Start of the calendar `unit` holding each reading, like $dateTrunc (weeks
+    start on Sunday) but for MongoDB 4.x. Out-of-range days carry into the
+    previous month or year, so a week can start in December
+    """
+    date = {"date": f"${TIME_FIELD}", "timezone": timezone_name}
+    parts: Dict[str, Any] = {"year": {"$year": date}}
+    if unit == "quarter":
+        parts["month"] = {"$subtract": [{"$month": date}, {"$mod": [{"$subtract": [{"$month": date}, 1]}, 3]}]}
+    elif unit != "year":
+        parts["month"] = {"$month": date}
+    if unit == "day":
+        parts["day"] = {"$dayOfMonth": date}
+    elif unit == "week":
+        parts["day"] = {"$subtract": [{"$dayOfMonth": date}, {"$subtract": [{"$dayOfWeek": date}, 1]}]}
+    return {"$dateFromParts": {**parts, "timezone": timezone_name}}
@@ -0,0 +1,109 @@
+"""
+MRV Report Persistence
+Writes an MRV report and its effect on the project as one unit. On a replica
+set both writes run in a multi-document transaction, so a crash between them
+can no longer leave a report without its project update or the reverse. On a
+standalone server (no transactions) the same writes run back to back and the
+metrics reconciler repairs any drift a crash leaves behind.
+
+A report is written twice: once when it is generated and once when the
+blockchain step settles. Each of those is a single transaction (or a pair of
+writes), down from up to six separate round trips.
+"""
+
+import logging
+from typing import Any, Dict, Optional
+
+from pymongo import ReturnDocument
+from pymongo.errors import OperationFailure
+
+logger = logging.getLogger(__name__)
+
+# Returned from the project update; what the report and blockchain metadata need
+PROJECT_FIELDS = {"_id": 0, "id": 1, "title": 1, "owner_id": 1}
+
+
+def project_update(mrv_hash: str, metrics: Dict[str, float], now) -> Dict[str, Any]:
+    """Project changes that come with a new report; its metrics replace the previous report's"""
+    return {"$set": {
+        "mrv_hash": mrv_hash,
+        "updated_at": now,
+        **{f"metrics.{field}": value for field, value in metrics.items()},
+    }}
+
+
+class MrvReportStore:
+    """Transactional writes for the mrv_reports and projects collections"""
+
+    def __init__(self, db):
+        self.db = db
+        self.supports_transactions: Optional[bool] = None  # detected on first use
+
+    async def transactions(self) -> bool:
+        if self.supports_transactions is None:
+            try:
+                hello = await self.db.command("hello")
+                # Replica set members report setName; mongos reports msg "isdbgrid"
+                self.supports_transactions = bool(hello.get("setName")) or hello.get("msg") == "isdbgrid"
+            except OperationFailure as e:
+                logger.warning(f"⚠️ Could not detect transaction support: {e}")
+                self.supports_transactions = False
+            if not self.supports_transactions:
+                logger.warning("⚠️ MongoDB is standalone - MRV reports are written without transactions")
+        return self.supports_transactions
+
+    async def _run(self, writes) -> Any:
+        """Run `writes(session)` in a transaction if possible, else without a session"""
+        if not await self.transactions():
+            return await writes(None)
+        async with await self.db.client.start_session() as session:
+            # with_transaction retries on TransientTransactionError / UnknownTransactionCommitResult
+            return await session.with_transaction(writes)
+
+    async def create(self, report: Dict[str, Any], metrics: Dict[str, float],
+                     now) -> Optional[Dict[str, Any]]:
+        """
+        Insert `report` and apply it to its project
+        Returns the project (PROJECT_FIELDS) or None, writing nothing, if the
+        project does not exist. `report` itself is not modified.
+        """
+        async def writes(session):
+            project = await self.db.projects.find_one_and_update(
+                {"id": report["project_id"]},
+                project_update(report["mrv_hash"], metrics, now),
+                projection=PROJECT_FIELDS,
+                return_document=ReturnDocument.AFTER,
+                session=session
+            )
+            if project is None:
+                return None
+            await self.db.mrv_reports.insert_one({**report}, session=session)
+            return project
+
+        return await self._run(writes)
+
+    async def settle(self, report_id: str, report_changes: Dict[str, Any],
+                     project_id: Optional[str] = None,
+                     project_changes: Optional[Dict[str, Any]] = None) -> None:
+        """Record the blockchain outcome on the report and, if given, the project"""
+        if not project_changes:
+            # A single-document write is atomic on its own
+            await self.db.mrv_reports.update_one({"id": report_id}, {"$set": report_changes})
+            return
+
+        async def writes(session):
+            await self.db.mrv_reports.update_one({"id": report_id}, {"$set": report_changes}, session=session)
+            await self.db.projects.update_one({"id": project_id}, {"$set": project_changes}, session=session)
+
+        await self._run(writes)
+
+
+# Initialize singleton instance
+_mrv_report_store: Optional[MrvReportStore] = None
+
+
+def get_mrv_report_store(db) -> MrvReportStore:
+    global _mrv_report_store
+    if _mrv_report_store is None:
+        _mrv_report_store = MrvReportStore(db)
+    return _mrv_report_store
@@ -0,0 +1,162 @@
+"""
+Keyset Pagination
+Cursor-based paging for list endpoints, newest first on (created_at, id).
+
+A cursor encodes the sort key of the last item on a page; the next page starts
+strictly after it. With an index ending in (created_at, id) every page is an
+index seek plus `limit` reads, no matter how deep the client pages.
+
+Every listed document needs both keys; backfill_sort_keys() adds them at
+startup to documents stored before they were always written.
+"""
+
+import base64
+import json
+import os
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+from bson import ObjectId
+from pymongo import DESCENDING, UpdateOne
+
+# Paging configuration
+PAGE_DEFAULT_LIMIT = int(os.environ.get('PAGE_DEFAULT_LIMIT', '50'))
+PAGE_MAX_LIMIT = int(os.environ.get('PAGE_MAX_LIMIT', '200'))
+
+PAGE_SORT = [("created_at", DESCENDING), ("id", DESCENDING)]
+
+# Collections behind paginated list endpoints
+PAGED_COLLECTIONS = ("projects", "field_data", "credits")
+
+EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+
+class CursorError(ValueError):
+    """Malformed or tampered pagination cursor"""
+
+
+def encode_cursor(doc: Dict[str, Any]) -> str:
+    """Opaque cursor pointing just past `doc`"""
+    created_at = doc["created_at"]
+    payload = json.dumps({"t": created_at.isoformat(), "i": doc["id"]}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, str]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return datetime.fromisoformat(payload["t"]), str(payload["i"])
+    except (ValueError, KeyError, TypeError) as e:
+        raise CursorError("Invalid pagination cursor") from e
+
+
+def after_cursor(query: Dict[str, Any], cursor: Optional[str]) -> Dict[str, Any]:
+    """Narrow `query` to items that sort after the cursor"""
+    if not cursor:
+        return query
+    created_at, doc_id = decode_cursor(cursor)
+    keyset = {"$or": [
+        {"created_at": {"$lt": created_at}},
+        {"created_at": created_at, "id": {"$lt": doc_id}},
+    ]}
+    return {"$and": [query, keyset]} if query else keyset
+
+
+def encode_ranked_cursor(doc: Dict[str, Any]) -> str:
+    """Cursor for relevance-ranked pages; `doc` carries its text `score`"""
+    created_at = doc["created_at"]
+    payload = json.dumps({"s": doc["score"], "t": created_at.isoformat(), "i": doc["id"]}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_ranked_cursor(cursor: str) -> Tuple[float, datetime, str]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return float(payload["s"]), datetime.fromisoformat(payload["t"]), str(payload["i"])
+    except (ValueError, KeyError, TypeError) as e:
+        raise CursorError("Invalid pagination cursor") from e
+
+
+def clamp_limit(limit: Optional[int]) -> int:
+    if not limit or limit < 1:
+        return PAGE_DEFAULT_LIMIT
+    return min(limit, PAGE_MAX_LIMIT)
+
+
+async def paginate(collection, query: Dict[str, Any], cursor: Optional[str] = None,
+                   limit: Optional[int] = None,
+                   projection: Optional[Dict[str, Any]] = None) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+    """
+    Fetch one page of `query`
+    Returns (documents, next_cursor); next_cursor is None on the last page
+    """
+    limit = clamp_limit(limit)
+    # Read one extra document to learn whether another page exists
+    docs = await collection.find(after_cursor(query, cursor), projection) \
+        .sort(PAGE_SORT).limit(limit + 1).to_list(limit + 1)
+    if len(docs) > limit:
+        docs = docs[:limit]
+        return docs, encode_cursor(docs[-1])
+    return docs, None
+
+
+async def paginate_by_relevance(collection, text: str, query: Dict[str, Any], cursor: Optional[str] = None,
+                                limit: Optional[int] = None,
+                                projection: Optional[Dict[str, Any]] = None) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+    """
+    Fetch one page of a $text search, best match first
+    Pages are keyed on (score, created_at, id). The score is only known after
+    $text has matched, so this runs as an aggregation; each document keeps its
+    `score` field. The same search always scores a document the same way, so
+    cursors stay valid unless the document itself is edited.
+    """
+    limit = clamp_limit(limit)
+    pipeline: List[Dict[str, Any]] = [
+        {"$match": {"$text": {"$search": text}, **query}},
+        {"$addFields": {"score": {"$meta": "textScore"}}},
+    ]
+    if cursor:
+        score, created_at, doc_id = decode_ranked_cursor(cursor)
+        pipeline.append({"$match": {"$or": [
+            {"score": {"$lt": score}},
+            {"score": score, "created_at": {"$lt": created_at}},
+            {"score": score, "created_at": created_at, "id": {"$lt": doc_id}},
+        ]}})
+    pipeline.append({"$sort": {"score": -1, "created_at": -1, "id": -1}})
+    pipeline.append({"$limit": limit + 1})
+    if projection:
+        pipeline.append({"$project": {**projection, "score": 1}})
+    docs = await collection.aggregate(pipeline).to_list(limit + 1)
+    if len(docs) > limit:
+        docs = docs[:limit]
+        return docs, encode_ranked_cursor(docs[-1])
+    return docs, None
+
+
+async def backfill_sort_keys(db, collections=PAGED_COLLECTIONS, batch_size: int = 500) -> int:
+    """
+    Add `id` and `created_at` to documents stored without them
+    `id` becomes the string ObjectId (the id the API already showed for such
+    documents) and `created_at` the ObjectId's timestamp. Returns how many
+    documents were updated.
+    """
+    updated = 0
+    for name in collections:
+        requests = []
+        missing = {"$or": [{"id": {"$exists": False}}, {"created_at": {"$exists": False}}]}
+        async for doc in db[name].find(missing, {"_id": 1, "id": 1, "created_at": 1}):
+            keys = {}
+            if "id" not in doc:
+                keys["id"] = str(doc["_id"])
+            if "created_at" not in doc:
+                # Without an ObjectId the creation time is unknown; sort those last
+                keys["created_at"] = doc["_id"].generation_time if isinstance(doc["_id"], ObjectId) else EPOCH
+            requests.append(UpdateOne({"_id": doc["_id"]}, {"$set": keys}))
+            if len(requests) >= batch_size:
+                updated += (await db[name].bulk_write(requests, ordered=False)).modified_count
+                requests = []
+        if requests:
+            updated += (await db[name].bulk_write(requests, ordered=False)).modified_count
+    return updated
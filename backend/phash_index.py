@@ -0,0 +1,180 @@
+"""
+Perceptual Hash Index
+In-memory near-duplicate lookup over 64-bit pHashes of field photos, persisted
+to MongoDB so recycled photos are caught across plots and projects.
+
+Uses multi-index hashing: each hash is split into m substrings (default three
+of ~21 bits) with a lookup table per substring. By the pigeonhole principle any
+hash within Hamming distance r of the query matches at least one substring
+within distance r // m, so a query probes a few hundred nearly empty buckets
+instead of scanning every hash.
+
+Incremental syncs re-read the last PHASH_SYNC_OVERLAP_SECONDS of ObjectId time:
+hashes from concurrent writers can commit out of `_id` order, and a plain
+`_id > last seen` scan would skip the late ones for good. Re-read hashes are
+already indexed and are skipped.
+"""
+
+import os
+from array import array
+from datetime import datetime, timedelta, timezone
+from itertools import combinations
+from typing import Any, Dict, List, Optional, Tuple
+
+from bson import ObjectId
+
+# Duplicate detection configuration
+PHASH_DUPLICATE_RADIUS = int(os.environ.get('PHASH_DUPLICATE_RADIUS', '6'))
+PHASH_DUPLICATE_SCORE_CAP = float(os.environ.get('PHASH_DUPLICATE_SCORE_CAP', '0.2'))
+PHASH_MAX_MATCHES = int(os.environ.get('PHASH_MAX_MATCHES', '5'))
+PHASH_INDEX_CHUNKS = int(os.environ.get('PHASH_INDEX_CHUNKS', '3'))
+PHASH_SYNC_OVERLAP_SECONDS = int(os.environ.get('PHASH_SYNC_OVERLAP_SECONDS', '60'))
+
+HASH_BITS = 64
+
+
+def _flip_masks(bits: int, max_distance: int) -> List[int]:
+    """All masks of `bits` width with at most `max_distance` bits set"""
+    masks = [0]
+    for d in range(1, max_distance + 1):
+        for positions in combinations(range(bits), d):
+            mask = 0
+            for p in positions:
+                mask |= 1 << p
+            masks.append(mask)
+    return masks
+
+
+class PHashIndex:
+    """Multi-index hash table answering Hamming-radius queries"""
+
+    def __init__(self, radius: int = PHASH_DUPLICATE_RADIUS, chunks: int = PHASH_INDEX_CHUNKS):
+        self.radius = radius
+        self.chunks = chunks
+        # Split the 64 bits into near-equal substrings, e.g. 22/21/21
+        widths = [HASH_BITS // chunks + (1 if i < HASH_BITS % chunks else 0) for i in range(chunks)]
+        self.layout = []
+        offset = 0
+        for width in widths:
+            self.layout.append((offset, width, (1 << width) - 1))
+            offset += width
+        self.hashes = array('Q')
+        self.image_ids: List[Optional[str]] = []
+        self.positions: Dict[str, int] = {}
+        self.tables: List[Dict[int, List[int]]] = [{} for _ in range(chunks)]
+        self._masks: Dict[Tuple[int, int], List[int]] = {}
+        self.synced_until: Optional[datetime] = None  # newest ObjectId time loaded
+
+    def __len__(self) -> int:
+        return len(self.positions)
+
+    def _probe_masks(self, width: int, distance: int) -> List[int]:
+        key = (width, distance)
+        if key not in self._masks:
+            self._masks[key] = _flip_masks(width, distance)
+        return self._masks[key]
+
+    def add(self, phash: str, image_id: str):
+        """Add a hash; re-adding an image id is a no-op"""
+        if image_id in self.positions:
+            return
+        value = int(phash, 16)
+        position = len(self.hashes)
+        self.hashes.append(value)
+        self.image_ids.append(image_id)
+        self.positions[image_id] = position
+        for table, (offset, _, mask) in zip(self.tables, self.layout):
+            table.setdefault((value >> offset) & mask, []).append(position)
+
+    def remove(self, image_id: str):
+        """Tombstone an image so it no longer matches"""
+        position = self.positions.pop(image_id, None)
+        if position is not None:
+            self.image_ids[position] = None
+
+    def query(self, phash: str, radius: Optional[int] = None) -> List[Tuple[int, str]]:
+        """Return (distance, image_id) pairs within `radius`, nearest first"""
+        radius = self.radius if radius is None else radius
+        value = int(phash, 16)
+
+        # With radius = chunks * q + extra, the first extra + 1 substrings are
+        # probed at distance q and the rest at q - 1 (Norouzi et al. MIH)
+        q, extra = divmod(radius, self.chunks)
+        candidates = set()
+        for i, (table, (offset, width, mask)) in enumerate(zip(self.tables, self.layout)):
+            distance = q if i <= extra else q - 1
+            if distance < 0:
+                continue
+            chunk = (value >> offset) & mask
+            for flip in self._probe_masks(width, distance):
+                bucket = table.get(chunk ^ flip)
+                if bucket:
+                    candidates.update(bucket)
+
+        hashes, image_ids = self.hashes, self.image_ids
+        matches = []
+        for position in candidates:
+            distance = (hashes[position] ^ value).bit_count()
+            if distance <= radius and image_ids[position] is not None:
+                matches.append((distance, image_ids[position]))
+        matches.sort()
+        return matches
+
+    async def sync(self, collection) -> int:
+        """
+        Load hashes persisted since the last sync, minus the overlap window
+        Keeps every API worker's index current with uploads handled elsewhere.
+        Returns how many hashes were new to this index
+        """
+        query = {}
+        if self.synced_until is not None:
+            since = self.synced_until - timedelta(seconds=PHASH_SYNC_OVERLAP_SECONDS)
+            query = {"_id": {"$gte": ObjectId.from_datetime(since)}}
+        cursor = collection.find(query, {"phash": 1, "image_id": 1}).sort("_id", 1).batch_size(10000)
+        loaded = 0
+        async for doc in cursor:
+            if doc["image_id"] not in self.positions:
+                self.add(doc["phash"], doc["image_id"])
+                loaded += 1
+            if isinstance(doc["_id"], ObjectId):
+                self.synced_until = max(self.synced_until or doc["_id"].generation_time, doc["_id"].generation_time)
+        return loaded
+
+    async def record(self, collection, phash: str, image_id: str, context: Dict[str, Any]):
+        """Persist a hash to MongoDB and add it to the in-memory index"""
+        await collection.update_one(
+            {"image_id": image_id},
+            {"$setOnInsert": {
+                "image_id": image_id,
+                "phash": phash,
+                **context,
+                "created_at": datetime.now(timezone.utc)
+            }},
+            upsert=True
+        )
+        self.add(phash, image_id)
+
+
+def duplicate_check(matches: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Summarise near-duplicate matches for an analysis result"""
+    if not matches:
+        return {"status": "unique", "matches": []}
+    return {
+        "status": "near_duplicate",
+        "matches": matches[:PHASH_MAX_MATCHES],
+        "cross_project": any(m.get("same_project") is False for m in matches),
+        "cross_plot": any(m.get("same_plot") is False for m in matches),
+    }
+
+
+# Initialize singleton instance
+phash_index = None
+
+def get_phash_index() -> PHashIndex:
+    """Get or create the perceptual hash index"""
+    global phash_index
+
+    if phash_index is None:
+        phash_index = PHashIndex()
+
+    return phash_index
@@ -0,0 +1,228 @@
+"""
+Project Metrics
+Keeps Project.metrics current as credits move through their lifecycle and MRV
+reports are filed, so a dashboard reads one project document instead of
+summing credit lists. Credit totals are kept with atomic $inc updates. MRV
+figures (area change, biomass change) are relative to the previous survey, so
+summing them means nothing; a report sets the latest value instead.
+
+Every value is derived from data that stays in the database (credit amounts
+and statuses, each MRV report's `reported_metrics`), so reconcile_metrics()
+can recompute the metrics from scratch and repair drift left by a write that
+failed between the credit or report update and the project update. The
+periodic reconciler takes a lease first, so one process runs it per interval.
+"""
+
+import asyncio
+import logging
+import os
+import socket
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Iterable, List, Optional
+
+from pymongo import DESCENDING, UpdateOne
+from pymongo.errors import DuplicateKeyError
+
+logger = logging.getLogger(__name__)
+
+# Reconciliation configuration
+METRICS_RECONCILE_SECONDS = int(os.environ.get('METRICS_RECONCILE_SECONDS', '3600'))  # 0 disables
+METRICS_TOLERANCE = 1e-6
+METRICS_RECONCILE_LEASE = "metrics_reconciler"  # _id of its document in background_leases
+
+METRIC_FIELDS = ("hectares_monitored", "credits_issued", "credits_retired", "biomass_estimate")
+
+# Metrics a credit's amount counts towards in each status; retired credits stay issued
+CREDIT_STATUS_METRICS = {
+    "issued": ("credits_issued",),
+    "retired": ("credits_issued", "credits_retired"),
+}
+
+# MRV report analysis_data keys; the latest report's value is the metric
+MRV_METRIC_KEYS = {
+    "hectares_monitored": "areaChange",
+    "biomass_estimate": "biomass",
+}
+
+
+def credit_metrics(status: Optional[str], amount: float) -> Dict[str, float]:
+    return {field: amount for field in CREDIT_STATUS_METRICS.get(status, ())}
+
+
+def credit_transition_delta(old_status: Optional[str], new_status: Optional[str],
+                            amount: float) -> Dict[str, float]:
+    """Metric increments for a credit moving from old_status (None if new) to new_status"""
+    old, new = credit_metrics(old_status, amount), credit_metrics(new_status, amount)
+    delta = {field: new.get(field, 0.0) - old.get(field, 0.0) for field in set(old) | set(new)}
+    return {field: value for field, value in delta.items() if value}
+
+
+def mrv_metrics(analysis_data: Dict[str, Any]) -> Dict[str, float]:
+    """Metric values one MRV report sets; metrics it does not report keep their value"""
+    metrics = {}
+    for field, key in MRV_METRIC_KEYS.items():
+        value = analysis_data.get(key)
+        if isinstance(value, (int, float)) and not isinstance(value, bool):
+            metrics[field] = float(value)
+    return metrics
+
+
+async def apply_metrics_delta(projects, project_id: str, delta: Dict[str, float]) -> None:
+    if not delta:
+        return
+    await projects.update_one(
+        {"id": project_id},
+        {"$inc": {f"metrics.{field}": value for field, value in delta.items()}}
+    )
+
+
+def add_delta(total: Dict[str, float], delta: Dict[str, float]) -> Dict[str, float]:
+    for field, value in delta.items():
+        total[field] = total.get(field, 0.0) + value
+    return total
+
+
+async def apply_metrics_deltas(projects, deltas: Dict[str, Dict[str, float]]) -> None:
+    """Apply increments for many projects (keyed by project id) in one bulk write"""
+    requests = [
+        UpdateOne({"id": project_id}, {"$inc": {f"metrics.{field}": value for field, value in delta.items()}})
+        for project_id, delta in deltas.items() if delta
+    ]
+    if requests:
+        await projects.bulk_write(requests, ordered=False)
+
+
+def report_metric(field: str) -> Dict[str, Any]:
+    """A report's value for `field`; reports filed before reported_metrics stored it as metrics_delta"""
+    return {"$ifNull": [f"$reported_metrics.{field}", f"$metrics_delta.{field}"]}
+
+
+async def compute_metrics(db, project_ids: Optional[List[str]] = None) -> Dict[str, Dict[str, float]]:
+    """Metrics recomputed from credits and the latest MRV reports, keyed by project id"""
+    scope = {"project_id": {"$in": project_ids}} if project_ids is not None else {}
+    totals: Dict[str, Dict[str, float]] = {}
+
+    credit_pipeline = [
+        {"$match": {**scope, "status": {"$in": list(CREDIT_STATUS_METRICS)}}},
+        {"$group": {
+            "_id": "$project_id",
+            "credits_issued": {"$sum": "$amount"},
+            "credits_retired": {"$sum": {"$cond": [{"$eq": ["$status", "retired"]}, "$amount", 0]}},
+        }},
+    ]
+    pipelines = [(db.credits, credit_pipeline)]
+    # Per metric, the newest report that set it; (project_id, created_at) index order
+    for field in MRV_METRIC_KEYS:
+        pipelines.append((db.mrv_reports, [
+            {"$match": {**scope, "$or": [{f"reported_metrics.{field}": {"$exists": True}},
+                                         {f"metrics_delta.{field}": {"$exists": True}}]}},
+            {"$sort": {"project_id": 1, "created_at": DESCENDING}},
+            {"$group": {"_id": "$project_id", field: {"$first": report_metric(field)}}},
+        ]))
+    for collection, pipeline in pipelines:
+        async for row in collection.aggregate(pipeline):
+            project_totals = totals.setdefault(row.pop("_id"), {})
+            project_totals.update(row)
+    return totals
+
+
+async def reconcile_metrics(db, project_ids: Optional[List[str]] = None,
+                            repair: bool = True) -> List[Dict[str, Any]]:
+    """
+    Compare stored project metrics with recomputed ones
+    Returns one entry per drifting field. Stored metrics are read before the
+    totals are recomputed, and with repair=True each field is reset only if it
+    still holds the value that was read. An increment applied after that read
+    changes the field, so the reset is skipped rather than overwriting it; the
+    next run settles the field.
+    """
+    query = {"id": {"$in": project_ids}} if project_ids is not None else {}
+    projects = await db.projects.find(query, {"_id": 0, "id": 1, "metrics": 1}).to_list(None)
+    expected = await compute_metrics(db, project_ids)
+    drift = []
+    for project in projects:
+        stored = project.get("metrics") or {}
+        wanted = expected.get(project["id"], {})
+        for field in METRIC_FIELDS:
+            stored_value = stored.get(field)
+            wanted_value = float(wanted.get(field, 0.0))
+            if stored_value is not None and abs(stored_value - wanted_value) <= METRICS_TOLERANCE:
+                continue
+            drift.append({"project_id": project["id"], "field": field,
+                          "stored": stored_value, "expected": wanted_value})
+            if repair:
+                await db.projects.update_one(
+                    {"id": project["id"], f"metrics.{field}": stored_value},
+                    {"$set": {f"metrics.{field}": wanted_value}}
+                )
+    return drift
+
+
+def summarize_drift(drift: Iterable[Dict[str, Any]]) -> Dict[str, int]:
+    """Number of drifting projects per metric"""
+    counts = {field: 0 for field in METRIC_FIELDS}
+    for entry in drift:
+        counts[entry["field"]] += 1
+    return counts
+
+
+class MetricsReconciler:
+    """Periodic background reconciliation of project metrics, one process per interval"""
+
+    def __init__(self, db, interval: int = METRICS_RECONCILE_SECONDS):
+        self.db = db
+        self.interval = interval
+        self.task: Optional[asyncio.Task] = None
+        self.holder = f"{socket.gethostname()}:{os.getpid()}"
+
+    async def acquire(self) -> bool:
+        """
+        Take this interval's run; False if another process (or an earlier start
+        of this one) ran within the last interval
+        """
+        now = datetime.now(timezone.utc)
+        try:
+            # Matches only an expired lease; otherwise the upsert collides on _id
+            await self.db.background_leases.update_one(
+                {"_id": METRICS_RECONCILE_LEASE, "lease_until": {"$lte": now}},
+                {"$set": {"lease_until": now + timedelta(seconds=self.interval), "holder": self.holder}},
+                upsert=True
+            )
+            return True
+        except DuplicateKeyError:
+            return False
+
+    def start(self) -> None:
+        if self.interval > 0 and self.task is None:
+            self.task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self.task:
+            self.task.cancel()
+            try:
+                await self.task
+            except asyncio.CancelledError:
+                pass
+            self.task = None
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                if await self.acquire():
+                    drift = await reconcile_metrics(self.db)
+                    if drift:
+                        logger.warning(f"⚠️ Repaired project metrics drift: {summarize_drift(drift)}")
+            except Exception as e:
+                logger.error(f"❌ Project metrics reconciliation failed: {e}")
+            await asyncio.sleep(self.interval)
+
+
+# Initialize singleton instance
+_metrics_reconciler: Optional[MetricsReconciler] = None
+
+
+def get_metrics_reconciler(db) -> MetricsReconciler:
+    global _metrics_reconciler
+    if _metrics_reconciler is None:
+        _metrics_reconciler = MetricsReconciler(db)
+    return _metrics_reconciler
@@ -0,0 +1,67 @@
+"""
+Read Routing
+Per-route read preference. Heavy read-only endpoints named in
+SECONDARY_READ_ROUTES read with `secondaryPreferred` and a max staleness bound,
+so stats, exports and queue scans stop competing with writes on the primary.
+Everything else, including every write and the single-document reads that
+follow a write (read-your-writes), stays on the primary.
+
+On a standalone server or a set without healthy secondaries,
+secondaryPreferred simply reads from the primary.
+"""
+
+import logging
+import os
+from typing import Optional
+
+from pymongo.read_preferences import SecondaryPreferred
+
+logger = logging.getLogger(__name__)
+
+# Routes that may read from secondaries; see READ_ROUTES
+SECONDARY_READ_ROUTES = {
+    route.strip() for route in os.environ.get('SECONDARY_READ_ROUTES', 'stats,exports,validation_queue').split(',')
+    if route.strip()
+}
+# The server rejects bounds under 90 seconds
+SECONDARY_MAX_STALENESS_SECONDS = max(90, int(os.environ.get('SECONDARY_MAX_STALENESS_SECONDS', '90')))
+
+READ_ROUTES = {
+    "stats": "credit statistics",
+    "exports": "dataset exports",
+    "validation_queue": "validator review queue",
+    # A user may not see a project they just created until the secondary catches up
+    "lists": "project, field data and credit list pages",
+    "search": "project text search",
+    "geo": "spatial project queries",
+    "measurements": "monitoring measurement ranges and buckets",
+}
+
+
+class ReadRouter:
+    """Hands out the primary or a secondaryPreferred view of the database per route"""
+
+    def __init__(self, db, routes=SECONDARY_READ_ROUTES,
+                 max_staleness: int = SECONDARY_MAX_STALENESS_SECONDS):
+        unknown = set(routes) - set(READ_ROUTES)
+        if unknown:
+            logger.warning(f"⚠️ Ignoring unknown SECONDARY_READ_ROUTES: {', '.join(sorted(unknown))}")
+        self.db = db
+        self.routes = set(routes) & set(READ_ROUTES)
+        self.secondary = db.client.get_database(
+            db.name, read_preference=SecondaryPreferred(max_staleness=max_staleness)
+        )
+
+    def db_for(self, route: str):
+        return self.secondary if route in self.routes else self.db
+
+
+# Initialize singleton instance
+_read_router: Optional[ReadRouter] = None
+
+
+def get_read_router(db) -> ReadRouter:
+    global _read_router
+    if _read_router is None:
+        _read_router = ReadRouter(db)
+    return _read_router
@@ -0,0 +1,355 @@
+"""
+Resumable Uploads
+Offset-based chunked uploads for field collectors on unreliable connections.
+
+A client creates a session, PUTs chunks at the current offset, asks for the
+offset again after a dropped connection and finalizes once every byte is in.
+Chunks are staged in MongoDB (`upload_parts`, one document per
+UPLOAD_PART_BYTES) as they stream in, so any API host can take the next chunk
+or the finalize, and neither a chunk nor the assembled file is ever held in
+memory whole.
+
+Each write holds a lease on the session, renewed before every part it stores.
+A request whose lease was taken over stops writing, and its final offset
+update is fenced on the lease, so it cannot move the offset of the upload
+another request now owns.
+
+UploadCleaner runs in the background every UPLOAD_CLEANUP_SECONDS. It reopens
+sessions left in `finalizing` by a crashed request and deletes expired
+sessions with their staged parts.
+"""
+
+import asyncio
+import hashlib
+import logging
+import os
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Any, AsyncIterator, Dict, Optional
+
+from bson import Binary
+
+logger = logging.getLogger(__name__)
+
+# Upload configuration
+UPLOAD_MAX_BYTES = int(os.environ.get('UPLOAD_MAX_BYTES', str(50 * 1024 * 1024)))
+UPLOAD_MAX_CHUNK_BYTES = int(os.environ.get('UPLOAD_MAX_CHUNK_BYTES', str(8 * 1024 * 1024)))
+UPLOAD_PART_BYTES = int(os.environ.get('UPLOAD_PART_BYTES', str(1024 * 1024)))  # well under the 16 MB document limit
+UPLOAD_SESSION_TTL_HOURS = int(os.environ.get('UPLOAD_SESSION_TTL_HOURS', '24'))
+UPLOAD_WRITE_LEASE_SECONDS = int(os.environ.get('UPLOAD_WRITE_LEASE_SECONDS', '120'))
+UPLOAD_FINALIZE_TIMEOUT_SECONDS = int(os.environ.get('UPLOAD_FINALIZE_TIMEOUT_SECONDS', '3600'))
+UPLOAD_CLEANUP_SECONDS = int(os.environ.get('UPLOAD_CLEANUP_SECONDS', '3600'))  # 0 disables
+UPLOAD_CHUNK_HINT_BYTES = 1024 * 1024
+
+
+class UploadError(Exception):
+    """Upload protocol violation carrying the HTTP status to report"""
+
+    def __init__(self, status_code: int, detail: str, offset: Optional[int] = None):
+        super().__init__(detail)
+        self.status_code = status_code
+        self.detail = detail
+        self.offset = offset
+
+
+def session_status(session: Dict[str, Any]) -> Dict[str, Any]:
+    """Client-facing view of an upload session"""
+    return {
+        "upload_id": session["id"],
+        "field_data_id": session["field_data_id"],
+        "filename": session["filename"],
+        "size": session["size"],
+        "offset": session["offset"],
+        "status": session["status"],
+        "chunk_size": UPLOAD_CHUNK_HINT_BYTES,
+        "expires_at": session["expires_at"],
+    }
+
+
+async def create_session(db, field_data_id: str, user_id: str, filename: str,
+                         content_type: str, size: int, sha256: Optional[str] = None) -> Dict[str, Any]:
+    """Open a new upload session"""
+    if not content_type.startswith('image/'):
+        raise UploadError(400, f"File {filename} is not an image")
+    if size <= 0 or size > UPLOAD_MAX_BYTES:
+        raise UploadError(413, f"Upload size must be between 1 and {UPLOAD_MAX_BYTES} bytes")
+
+    now = datetime.now(timezone.utc)
+    session = {
+        "id": str(uuid.uuid4()),
+        "field_data_id": field_data_id,
+        "user_id": user_id,
+        "filename": filename,
+        "content_type": content_type,
+        "size": size,
+        "sha256": sha256.lower() if sha256 else None,
+        "offset": 0,
+        "status": "open",
+        "lease_until": None,
+        "lease_id": None,
+        "created_at": now,
+        "expires_at": now + timedelta(hours=UPLOAD_SESSION_TTL_HOURS),
+    }
+
+    await db.upload_sessions.insert_one(dict(session))
+    return session
+
+
+async def get_session(db, upload_id: str) -> Dict[str, Any]:
+    session = await db.upload_sessions.find_one({"id": upload_id}, {"_id": 0})
+    if not session:
+        raise UploadError(404, "Upload session not found")
+    expires_at = session["expires_at"]
+    if expires_at.tzinfo is None:
+        expires_at = expires_at.replace(tzinfo=timezone.utc)
+    if session["status"] == "open" and expires_at < datetime.now(timezone.utc):
+        raise UploadError(410, "Upload session expired")
+    return session
+
+
+async def renew_lease(db, upload_id: str, lease_id: str) -> bool:
+    """Extend a write lease; False if another request has taken the session over"""
+    result = await db.upload_sessions.update_one(
+        {"id": upload_id, "status": "open", "lease_id": lease_id},
+        {"$set": {"lease_until": datetime.now(timezone.utc) + timedelta(seconds=UPLOAD_WRITE_LEASE_SECONDS)}}
+    )
+    return result.matched_count == 1
+
+
+async def append_chunk(db, session: Dict[str, Any], offset: int, chunks: AsyncIterator[bytes]) -> int:
+    """
+    Write a chunk at `offset`, which must equal the session's current offset
+
+    Bytes that arrive before a dropped connection are kept, so the client
+    resumes from wherever the server actually got to. Returns the new offset.
+    """
+    if session["status"] != "open":
+        raise UploadError(409, "Upload session is not open", session["offset"])
+    if offset != session["offset"]:
+        raise UploadError(409, "Offset does not match current upload offset", session["offset"])
+
+    # Take a write lease so two connections cannot interleave chunks
+    now = datetime.now(timezone.utc)
+    lease_id = str(uuid.uuid4())
+    claimed = await db.upload_sessions.find_one_and_update(
+        {
+            "id": session["id"],
+            "status": "open",
+            "offset": offset,
+            "$or": [{"lease_until": None}, {"lease_until": {"$lt": now}}],
+        },
+        {"$set": {"lease_until": now + timedelta(seconds=UPLOAD_WRITE_LEASE_SECONDS), "lease_id": lease_id}},
+    )
+    if not claimed:
+        current = await db.upload_sessions.find_one({"id": session["id"]}, {"offset": 1})
+        raise UploadError(409, "Upload is being written by another request",
+                          current["offset"] if current else None)
+
+    # Drop any parts past the committed offset left by an aborted write
+    await db.upload_parts.delete_many({"upload_id": session["id"], "offset": {"$gte": offset}})
+
+    written = 0
+    buffer = bytearray()
+    held = True
+
+    async def store_part():
+        nonlocal written, held
+        part = bytes(buffer[:UPLOAD_PART_BYTES])
+        if not part:
+            return
+        # Renewing before every part keeps the lease while a long chunk streams in
+        held = await renew_lease(db, session["id"], lease_id)
+        if not held:
+            raise UploadError(409, "Upload write lease expired; another request took it over")
+        await db.upload_parts.insert_one({
+            "upload_id": session["id"],
+            "offset": offset + written,
+            "length": len(part),
+            "data": Binary(part),
+        })
+        written += len(part)
+        del buffer[:len(part)]
+
+    try:
+        async for chunk in chunks:
+            if written + len(buffer) + len(chunk) > UPLOAD_MAX_CHUNK_BYTES:
+                raise UploadError(413, f"Chunk exceeds {UPLOAD_MAX_CHUNK_BYTES} bytes")
+            if offset + written + len(buffer) + len(chunk) > session["size"]:
+                raise UploadError(400, "Chunk extends past the declared upload size")
+            buffer += chunk
+            while len(buffer) >= UPLOAD_PART_BYTES:
+                await store_part()
+        await store_part()
+    finally:
+        try:
+            # Keep what arrived before the error or dropped connection
+            while held and buffer:
+                await store_part()
+        except Exception as e:
+            logger.warning(f"Could not keep the last part of upload {session['id']}: {e}")
+        # Fenced on the lease, so a request that lost it cannot move the offset
+        await db.upload_sessions.update_one(
+            {"id": session["id"], "lease_id": lease_id},
+            {"$set": {"offset": offset + written, "lease_until": None, "lease_id": None}}
+        )
+
+    return offset + written
+
+
+async def iter_upload(db, upload_id: str) -> AsyncIterator[bytes]:
+    """Yield a staged upload's bytes in order, one part at a time"""
+    cursor = db.upload_parts.find({"upload_id": upload_id}, {"_id": 0, "data": 1}).sort("offset", 1).batch_size(4)
+    async for part in cursor:
+        yield bytes(part["data"])
+
+
+async def begin_finalize(db, session: Dict[str, Any]):
+    """
+    Claim a complete session for finalization
+    Checks every byte arrived and matches the declared digest, if one was given
+    """
+    if session["status"] != "open":
+        raise UploadError(409, "Upload session is not open", session["offset"])
+    if session["offset"] != session["size"]:
+        raise UploadError(409, "Upload is incomplete", session["offset"])
+
+    claimed = await db.upload_sessions.find_one_and_update(
+        {"id": session["id"], "status": "open", "offset": session["size"], "lease_until": None},
+        {"$set": {"status": "finalizing", "finalizing_since": datetime.now(timezone.utc)}}
+    )
+    if not claimed:
+        raise UploadError(409, "Upload is already being finalized")
+
+    # The staged parts must cover the upload without gaps
+    contiguous = 0
+    parts = db.upload_parts.find({"upload_id": session["id"]}, {"_id": 0, "offset": 1, "length": 1})
+    async for part in parts.sort("offset", 1):
+        if part["offset"] != contiguous:
+            break
+        contiguous += part["length"]
+    if contiguous != session["size"]:
+        await db.upload_parts.delete_many({"upload_id": session["id"], "offset": {"$gte": contiguous}})
+        await db.upload_sessions.update_one(
+            {"id": session["id"]}, {"$set": {"status": "open", "offset": contiguous}}
+        )
+        raise UploadError(409, "Upload is missing bytes; resume from the reported offset", contiguous)
+
+    if session.get("sha256"):
+        digest = hashlib.sha256()
+        async for block in iter_upload(db, session["id"]):
+            digest.update(block)
+        if digest.hexdigest() != session["sha256"]:
+            # Let the client re-send from scratch
+            await discard_parts(db, session["id"])
+            await db.upload_sessions.update_one(
+                {"id": session["id"]}, {"$set": {"status": "open", "offset": 0}}
+            )
+            raise UploadError(422, "Uploaded bytes do not match the declared sha256", 0)
+
+
+async def reopen_session(db, session: Dict[str, Any]):
+    """Return a session to `open` after a failed finalization so it can be retried"""
+    await db.upload_sessions.update_one(
+        {"id": session["id"], "status": "finalizing"}, {"$set": {"status": "open"}}
+    )
+
+
+async def abort_session(db, session: Dict[str, Any]):
+    """Cancel an upload and free its staged parts"""
+    await db.upload_sessions.update_one(
+        {"id": session["id"], "status": "open"}, {"$set": {"status": "aborted"}}
+    )
+    await discard_parts(db, session["id"])
+
+
+async def complete_session(db, session: Dict[str, Any], blob_id: str):
+    """Mark a session finalized and remove its staged parts"""
+    await db.upload_sessions.update_one(
+        {"id": session["id"]},
+        {"$set": {"status": "completed", "blob_id": blob_id,
+                  "completed_at": datetime.now(timezone.utc)}}
+    )
+    await discard_parts(db, session["id"])
+
+
+async def discard_parts(db, upload_id: str):
+    await db.upload_parts.delete_many({"upload_id": upload_id})
+
+
+async def discard_field_data_uploads(db, field_data_id: str):
+    """Delete a field data entry's upload sessions and their staged parts"""
+    sessions = await db.upload_sessions.find({"field_data_id": field_data_id}, {"id": 1}).to_list(None)
+    if sessions:
+        upload_ids = [s["id"] for s in sessions]
+        await db.upload_parts.delete_many({"upload_id": {"$in": upload_ids}})
+        await db.upload_sessions.delete_many({"id": {"$in": upload_ids}})
+
+
+async def cleanup_expired_sessions(db) -> int:
+    """
+    Reopen sessions stuck in `finalizing` past UPLOAD_FINALIZE_TIMEOUT_SECONDS,
+    then delete expired sessions and their staged parts. Returns how many
+    sessions were deleted
+    """
+    now = datetime.now(timezone.utc)
+    stale = await db.upload_sessions.update_many(
+        {"status": "finalizing", "$or": [
+            {"finalizing_since": {"$lt": now - timedelta(seconds=UPLOAD_FINALIZE_TIMEOUT_SECONDS)}},
+            {"finalizing_since": {"$exists": False}},
+        ]},
+        {"$set": {"status": "open", "finalizing_since": None}}
+    )
+    if stale.modified_count:
+        logger.warning(f"⚠️ Reopened {stale.modified_count} upload sessions left finalizing")
+
+    # Completed and aborted sessions have no parts left, so they go once expired too
+    expired = await db.upload_sessions.find(
+        {"status": {"$in": ["open", "completed", "aborted"]}, "expires_at": {"$lt": now}}, {"id": 1}
+    ).to_list(None)
+    if expired:
+        expired_ids = [s["id"] for s in expired]
+        await db.upload_parts.delete_many({"upload_id": {"$in": expired_ids}})
+        await db.upload_sessions.delete_many({"id": {"$in": expired_ids}})
+        logger.info(f"Removed {len(expired)} expired upload sessions")
+    return len(expired)
+
+
+class UploadCleaner:
+    """Periodic background cleanup of upload sessions"""
+
+    def __init__(self, db, interval: int = UPLOAD_CLEANUP_SECONDS):
+        self.db = db
+        self.interval = interval
+        self.task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        if self.interval > 0 and self.task is None:
+            self.task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self.task:
+            self.task.cancel()
+            try:
+                await self.task
+            except asyncio.CancelledError:
+                pass
+            self.task = None
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await cleanup_expired_sessions(self.db)
+            except Exception as e:
+                logger.error(f"❌ Upload session cleanup failed: {e}")
+            await asyncio.sleep(self.interval)
+
+
+# Initialize singleton instance
+_upload_cleaner: Optional[UploadCleaner] = None
+
+
+def get_upload_cleaner(db) -> UploadCleaner:
+    global _upload_cleaner
+    if _upload_cleaner is None:
+        _upload_cleaner = UploadCleaner(db)
+    return _upload_cleaner
@@ -1,9 +1,12 @@
-from fastapi import FastAPI, APIRouter, HTTPException, Depends, status, UploadFile, File, Form
+from fastapi import (
+    FastAPI, APIRouter, HTTPException, Depends, status, UploadFile, File, Form, Query, Request, Response,
+    WebSocket, WebSocketDisconnect
+)
+from fastapi.responses import JSONResponse, ORJSONResponse, StreamingResponse
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from fastapi.middleware.cors import CORSMiddleware
 from motor.motor_asyncio import AsyncIOMotorClient
-from pydantic import BaseModel, Field, EmailStr
-from passlib.context import CryptContext
+from pydantic import BaseModel, Field, EmailStr, ValidationError
 from datetime import datetime, timedelta, timezone
 from typing import List, Optional, Dict, Any, Union
 from jose import JWTError, jwt
@@ -14,11 +17,14 @@ import uuid
 import logging
 import hashlib
 import json
-import tempfile
+import asyncio
+import time
 from enum import Enum
 import aiofiles
-import base64
 from bson import ObjectId
+from pymongo import UpdateOne, UpdateMany
+from pymongo.errors import BulkWriteError, OperationFailure, WriteError
+from gridfs.errors import NoFile
 
 # Load environment variables
 ROOT_DIR = Path(__file__).parent
@@ -51,26 +57,106 @@ except Exception as e:
     blockchain = None
 
 
+# Import CNN credibility inference
+try:
+    from credibility_inference import (
+        get_inference_service, failed_analysis,
+        analyze_image_credibility as run_credibility_inference
+    )
+    from image_ingest import ingest_image_async, check_exif_gps
+    INFERENCE_AVAILABLE = True
+except ImportError as e:
+    logging.warning(f"Credibility inference not available: {e}")
+    INFERENCE_AVAILABLE = False
+
+    def failed_analysis(error: str) -> dict:
+        return {
+            "credibility_score": 0.0,
+            "confidence": 0.0,
+            "analysis": {"error": error},
+            "recommendations": ["Analysis failed - manual review required"]
+        }
+
+
+# Import perceptual hash index for near-duplicate photo detection
+try:
+    from phash_index import get_phash_index, duplicate_check, PHASH_DUPLICATE_SCORE_CAP
+    PHASH_INDEX_AVAILABLE = True
+except ImportError as e:
+    logging.warning(f"Perceptual hash index not available: {e}")
+    PHASH_INDEX_AVAILABLE = False
+
+
+# Import image blob store and resumable uploads
+from image_store import (
+    get_image_store, image_url, blob_id_from_url, image_headers, etag_matches, parse_byte_range, iter_blob,
+    signed_image_url, verify_image_signature
+)
+from resumable_uploads import (
+    UploadError, create_session, get_session, append_chunk, begin_finalize, iter_upload,
+    complete_session, reopen_session, abort_session, session_status,
+    discard_field_data_uploads, get_upload_cleaner
+)
+from db_indexes import ensure_indexes, index_report, summarize_report, ENSURE_INDEXES
+from exports import ExportFormat, DATASETS, MEDIA_TYPES, stream_export
+from pagination import (
+    paginate, paginate_by_relevance, clamp_limit, backfill_sort_keys, CursorError, PAGE_DEFAULT_LIMIT, PAGE_MAX_LIMIT
+)
+from geo import (
+    GeometryError, GEO_PROJECTION, CANNOT_INDEX_GEOMETRY, BAD_VALUE, normalize_location, bbox_geometry, point_geometry,
+    query_geometry, within_filter, intersects_filter, near_filter, feature, backfill_geometry
+)
+from analysis_jobs import get_job_queue, job_status, TERMINAL_STATUSES, ANALYSIS_WORKERS
+from mrv_reports import get_mrv_report_store
+from passwords import get_password_hasher, close_password_hasher, PasswordHasherBusy
+from analysis_archive import get_analysis_archive
+from db_metrics import pool_options, get_database_metrics, DB_METRICS_ENABLED
+from read_routing import get_read_router
+from measurements import (
+    METRICS, SOURCES, BUCKET_UNITS, MEASUREMENTS_QUERY_LIMIT, ensure_measurements_collection, measurement,
+    field_data_measurement, mrv_measurement, record_measurements, measurement_range, measurement_buckets
+)
+from change_feed import get_change_feed, Subscription, CHANGE_FEED_COLLECTIONS, UNAVAILABLE
+from project_metrics import (
+    apply_metrics_delta, apply_metrics_deltas, add_delta, credit_transition_delta, mrv_metrics, reconcile_metrics,
+    summarize_drift, get_metrics_reconciler
+)
+
+
 # Configuration
 SECRET_KEY = os.environ.get('SECRET_KEY', 'your-secret-key-here-change-in-production')
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 30 * 24 * 60  # 30 days
+FIELD_DATA_BULK_MAX_ROWS = int(os.environ.get('FIELD_DATA_BULK_MAX_ROWS', '10000'))
+CREDIT_BATCH_MAX_ITEMS = int(os.environ.get('CREDIT_BATCH_MAX_ITEMS', '5000'))
+MEASUREMENT_BATCH_MAX_READINGS = int(os.environ.get('MEASUREMENT_BATCH_MAX_READINGS', '10000'))
+MIGRATION_RETRY_SECONDS = int(os.environ.get('MIGRATION_RETRY_SECONDS', '60'))
+
+# Startup migrations that have not succeeded yet (name -> last error) and their retry tasks
+pending_migrations: Dict[str, str] = {}
+migration_tasks: List[asyncio.Task] = []
 
 # MongoDB connection
 mongo_url = os.environ.get('MONGO_URL') or os.environ.get('MONGODB_URI')
 if not mongo_url:
     raise ValueError("MONGO_URL or MONGODB_URI environment variable is required")
 
-client = AsyncIOMotorClient(mongo_url)
+# Pool sizing, timeouts and read preference come from MONGO_* settings (see db_metrics.py)
+DB_POOL_OPTIONS = pool_options()
+client = AsyncIOMotorClient(
+    mongo_url,
+    **DB_POOL_OPTIONS,
+    event_listeners=get_database_metrics().listeners if DB_METRICS_ENABLED else []
+)
 db_name = os.environ.get('DB_NAME', 'carbon_credit_db')
 db = client[db_name]
 
 # Security
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 security = HTTPBearer()
+optional_security = HTTPBearer(auto_error=False)
 
 # Create FastAPI app
-app = FastAPI(title="Carbon Credit Management API", version="1.0.0")
+app = FastAPI(title="Carbon Credit Management API", version="1.0.0", default_response_class=ORJSONResponse)
 api_router = APIRouter(prefix="/api")
 
 # CORS configuration
@@ -102,6 +188,10 @@ class ProjectStatus(str, Enum):
     ISSUED = "issued"
     REJECTED = "rejected"
 
+class ListView(str, Enum):
+    FULL = "full"
+    SUMMARY = "summary"
+
 class CreditStatus(str, Enum):
     DRAFT = "draft"
     PENDING = "pending"
@@ -158,7 +248,7 @@ class Project(BaseModel):
     validator_id: Optional[str] = None
     metrics: ProjectMetrics = Field(default_factory=ProjectMetrics)
     blockchain_hash: Optional[str] = None
-    images: List[str] = []  # Base64 data URLs for project images
+    images: List[str] = []  # Image URLs (/api/images/{blob_id}) or legacy base64 data URLs
     image_metadata: Optional[List[Dict[str, Any]]] = []  # Image metadata (filename, size, etc)
     created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
     updated_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
@@ -173,6 +263,56 @@ class ProjectCreate(BaseModel):
     vintage: str
     images: Optional[List[str]] = []  # Allow images to be passed during creation
 
+class ProjectPage(BaseModel):
+    items: List[Project]
+    next_cursor: Optional[str] = None  # Pass back as ?cursor= for the next page
+
+class ProjectSummary(BaseModel):
+    """List-view projection of a project; no image data beyond a cover image URL"""
+    id: str
+    title: str
+    methodology: str
+    ecosystem_type: str
+    area_hectares: float
+    status: ProjectStatus
+    vintage: str
+    owner_id: str
+    metrics: ProjectMetrics = Field(default_factory=ProjectMetrics)
+    cover_image: Optional[str] = None
+    image_count: int = 0
+    created_at: datetime
+    updated_at: datetime
+
+# Mongo projection producing exactly the ProjectSummary fields
+PROJECT_SUMMARY_PROJECTION = {
+    "_id": 0, "id": 1, "title": 1, "methodology": 1, "ecosystem_type": 1,
+    "area_hectares": 1, "status": 1, "vintage": 1, "owner_id": 1, "metrics": 1,
+    "created_at": 1, "updated_at": 1,
+    # Legacy base64 data URLs are left out; they would dwarf the rest of the page
+    "cover_image": {"$let": {
+        "vars": {"first": {"$ifNull": [{"$arrayElemAt": ["$images", 0]}, ""]}},
+        "in": {"$cond": [
+            {"$in": [{"$substrCP": ["$$first", 0, 5]}, ["", "data:"]]}, None, "$$first"
+        ]}
+    }},
+    "image_count": {"$size": {"$ifNull": ["$images", []]}}
+}
+
+class ProjectSummaryPage(BaseModel):
+    items: List[ProjectSummary]
+    next_cursor: Optional[str] = None
+
+class ProjectSearchResult(ProjectSummary):
+    score: float  # Text relevance; higher is better
+
+class ProjectSearchPage(BaseModel):
+    items: List[ProjectSearchResult]
+    next_cursor: Optional[str] = None
+
+class GeoQuery(BaseModel):
+    geometry: Dict[str, Any]  # GeoJSON Polygon or MultiPolygon, [lng, lat] positions
+    limit: Optional[int] = None
+
 class FieldData(BaseModel):
     id: str = Field(default_factory=lambda: str(uuid.uuid4()))
     project_id: str
@@ -182,11 +322,14 @@ class FieldData(BaseModel):
     canopy_cover: float = 0.0
     soil_type: Optional[str] = None
     notes: Optional[str] = None
-    images: List[str] = []  # Base64 data URLs
+    images: List[str] = []  # Image URLs (/api/images/{blob_id})
     image_metadata: Optional[List[Dict[str, Any]]] = []  # Full image metadata
     measurements: Optional[str] = None
     credibility_score: Optional[float] = None  # From CNN analysis
     analysis_results: Optional[List[Dict[str, Any]]] = None
+    analysis_status: Optional[str] = None  # pending while an analysis job is queued, failed if one gave up
+    analysis_error: Optional[str] = None  # Last error of an analysis job that failed for good
+    analysis_archive: Optional[Dict[str, Any]] = None  # Summary left when analysis_results move to the cold tier
     collector_id: str
     validated: bool = False
     validator_id: Optional[str] = None
@@ -202,6 +345,36 @@ class FieldDataCreate(BaseModel):
     notes: Optional[str] = None
     measurements: Optional[str] = None
 
+class FieldDataPage(BaseModel):
+    items: List[FieldData]
+    next_cursor: Optional[str] = None
+
+class FieldDataBulkCreate(BaseModel):
+    rows: List[Any]  # Each row is validated on its own against FieldDataCreate
+
+class MeasurementReading(BaseModel):
+    observed_at: datetime
+    plot_id: Optional[str] = None
+    source: str = "sentinel2"  # sentinel2, field, mrv or manual
+    ndvi_mean: Optional[float] = None
+    ndvi_min: Optional[float] = None
+    ndvi_max: Optional[float] = None
+    ndvi_std: Optional[float] = None
+    canopy_cover: Optional[float] = None
+    biomass: Optional[float] = None
+
+class MeasurementBatch(BaseModel):
+    readings: List[MeasurementReading]
+
+class ImageSignRequest(BaseModel):
+    urls: List[str] = Field(..., max_length=PAGE_MAX_LIMIT)  # Stored image URLs (/api/images/{blob_id})
+
+class UploadSessionCreate(BaseModel):
+    filename: str
+    content_type: str
+    size: int  # Total bytes the client will send
+    sha256: Optional[str] = None  # Optional digest verified on finalize
+
 class CreditMetadata(BaseModel):
     mrv_hash: str
     data_bundle_uri: str  # Data bundle identifier or URI
@@ -217,6 +390,7 @@ class Credit(BaseModel):
     methodology: str
     status: CreditStatus = CreditStatus.DRAFT
     metadata: CreditMetadata
+    owner_id: Optional[str] = None  # Project owner, copied at creation for user-scoped queries
     blockchain_tx_hash: Optional[str] = None
     blockchain_token_id: Optional[str] = None
     issued_to: Optional[str] = None
@@ -232,12 +406,58 @@ class CreditCreate(BaseModel):
     methodology: str
     metadata: CreditMetadata
 
+class CreditPage(BaseModel):
+    items: List[Credit]
+    next_cursor: Optional[str] = None
+
+class CreditBatchCreate(BaseModel):
+    credits: List[Any]  # Each item is validated on its own against CreditCreate
+
+class CreditIssueItem(BaseModel):
+    credit_id: str
+    issued_to: str
+
+class CreditBatchIssue(BaseModel):
+    items: List[CreditIssueItem]
+
+class CreditSummary(BaseModel):
+    """List-view projection of a credit without MRV metadata or chain details"""
+    id: str
+    project_id: str
+    owner_id: Optional[str] = None
+    amount: float
+    vintage: str
+    methodology: str
+    status: CreditStatus
+    issued_to: Optional[str] = None
+    created_at: datetime
+
+CREDIT_SUMMARY_PROJECTION = {"_id": 0, **{field: 1 for field in CreditSummary.model_fields}}
+
+class CreditSummaryPage(BaseModel):
+    items: List[CreditSummary]
+    next_cursor: Optional[str] = None
+
 # Authentication utilities
-def verify_password(plain_password, hashed_password):
-    return pwd_context.verify(plain_password, hashed_password)
+def password_hasher_busy() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail="Too many sign-ins in progress, please retry",
+        headers={"Retry-After": "1"},
+    )
+
+async def verify_password(plain_password, hashed_password) -> tuple:
+    """(matches, replacement hash if the stored one uses another cost), off the event loop"""
+    try:
+        return await get_password_hasher().verify(plain_password, hashed_password)
+    except PasswordHasherBusy:
+        raise password_hasher_busy()
 
-def get_password_hash(password):
-    return pwd_context.hash(password)
+async def get_password_hash(password) -> str:
+    try:
+        return await get_password_hasher().hash(password)
+    except PasswordHasherBusy:
+        raise password_hasher_busy()
 
 def create_access_token(data: dict, expires_delta: Union[timedelta, None] = None):
     to_encode = data.copy()
@@ -249,24 +469,28 @@ def create_access_token(data: dict, expires_delta: Union[timedelta, None] = None
     encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
     return encoded_jwt
 
-async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security)):
-    credentials_exception = HTTPException(
-        status_code=status.HTTP_401_UNAUTHORIZED,
-        detail="Could not validate credentials",
-        headers={"WWW-Authenticate": "Bearer"},
-    )
+async def user_for_token(token: str) -> Optional[User]:
+    """User an access token was issued to; None if the token is invalid"""
     try:
-        payload = jwt.decode(credentials.credentials, SECRET_KEY, algorithms=[ALGORITHM])
-        username: str = payload.get("sub")
-        if username is None:
-            raise credentials_exception
+        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
     except JWTError:
-        raise credentials_exception
+        return None
+    username: str = payload.get("sub")
+    if username is None:
+        return None
     
     user_dict = await db.users.find_one({"username": username})
-    if user_dict is None:
-        raise credentials_exception
-    return User(**user_dict)
+    return User(**user_dict) if user_dict else None
+
+async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security)):
+    user = await user_for_token(credentials.credentials)
+    if user is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Could not validate credentials",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    return user
 
 async def get_current_active_user(current_user: User = Depends(get_current_user)):
     if not current_user.is_active:
@@ -283,59 +507,595 @@ def require_role(required_roles: List[UserRole]):
         return current_user
     return role_checker
 
+def reader(route: str):
+    """Database to read from for a route; secondaryPreferred if listed in SECONDARY_READ_ROUTES"""
+    return get_read_router(db).db_for(route)
+
+async def record_readings(docs: List[Optional[dict]]):
+    """Write monitoring readings alongside a primary write; a failure is logged, not raised"""
+    try:
+        await record_measurements(db, docs)
+    except Exception as e:
+        logger.warning(f"⚠️ Failed to record monitoring measurements: {e}")
+
+async def fetch_page(collection, query: dict, cursor: Optional[str], limit: int,
+                     projection: Optional[dict] = None) -> tuple:
+    """Keyset-paginate a list endpoint; a bad cursor is a client error"""
+    try:
+        return await paginate(collection, query, cursor, limit, projection)
+    except CursorError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+def field_default(field) -> Any:
+    value = field.get_default(call_default_factory=True)
+    return value.model_dump() if isinstance(value, BaseModel) else value
+
+def trusted(model, doc: dict) -> dict:
+    """
+    Shape a document this API wrote as `model`, without validating it
+    Stored documents were validated on the way in, so this only drops unknown
+    keys such as _id and fills defaults for fields older documents lack.
+    """
+    return {
+        name: doc[name] if name in doc else field_default(field)
+        for name, field in model.model_fields.items()
+    }
+
+def trusted_response(model, doc: dict) -> ORJSONResponse:
+    """Render a trusted document with orjson, bypassing response_model re-validation"""
+    return ORJSONResponse(trusted(model, doc))
+
+def trusted_page(page_model, item_model, docs: List[dict], next_cursor: Optional[str]) -> ORJSONResponse:
+    """Respond with a page of trusted documents; page_model documents the shape"""
+    return ORJSONResponse({
+        "items": [trusted(item_model, doc) for doc in docs],
+        "next_cursor": next_cursor
+    })
+
+async def aggregate_credit_stats(query: dict) -> dict:
+    """
+    Credit counts and amounts by status, computed in MongoDB
+    A single $group over (status, amount) is answered from the covering
+    indexes in db_indexes.py without fetching credit documents.
+    User-scoped queries filter on the denormalized `owner_id`.
+    """
+    pipeline = [{"$match": query}]
+    if not query:
+        # Sorting on status lets the planner walk the (status, amount) index
+        # instead of scanning the collection
+        pipeline.append({"$sort": {"status": 1}})
+    pipeline += [
+        {"$project": {"_id": 0, "status": 1, "amount": 1}},
+        {"$group": {"_id": "$status", "count": {"$sum": 1}, "amount": {"$sum": "$amount"}}}
+    ]
+    by_status = {row["_id"]: row async for row in reader("stats").credits.aggregate(pipeline)}
+    
+    def count(status: CreditStatus) -> int:
+        return by_status.get(status.value, {}).get("count", 0)
+    
+    def amount(status: CreditStatus) -> float:
+        return by_status.get(status.value, {}).get("amount", 0)
+    
+    return {
+        "total_credits": sum(row["count"] for row in by_status.values()),
+        "issued_credits": count(CreditStatus.ISSUED),
+        "retired_credits": count(CreditStatus.RETIRED),
+        "pending_credits": count(CreditStatus.PENDING),
+        "total_amount": sum(row["amount"] for row in by_status.values()),
+        "issued_amount": amount(CreditStatus.ISSUED),
+        "retired_amount": amount(CreditStatus.RETIRED)
+    }
+
+async def backfill_credit_owners(batch_size: int = 500) -> int:
+    """
+    Copy the project owner onto credits created before owner_id was stored
+    One UpdateMany per project, sent in bulk batches; plain find/update so it
+    runs on every supported MongoDB version.
+    """
+    project_ids = await db.credits.distinct("project_id", {"owner_id": None})
+    if not project_ids:
+        return 0
+    
+    updates = []
+    async for project in db.projects.find({"id": {"$in": project_ids}}, {"_id": 0, "id": 1, "owner_id": 1}):
+        if project.get("owner_id"):
+            updates.append(UpdateMany({"project_id": project["id"], "owner_id": None},
+                                      {"$set": {"owner_id": project["owner_id"]}}))
+    for start in range(0, len(updates), batch_size):
+        await db.credits.bulk_write(updates[start:start + batch_size], ordered=False)
+    
+    remaining = await db.credits.count_documents({"owner_id": None})
+    logger.info(f"✅ Backfilled credit owners ({remaining} credits without a matching project)")
+    return remaining
+
+async def run_migration(name: str, migrate):
+    """
+    Run a startup migration; if it fails, keep retrying in the background
+    Until it succeeds the migration is listed under pending_migrations in /api/health.
+    """
+    try:
+        await migrate()
+        return
+    except Exception as e:
+        pending_migrations[name] = str(e)
+        logger.error(f"❌ Migration {name} failed, retrying every {MIGRATION_RETRY_SECONDS}s: {e}")
+    
+    async def retry():
+        while name in pending_migrations:
+            await asyncio.sleep(MIGRATION_RETRY_SECONDS)
+            try:
+                await migrate()
+                pending_migrations.pop(name)
+                logger.info(f"✅ Migration {name} succeeded on retry")
+            except Exception as e:
+                pending_migrations[name] = str(e)
+                logger.error(f"❌ Migration {name} failed again: {e}")
+    
+    migration_tasks.append(asyncio.create_task(retry()))
+
 # Utility functions for image storage and CNN integration
-async def store_image_as_base64(file_content: bytes, filename: str) -> dict:
-    """Convert image to base64 and store metadata"""
+async def analyze_image_credibility(image_content: bytes) -> dict:
+    """Score an uploaded image with the batched CNN inference service"""
+    if not INFERENCE_AVAILABLE:
+        return failed_analysis("Credibility inference service not available")
+    return await run_credibility_inference(image_content)
+
+async def ingest_and_analyze(image_content: bytes, reported_gps: Optional[Dict[str, float]] = None,
+                             thumbnail_metadata: Optional[Dict[str, Any]] = None) -> tuple:
+    """
+    Decode an image once and derive its metadata and credibility analysis
+    Returns (metadata, analysis); both carry data from the same decode. The
+    thumbnail is stored as its own blob and referenced by id and URL
+    """
+    if not INFERENCE_AVAILABLE:
+        return {}, failed_analysis("Credibility inference service not available")
+    
     try:
-        # Convert to base64
-        base64_image = base64.b64encode(file_content).decode('utf-8')
-        
-        # Determine content type from filename extension
-        extension = filename.lower().split('.')[-1]
-        content_type_map = {
-            'jpg': 'image/jpeg',
-            'jpeg': 'image/jpeg',
-            'png': 'image/png',
-            'gif': 'image/gif',
-            'webp': 'image/webp'
-        }
-        content_type = content_type_map.get(extension, 'image/jpeg')
-        
-        # Create data URL format
-        data_url = f"data:{content_type};base64,{base64_image}"
+        ingest = await ingest_image_async(image_content)
+    except Exception as e:
+        logger.error(f"Error decoding uploaded image: {e}")
+        return {}, failed_analysis(f"Could not decode image: {e}")
+    
+    started = time.perf_counter()
+    analysis = await run_credibility_inference(ingest["tensor"])
+    timings = {**ingest["timings"], "inference_ms": round((time.perf_counter() - started) * 1000, 3)}
+    
+    metadata = {
+        "width": ingest["width"],
+        "height": ingest["height"],
+        "format": ingest["format"],
+        "exif": ingest["exif"],
+        "phash": ingest["phash"]
+    }
+    try:
+        thumbnail = await get_image_store(db).put_bytes(
+            ingest["thumbnail"], "thumbnail.jpg", "image/jpeg", metadata=thumbnail_metadata
+        )
+        metadata["thumbnail_blob_id"] = thumbnail["blob_id"]
+        metadata["thumbnail_url"] = image_url(thumbnail["blob_id"])
+    except Exception as e:
+        # A missing thumbnail must not hold up the analysis
+        logger.error(f"Error storing image thumbnail: {e}")
+    analysis = {
+        **analysis,
+        "exif_gps_check": check_exif_gps(ingest["exif"], reported_gps),
+        "timings": timings
+    }
+    return metadata, analysis
+
+async def analyze_field_images(field_data_obj: "FieldData", images: List[dict], sources: List[Union[bytes, str]]) -> List[dict]:
+    """
+    Ingest, score and duplicate-check uploaded field images
+    `sources` are image bytes or spool file paths, aligned with `images`
+    """
+    # Decode each image once; analyze concurrently so images share inference batches
+    ingested = await asyncio.gather(*[
+        ingest_and_analyze(source, field_data_obj.gps_coordinates,
+                           {"field_data_id": field_data_obj.id, "thumbnail_of": image_data["id"]})
+        for image_data, source in zip(images, sources)
+    ])
+    analysis_results = []
+    for image_data, (metadata, analysis) in zip(images, ingested):
+        image_data.update(metadata)
+        analysis_results.append({
+            "image_id": image_data["id"],
+            "filename": image_data["filename"],
+            **analysis
+        })
+    
+    # Recycled photos across plots and projects drag the score down
+    await check_near_duplicates(field_data_obj, images, analysis_results)
+    return analysis_results
+
+async def attach_field_images(field_data_id: str, images: List[dict]):
+    """Append stored images to a field data entry and mark its analysis pending"""
+    updated = await db.field_data.find_one_and_update(
+        {"id": field_data_id},
+        [{"$set": {
+            "images": {"$concatArrays": [{"$ifNull": ["$images", []]}, {"$literal": [img["url"] for img in images]}]},
+            "image_metadata": {"$concatArrays": [{"$ifNull": ["$image_metadata", []]}, {"$literal": images}]},
+            "analysis_status": "pending"
+        }}],
+        projection={"analysis_archive": 1}
+    )
+    # New results are merged with the old ones, so bring archived analyses back first.
+    # Pending is already set, which keeps the archiver away until the job finishes.
+    if updated and updated.get("analysis_archive"):
+        await get_analysis_archive(db).restore(field_data_id)
+
+# Images whose analysis job failed for good and that have no result since
+FAILED_UNANALYZED = {"$filter": {
+    "input": {"$ifNull": ["$analysis_failed_image_ids", []]},
+    "as": "image_id",
+    "cond": {"$not": [{"$in": ["$$image_id", {"$ifNull": ["$analysis_results.image_id", []]}]}]}
+}}
+# pending while an image has neither a result nor a failed job; failed if any image's job gave up
+ANALYSIS_STATUS = {"$cond": [
+    {"$lt": [
+        {"$add": [{"$size": {"$ifNull": ["$analysis_results", []]}}, {"$size": FAILED_UNANALYZED}]},
+        {"$size": {"$ifNull": ["$image_metadata", []]}}
+    ]},
+    "pending",
+    {"$cond": [{"$gt": [{"$size": FAILED_UNANALYZED}, 0]}, "failed", "completed"]}
+]}
+
+async def record_field_analysis(field_data_id: str, images: List[dict], analysis_results: List[dict]) -> float:
+    """
+    Merge image metadata and analyses into a field data entry
+    Re-running for the same images replaces their earlier results, so a retried
+    job never double counts. Recomputes the credibility score server-side; returns it
+    """
+    analyzed_ids = [result["image_id"] for result in analysis_results]
+    updated = await db.field_data.find_one_and_update(
+        {"id": field_data_id},
+        [
+            {"$set": {
+                "image_metadata": {"$map": {
+                    "input": {"$ifNull": ["$image_metadata", []]},
+                    "as": "img",
+                    "in": {"$mergeObjects": [
+                        "$$img",
+                        {"$ifNull": [{"$arrayElemAt": [{"$filter": {
+                            "input": {"$literal": images},
+                            "as": "new",
+                            "cond": {"$eq": ["$$new.id", "$$img.id"]}
+                        }}, 0]}, {}]}
+                    ]}
+                }},
+                "analysis_results": {"$concatArrays": [
+                    {"$filter": {
+                        "input": {"$ifNull": ["$analysis_results", []]},
+                        "as": "result",
+                        "cond": {"$not": [{"$in": ["$$result.image_id", {"$literal": analyzed_ids}]}]}
+                    }},
+                    {"$literal": analysis_results}
+                ]}
+            }},
+            {"$set": {
+                "credibility_score": {"$ifNull": [{"$avg": "$analysis_results.credibility_score"}, 0.0]},
+                "analysis_status": ANALYSIS_STATUS
+            }}
+        ],
+        projection={"credibility_score": 1},
+        return_document=True
+    )
+    return updated["credibility_score"] if updated else 0.0
+
+async def store_field_image(content: bytes, filename: str, content_type: str,
+                            field_data_id: str, user_id: str) -> dict:
+    """Persist an uploaded field image to GridFS and return its metadata entry"""
+    stored = await get_image_store(db).put_bytes(
+        content, filename, content_type,
+        metadata={"field_data_id": field_data_id, "uploaded_by": user_id}
+    )
+    return stored_image_entry(stored, filename)
+
+def stored_image_entry(stored: dict, filename: str) -> dict:
+    """Image metadata entry for a blob in the image store"""
+    return {
+        "id": stored["blob_id"],
+        "blob_id": stored["blob_id"],
+        "url": image_url(stored["blob_id"]),
+        "filename": filename,
+        "content_type": stored["content_type"],
+        "size": stored["size"],
+        "sha256": stored["sha256"],
+        "uploaded_at": datetime.now(timezone.utc)
+    }
+
+async def queue_field_image_analysis(field_data_id: str, images: List[dict], user_id: str) -> dict:
+    """
+    Attach persisted images to field data and enqueue their analysis
+    Returns the 202 response body pointing at the job
+    """
+    await attach_field_images(field_data_id, images)
+    job = await get_job_queue(db).enqueue("field_image_analysis", {
+        "field_data_id": field_data_id,
+        "image_ids": [img["id"] for img in images],
+        "user_id": user_id
+    })
+    return {
+        "message": f"Accepted {len(images)} images for analysis",
+        "job_id": job["id"],
+        "status": job["status"],
+        "status_url": f"/api/jobs/{job['id']}",
+        "events_url": f"/api/jobs/{job['id']}/events",
+        "images": images
+    }
+
+async def insert_field_data_rows(rows: List[Any], current_user: User) -> dict:
+    """
+    Validate and insert a batch of field data rows, reporting an outcome per row
+    Project access is checked once per distinct project_id and accepted rows are
+    written with one unordered insert_many, so a bad row never blocks the rest.
+    """
+    results: List[Optional[dict]] = [None] * len(rows)
+    valid = []
+    for index, row in enumerate(rows):
+        try:
+            valid.append((index, FieldDataCreate.model_validate(row)))
+        except ValidationError as e:
+            results[index] = {"index": index, "status": "invalid",
+                              "errors": e.errors(include_url=False, include_input=False)}
+    
+    project_ids = list({data.project_id for _, data in valid})
+    projects = {
+        project["id"]: project
+        async for project in db.projects.find({"id": {"$in": project_ids}}, {"_id": 0, "id": 1, "owner_id": 1})
+    }
+    
+    docs, positions = [], []
+    for index, data in valid:
+        project = projects.get(data.project_id)
+        if not project:
+            results[index] = {"index": index, "status": "not_found", "error": "Project not found"}
+        elif current_user.role == UserRole.USER and project["owner_id"] != current_user.id:
+            results[index] = {"index": index, "status": "forbidden", "error": "Not authorized for this project"}
+        else:
+            doc = FieldData(**data.dict(), collector_id=current_user.id).dict()
+            docs.append(doc)
+            positions.append(index)
+            results[index] = {"index": index, "status": "created", "id": doc["id"]}
+    
+    if docs:
+        failed = set()
+        try:
+            await db.field_data.insert_many(docs, ordered=False)
+        except BulkWriteError as e:
+            # writeErrors index into docs; the other documents were still inserted
+            for error in e.details.get("writeErrors", []):
+                failed.add(error["index"])
+                index = positions[error["index"]]
+                results[index] = {"index": index, "status": "failed", "error": error.get("errmsg")}
+        await record_readings([field_data_measurement(doc) for i, doc in enumerate(docs) if i not in failed])
+    
+    created = sum(1 for result in results if result["status"] == "created")
+    return {"received": len(rows), "created": created, "failed": len(rows) - created, "results": results}
+
+async def insert_credits(items: List[Any]) -> dict:
+    """
+    Validate and insert a batch of credits, reporting an outcome per item
+    Projects are looked up once per distinct project_id and accepted credits are
+    written with one unordered insert_many.
+    """
+    results: List[Optional[dict]] = [None] * len(items)
+    valid = []
+    for index, item in enumerate(items):
+        try:
+            valid.append((index, CreditCreate.model_validate(item)))
+        except ValidationError as e:
+            results[index] = {"index": index, "status": "invalid",
+                              "errors": e.errors(include_url=False, include_input=False)}
+    
+    project_ids = list({data.project_id for _, data in valid})
+    owners = {
+        project["id"]: project["owner_id"]
+        async for project in db.projects.find({"id": {"$in": project_ids}}, {"_id": 0, "id": 1, "owner_id": 1})
+    }
+    
+    docs, positions = [], []
+    for index, data in valid:
+        if data.project_id not in owners:
+            results[index] = {"index": index, "status": "not_found", "error": "Project not found"}
+            continue
+        doc = Credit(**data.dict(), owner_id=owners[data.project_id]).dict()
+        docs.append(doc)
+        positions.append(index)
+        results[index] = {"index": index, "status": "created", "id": doc["id"]}
+    
+    inserted = list(range(len(docs)))
+    if docs:
+        try:
+            await db.credits.insert_many(docs, ordered=False)
+        except BulkWriteError as e:
+            failed = set()
+            for error in e.details.get("writeErrors", []):
+                failed.add(error["index"])
+                index = positions[error["index"]]
+                results[index] = {"index": index, "status": "failed", "error": error.get("errmsg")}
+            inserted = [i for i in inserted if i not in failed]
+    
+    deltas: Dict[str, Dict[str, float]] = {}
+    for i in inserted:
+        add_delta(deltas.setdefault(docs[i]["project_id"], {}),
+                  credit_transition_delta(None, docs[i]["status"], docs[i]["amount"]))
+    await apply_metrics_deltas(db.projects, deltas)
+    
+    created = sum(1 for result in results if result["status"] == "created")
+    return {"received": len(items), "created": created, "failed": len(items) - created, "results": results}
+
+async def issue_credits(items: List[CreditIssueItem]) -> dict:
+    """
+    Issue a batch of credits with one unordered bulk_write, reporting an outcome per item
+    Each update keeps the issuable statuses in its filter, so a credit whose status
+    changed since it was read is left alone. Updates that applied are stamped with a
+    batch id, which is how they are told apart afterwards.
+    """
+    issuable = [CreditStatus.DRAFT, CreditStatus.PENDING]
+    batch_id = str(uuid.uuid4())
+    results: List[Optional[dict]] = [None] * len(items)
+    credits = {
+        credit["id"]: credit
+        async for credit in db.credits.find(
+            {"id": {"$in": [item.credit_id for item in items]}}, {"_id": 0, "id": 1, "status": 1}
+        )
+    }
+    
+    requests, pending = [], {}
+    now = datetime.now(timezone.utc)
+    for index, item in enumerate(items):
+        credit = credits.get(item.credit_id)
+        outcome = {"index": index, "credit_id": item.credit_id}
+        if item.credit_id in pending:
+            results[index] = {**outcome, "status": "duplicate", "error": "Credit appears earlier in this batch"}
+        elif not credit:
+            results[index] = {**outcome, "status": "not_found", "error": "Credit not found"}
+        elif credit["status"] not in issuable:
+            results[index] = {**outcome, "status": "rejected",
+                              "error": f"Credit cannot be issued from status {credit['status']}"}
+        else:
+            pending[item.credit_id] = index
+            requests.append(UpdateOne(
+                {"id": item.credit_id, "status": {"$in": issuable}},
+                {"$set": {
+                    "status": CreditStatus.ISSUED,
+                    "issued_to": item.issued_to,
+                    "issue_batch": batch_id,
+                    "updated_at": now
+                }}
+            ))
+    
+    if requests:
+        try:
+            await db.credits.bulk_write(requests, ordered=False)
+        except BulkWriteError as e:
+            credit_ids = list(pending)
+            for error in e.details.get("writeErrors", []):
+                index = pending.pop(credit_ids[error["index"]])
+                results[index] = {"index": index, "credit_id": items[index].credit_id,
+                                  "status": "failed", "error": error.get("errmsg")}
         
-        # Create image metadata
-        image_data = {
-            "id": f"img_{datetime.now(timezone.utc).timestamp()}_{filename}",
-            "filename": filename,
-            "data_url": data_url,
-            "size": len(file_content),
-            "uploaded_at": datetime.now(timezone.utc)
-        }
+        deltas: Dict[str, Dict[str, float]] = {}
+        async for credit in db.credits.find(
+            {"id": {"$in": list(pending)}, "issue_batch": batch_id},
+            {"_id": 0, "id": 1, "amount": 1, "project_id": 1}
+        ):
+            index = pending.pop(credit["id"])
+            results[index] = {"index": index, "credit_id": credit["id"], "status": "issued"}
+            # Only draft or pending credits matched, and neither counts towards metrics
+            add_delta(deltas.setdefault(credit["project_id"], {}),
+                      credit_transition_delta(CreditStatus.PENDING, CreditStatus.ISSUED, credit["amount"]))
+        await apply_metrics_deltas(db.projects, deltas)
         
-        logger.info(f"Converted {filename} to base64 (size: {len(file_content)} bytes)")
-        return image_data
-    except Exception as e:
-        logger.error(f"Error converting image to base64: {e}")
-        return None
+        for credit_id, index in pending.items():
+            results[index] = {"index": index, "credit_id": credit_id,
+                              "status": "conflict", "error": "Credit status changed, please retry"}
+    
+    issued = sum(1 for result in results if result["status"] == "issued")
+    return {"received": len(items), "issued": issued, "failed": len(items) - issued, "results": results}
 
-async def mock_analyze_image_credibility(image_content: bytes) -> dict:
-    """Mock CNN analysis - replace with actual CNN model integration"""
+async def run_analysis_job(job: dict) -> dict:
+    """Analysis job handler: score stored images and update the field data entry"""
+    field_data_dict = await db.field_data.find_one({"id": job["field_data_id"]}, {"_id": 0})
+    if not field_data_dict:
+        return {"skipped": "Field data no longer exists"}
+    field_data_obj = FieldData(**field_data_dict)
+    
+    image_ids = set(job["image_ids"])
+    images = [dict(img) for img in field_data_obj.image_metadata or [] if img.get("id") in image_ids]
+    store = get_image_store(db)
+    contents = await asyncio.gather(*[store.read(img["blob_id"]) for img in images])
+    previous_thumbnails = {img.get("thumbnail_blob_id") for img in images}
+    
+    analysis_results = await analyze_field_images(field_data_obj, images, list(contents))
+    credibility_score = await record_field_analysis(field_data_obj.id, images, analysis_results)
+    # A re-run stored fresh thumbnails; drop the ones an earlier attempt recorded
+    await store.delete_many(previous_thumbnails - {img.get("thumbnail_blob_id") for img in images})
     return {
-        "credibility_score": 0.85,
-        "confidence": 0.92,
-        "analysis": {
-            "image_quality": "good",
-            "vegetation_detected": True,
-            "anomalies_detected": False,
-            "environmental_consistency": True
-        },
-        "recommendations": [
-            "Image quality is good for analysis",
-            "Vegetation patterns consistent with reported ecosystem type"
-        ]
+        "credibility_score": credibility_score,
+        "analyzed": len(analysis_results),
+        "scores": {r["image_id"]: r["credibility_score"] for r in analysis_results}
     }
 
+async def record_analysis_failure(job: dict):
+    """
+    Failure handler for analysis jobs that gave up: mark their images failed so
+    the entry stops showing as pending and the archiver can pick it up
+    """
+    await db.field_data.update_one(
+        {"id": job["field_data_id"]},
+        [
+            {"$set": {
+                "analysis_failed_image_ids": {"$setUnion": [
+                    {"$ifNull": ["$analysis_failed_image_ids", []]}, {"$literal": job.get("image_ids", [])}
+                ]},
+                "analysis_error": job["error"]
+            }},
+            {"$set": {"analysis_status": ANALYSIS_STATUS}}
+        ]
+    )
+
+async def check_near_duplicates(field_data_obj: "FieldData", images: List[dict], analysis_results: List[dict]):
+    """Flag recycled photos by perceptual hash and record the new hashes"""
+    if not PHASH_INDEX_AVAILABLE:
+        return
+    
+    index = get_phash_index()
+    await index.sync(db.image_hashes)
+    
+    for image_data, result in zip(images, analysis_results):
+        phash = image_data.get("phash")
+        if not phash:
+            continue
+        
+        matches = []
+        # A retried job re-checks an image whose hash it already recorded
+        hits = [(distance, image_id) for distance, image_id in index.query(phash) if image_id != image_data["id"]]
+        if hits:
+            docs = await db.image_hashes.find(
+                {"image_id": {"$in": [image_id for _, image_id in hits]}},
+                {"_id": 0}
+            ).to_list(len(hits))
+            by_id = {doc["image_id"]: doc for doc in docs}
+            for distance, image_id in hits:
+                doc = by_id.get(image_id)
+                if not doc or doc.get("field_data_id") == field_data_obj.id:
+                    continue
+                matches.append({
+                    "image_id": image_id,
+                    "field_data_id": doc.get("field_data_id"),
+                    "project_id": doc.get("project_id"),
+                    "plot_id": doc.get("plot_id"),
+                    "distance": distance,
+                    "same_project": doc.get("project_id") == field_data_obj.project_id,
+                    "same_plot": doc.get("plot_id") == field_data_obj.plot_id
+                })
+        
+        result["duplicate_check"] = duplicate_check(matches)
+        if matches:
+            result["credibility_score"] = min(result["credibility_score"], PHASH_DUPLICATE_SCORE_CAP)
+            result.setdefault("analysis", {})["anomalies_detected"] = True
+            result.setdefault("recommendations", []).append(
+                "Near-duplicate of a previously submitted photo - manual review required"
+            )
+        
+        await index.record(db.image_hashes, phash, image_data["id"], {
+            "field_data_id": field_data_obj.id,
+            "project_id": field_data_obj.project_id,
+            "plot_id": field_data_obj.plot_id,
+            "collector_id": field_data_obj.collector_id
+        })
+
+async def remove_image_hashes(field_data_id: str):
+    """Drop a field data entry's photos from duplicate detection"""
+    if not PHASH_INDEX_AVAILABLE:
+        return
+    
+    hashes = await db.image_hashes.find({"field_data_id": field_data_id}, {"image_id": 1}).to_list(None)
+    for doc in hashes:
+        get_phash_index().remove(doc["image_id"])
+    await db.image_hashes.delete_many({"field_data_id": field_data_id})
+
 # Authentication endpoints
 @api_router.post("/auth/register", response_model=Token)
 async def register(user_data: UserCreate):
@@ -348,7 +1108,7 @@ async def register(user_data: UserCreate):
         )
     
     # Hash password and create user
-    hashed_password = get_password_hash(user_data.password)
+    hashed_password = await get_password_hash(user_data.password)
     user = User(
         email=user_data.email,
         username=user_data.username,
@@ -373,13 +1133,20 @@ async def register(user_data: UserCreate):
 @api_router.post("/auth/login", response_model=Token)
 async def login(user_credentials: UserLogin):
     user_dict = await db.users.find_one({"username": user_credentials.username})
-    if not user_dict or not verify_password(user_credentials.password, user_dict["password"]):
+    valid, new_hash = (await verify_password(user_credentials.password, user_dict["password"])
+                       if user_dict else (False, None))
+    if not valid:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect username or password",
             headers={"WWW-Authenticate": "Bearer"},
         )
     
+    if new_hash:
+        # Stored hash uses another BCRYPT_ROUNDS cost; skipped if the password changed meanwhile
+        await db.users.update_one({"id": user_dict["id"], "password": user_dict["password"]},
+                                  {"$set": {"password": new_hash}})
+    
     user = User(**{k: v for k, v in user_dict.items() if k != "password"})
     access_token_expires = timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
     access_token = create_access_token(
@@ -393,25 +1160,99 @@ async def get_current_user_info(current_user: User = Depends(get_current_active_
     return current_user
 
 # Project Management endpoints
+def project_location(location: Dict[str, Any]) -> Dict[str, Any]:
+    try:
+        return normalize_location(location)
+    except GeometryError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
 @api_router.post("/projects", response_model=Project)
 async def create_project(
     project_data: ProjectCreate,
     current_user: User = Depends(get_current_active_user)
 ):
     project = Project(
-        **project_data.dict(),
+        **{**project_data.dict(), "location": project_location(project_data.location)},
         owner_id=current_user.id
     )
     
-    await db.projects.insert_one(project.dict())
+    try:
+        await db.projects.insert_one(project.dict())
+    except WriteError as e:
+        if e.code != CANNOT_INDEX_GEOMETRY:
+            raise
+        raise HTTPException(status_code=400, detail="Project polygon cannot be indexed (does it cross itself?)")
     return project
 
-@api_router.get("/projects", response_model=List[Project])
+async def find_features(query: dict, limit: Optional[int], current_user: User) -> ORJSONResponse:
+    """GeoJSON FeatureCollection of the visible projects matching a spatial filter"""
+    if current_user.role == UserRole.USER:
+        query = {**query, "owner_id": current_user.id}
+    limit = clamp_limit(limit)
+    try:
+        projects = await reader("geo").projects.find(query, GEO_PROJECTION).limit(limit + 1).to_list(limit + 1)
+    except OperationFailure as e:
+        if e.code != BAD_VALUE:
+            raise
+        raise HTTPException(status_code=400, detail=f"Invalid query geometry: {(e.details or {}).get('errmsg', e)}")
+    return ORJSONResponse({
+        "type": "FeatureCollection",
+        "features": [feature(project) for project in projects[:limit]],
+        "truncated": len(projects) > limit,
+    })
+
+@api_router.get("/projects/geo")
+async def get_projects_geo(
+    bbox: Optional[str] = None,
+    within: bool = False,
+    near: Optional[str] = None,
+    max_distance: Optional[float] = Query(None, gt=0),
+    limit: Optional[int] = None,
+    current_user: User = Depends(get_current_active_user)
+):
+    """
+    Projects whose polygon lies in a bounding box or near a point, as GeoJSON
+    `bbox=min_lng,min_lat,max_lng,max_lat` matches polygons that intersect the
+    box (entirely inside it with `within=true`); `near=lng,lat` returns the
+    closest first, up to `max_distance` meters.
+    """
+    if (bbox is None) == (near is None):
+        raise HTTPException(status_code=400, detail="Pass exactly one of bbox or near")
+    try:
+        if bbox is not None:
+            box = bbox_geometry(bbox)
+            query = within_filter(box) if within else intersects_filter(box)
+        else:
+            query = near_filter(point_geometry(near), max_distance)
+    except GeometryError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return await find_features(query, limit, current_user)
+
+@api_router.post("/projects/geo/intersects")
+async def get_projects_intersecting(
+    geo_query: GeoQuery,
+    current_user: User = Depends(get_current_active_user)
+):
+    """Projects whose polygon intersects a GeoJSON Polygon or MultiPolygon"""
+    try:
+        geometry = query_geometry(geo_query.geometry)
+    except GeometryError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return await find_features(intersects_filter(geometry), geo_query.limit, current_user)
+
+@api_router.get("/projects", response_model=Union[ProjectPage, ProjectSummaryPage])
 async def get_projects(
     status: Optional[ProjectStatus] = None,
     ecosystem_type: Optional[str] = None,
+    cursor: Optional[str] = None,
+    limit: int = PAGE_DEFAULT_LIMIT,
+    view: ListView = ListView.FULL,
     current_user: User = Depends(get_current_active_user)
 ):
+    """
+    List projects newest first, one page at a time
+    `view=summary` returns ProjectSummary items (see ProjectSummaryPage)
+    """
     query = {}
     
     # Users can only see their own projects unless they're admin/validator
@@ -423,14 +1264,67 @@ async def get_projects(
     if ecosystem_type:
         query["ecosystem_type"] = ecosystem_type
     
-    projects = await db.projects.find(query).to_list(1000)
+    if view == ListView.SUMMARY:
+        projects, next_cursor = await fetch_page(reader("lists").projects, query, cursor, limit, PROJECT_SUMMARY_PROJECTION)
+        return trusted_page(ProjectSummaryPage, ProjectSummary, projects, next_cursor)
+    
+    projects, next_cursor = await fetch_page(reader("lists").projects, query, cursor, limit)
     
     # Convert MongoDB _id to string id for frontend
     for project in projects:
         if '_id' in project and 'id' not in project:
             project['id'] = str(project['_id'])
     
-    return [Project(**project) for project in projects]
+    return trusted_page(ProjectPage, Project, projects, next_cursor)
+
+@api_router.get("/projects/search", response_model=ProjectSearchPage)
+async def search_projects(
+    q: str,
+    status: Optional[ProjectStatus] = None,
+    ecosystem_type: Optional[str] = None,
+    cursor: Optional[str] = None,
+    limit: int = PAGE_DEFAULT_LIMIT,
+    current_user: User = Depends(get_current_active_user)
+):
+    """
+    Search titles, descriptions, methodologies and ecosystem types, best match first
+    `q` uses MongoDB text search syntax: words match any stemmed form, "quoted
+    phrases" must appear as written and -word excludes.
+    """
+    q = q.strip()
+    if not q:
+        raise HTTPException(status_code=400, detail="Search text is required")
+    if len(q) > 200:
+        raise HTTPException(status_code=400, detail="Search text is too long")
+    
+    query = {}
+    if current_user.role == UserRole.USER:
+        query["owner_id"] = current_user.id
+    if status:
+        query["status"] = status
+    if ecosystem_type:
+        query["ecosystem_type"] = ecosystem_type
+    
+    try:
+        projects, next_cursor = await paginate_by_relevance(
+            reader("search").projects, q, query, cursor, limit, PROJECT_SUMMARY_PROJECTION
+        )
+    except CursorError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return trusted_page(ProjectSearchPage, ProjectSearchResult, projects, next_cursor)
+
+@api_router.get("/projects/stats/summary")
+async def get_project_stats(
+    current_user: User = Depends(get_current_active_user)
+):
+    """Get project totals; list pages only carry one page of projects"""
+    query = {}
+    
+    # Filter by user permissions
+    if current_user.role == UserRole.USER:
+        query["owner_id"] = current_user.id
+    
+    return {"total_projects": await reader("stats").projects.count_documents(query)}
 
 @api_router.get("/projects/{project_id}", response_model=Project)
 async def get_project(
@@ -441,12 +1335,99 @@ async def get_project(
     if not project_dict:
         raise HTTPException(status_code=404, detail="Project not found")
     
-    project = Project(**project_dict)
     # Check permissions
-    if current_user.role == UserRole.USER and project.owner_id != current_user.id:
+    if current_user.role == UserRole.USER and project_dict["owner_id"] != current_user.id:
         raise HTTPException(status_code=403, detail="Not authorized to view this project")
     
-    return project
+    return trusted_response(Project, project_dict)
+
+@api_router.get("/projects/{project_id}/metrics", response_model=ProjectMetrics)
+async def get_project_metrics(
+    project_id: str,
+    current_user: User = Depends(get_current_active_user)
+):
+    """Project totals maintained incrementally on credit and MRV report writes"""
+    project_dict = await db.projects.find_one({"id": project_id}, {"_id": 0, "owner_id": 1, "metrics": 1})
+    if not project_dict:
+        raise HTTPException(status_code=404, detail="Project not found")
+    
+    if current_user.role == UserRole.USER and project_dict["owner_id"] != current_user.id:
+        raise HTTPException(status_code=403, detail="Not authorized to view this project")
+    
+    return trusted_response(ProjectMetrics, project_dict.get("metrics") or {})
+
+async def get_measured_project(project_id: str, current_user: User) -> dict:
+    project_dict = await db.projects.find_one({"id": project_id}, {"_id": 0, "owner_id": 1})
+    if not project_dict:
+        raise HTTPException(status_code=404, detail="Project not found")
+    
+    if current_user.role == UserRole.USER and project_dict["owner_id"] != current_user.id:
+        raise HTTPException(status_code=403, detail="Not authorized for this project")
+    return project_dict
+
+def check_metric(metric: str):
+    if metric not in METRICS:
+        raise HTTPException(status_code=400, detail=f"metric must be one of: {', '.join(METRICS)}")
+
+@api_router.post("/projects/{project_id}/measurements")
+async def ingest_measurements(
+    project_id: str,
+    batch: MeasurementBatch,
+    current_user: User = Depends(get_current_active_user)
+):
+    """Record monitoring readings (e.g. Sentinel-2 NDVI statistics) for a project"""
+    if len(batch.readings) > MEASUREMENT_BATCH_MAX_READINGS:
+        raise HTTPException(status_code=413, detail=f"At most {MEASUREMENT_BATCH_MAX_READINGS} readings per request")
+    unknown = {reading.source for reading in batch.readings} - set(SOURCES)
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown source: {', '.join(sorted(unknown))}")
+    await get_measured_project(project_id, current_user)
+    
+    docs = [
+        measurement(project_id, reading.observed_at, reading.source,
+                    reading.dict(include=set(METRICS), exclude_none=True), reading.plot_id)
+        for reading in batch.readings
+    ]
+    recorded = await record_measurements(db, docs)
+    return {"received": len(batch.readings), "recorded": recorded, "skipped": len(batch.readings) - recorded}
+
+@api_router.get("/projects/{project_id}/measurements")
+async def get_measurements(
+    project_id: str,
+    metric: str,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    plot_id: Optional[str] = None,
+    source: Optional[str] = None,
+    limit: int = MEASUREMENTS_QUERY_LIMIT,
+    current_user: User = Depends(get_current_active_user)
+):
+    """One metric's readings for a project in [start, end), oldest first"""
+    check_metric(metric)
+    await get_measured_project(project_id, current_user)
+    items = await measurement_range(reader("measurements"), project_id, metric, start, end, plot_id, source,
+                                    max(1, limit))
+    return {"metric": metric, "items": items}
+
+@api_router.get("/projects/{project_id}/measurements/buckets")
+async def get_measurement_buckets(
+    project_id: str,
+    metric: str,
+    unit: str = "week",
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    plot_id: Optional[str] = None,
+    source: Optional[str] = None,
+    current_user: User = Depends(get_current_active_user)
+):
+    """Count, mean, min and max of one metric per day, week, month, quarter or year"""
+    check_metric(metric)
+    if unit not in BUCKET_UNITS:
+        raise HTTPException(status_code=400, detail=f"unit must be one of: {', '.join(BUCKET_UNITS)}")
+    await get_measured_project(project_id, current_user)
+    buckets = await measurement_buckets(reader("measurements"), project_id, metric, unit, start, end,
+                                        plot_id, source)
+    return {"metric": metric, "unit": unit, "buckets": buckets}
 
 @api_router.put("/projects/{project_id}", response_model=Project)
 async def update_project(
@@ -465,12 +1446,18 @@ async def update_project(
     
     # Update project
     update_data = project_data.dict()
+    update_data["location"] = project_location(project_data.location)
     update_data["updated_at"] = datetime.now(timezone.utc)
     
-    await db.projects.update_one(
-        {"id": project_id},
-        {"$set": update_data}
-    )
+    try:
+        await db.projects.update_one(
+            {"id": project_id},
+            {"$set": update_data}
+        )
+    except WriteError as e:
+        if e.code != CANNOT_INDEX_GEOMETRY:
+            raise
+        raise HTTPException(status_code=400, detail="Project polygon cannot be indexed (does it cross itself?)")
     
     # Return updated project
     updated_project_dict = await db.projects.find_one({"id": project_id})
@@ -491,6 +1478,7 @@ async def delete_project(
         raise HTTPException(status_code=403, detail="Not authorized to delete this project")
     
     await db.projects.delete_one({"id": project_id})
+    await get_image_store(db).delete_many(blob_id_from_url(url) for url in project.images)
     return {"message": "Project deleted successfully"}
 
 @api_router.post("/projects/{project_id}/upload-images")
@@ -499,7 +1487,7 @@ async def upload_project_images(
     files: List[UploadFile] = File(...),
     current_user: User = Depends(get_current_active_user)
 ):
-    """Upload images directly to a project"""
+    """Upload images directly to a project; they are stored in GridFS and served by URL"""
     
     # Get project
     project_dict = await db.projects.find_one({"id": project_id})
@@ -521,10 +1509,11 @@ async def upload_project_images(
         # Read file content
         content = await file.read()
         
-        # Store image as base64
-        image_data = await store_image_as_base64(content, file.filename)
-        if image_data:
-            uploaded_images.append(image_data)
+        stored = await get_image_store(db).put_bytes(
+            content, file.filename, file.content_type,
+            metadata={"project_id": project_id, "uploaded_by": current_user.id}
+        )
+        uploaded_images.append(stored_image_entry(stored, file.filename))
     
     # Get existing images
     existing_images = project.images if isinstance(project.images, list) else []
@@ -532,7 +1521,7 @@ async def upload_project_images(
     
     # Update project with images
     update_data = {
-        "images": existing_images + [img["data_url"] for img in uploaded_images],
+        "images": existing_images + [img["url"] for img in uploaded_images],
         "image_metadata": existing_metadata + uploaded_images,
         "updated_at": datetime.now(timezone.utc)
     }
@@ -568,88 +1557,427 @@ async def create_field_data(
         collector_id=current_user.id
     )
     
-    await db.field_data.insert_one(field_data_obj.dict())
+    field_data_dict = field_data_obj.dict()
+    await db.field_data.insert_one(field_data_dict)
+    await record_readings([field_data_measurement(field_data_dict)])
     return field_data_obj
 
-@api_router.post("/field-data/{field_data_id}/upload-images")
+@api_router.post("/field-data/bulk")
+async def create_field_data_bulk(
+    batch: FieldDataBulkCreate,
+    current_user: User = Depends(get_current_active_user)
+):
+    """Create many field data entries in one request, with an outcome per row"""
+    if len(batch.rows) > FIELD_DATA_BULK_MAX_ROWS:
+        raise HTTPException(status_code=413, detail=f"At most {FIELD_DATA_BULK_MAX_ROWS} rows per request")
+    return await insert_field_data_rows(batch.rows, current_user)
+
+@api_router.post("/field-data/{field_data_id}/upload-images", status_code=202)
 async def upload_field_images(
     field_data_id: str,
+    response: Response,
     files: List[UploadFile] = File(...),
     current_user: User = Depends(get_current_active_user)
 ):
-    """Upload images for field data and analyze with CNN"""
+    """
+    Upload images for field data and queue their CNN analysis
+    Returns 202 once the images are stored; poll or subscribe to the job for results
+    """
     
     # Get field data entry
-    field_data_dict = await db.field_data.find_one({"id": field_data_id})
+    field_data_dict = await db.field_data.find_one({"id": field_data_id}, {"collector_id": 1})
     if not field_data_dict:
         raise HTTPException(status_code=404, detail="Field data not found")
     
-    field_data_obj = FieldData(**field_data_dict)
-    
     # Check permissions
     if (current_user.role == UserRole.USER and 
-        field_data_obj.collector_id != current_user.id):
+        field_data_dict["collector_id"] != current_user.id):
         raise HTTPException(status_code=403, detail="Not authorized")
     
-    uploaded_images = []
-    analysis_results = []
-    
     for file in files:
         if not file.content_type.startswith('image/'):
             raise HTTPException(status_code=400, detail=f"File {file.filename} is not an image")
-        
-        # Read file content
+    
+    uploaded_images = []
+    for file in files:
         content = await file.read()
-        
-        # Store image as base64
-        image_data = await store_image_as_base64(content, file.filename)
-        if image_data:
-            uploaded_images.append(image_data)
-            
-            # Analyze image credibility (mock)
-            analysis = await mock_analyze_image_credibility(content)
-            analysis_results.append({
-                "image_id": image_data["id"],
-                "filename": file.filename,
-                **analysis
-            })
-    
-    # Calculate overall credibility score
-    if analysis_results:
-        avg_credibility = sum(r["credibility_score"] for r in analysis_results) / len(analysis_results)
-    else:
-        avg_credibility = 0.0
+        uploaded_images.append(await store_field_image(
+            content, file.filename, file.content_type, field_data_id, current_user.id
+        ))
     
-    # Get existing images
-    existing_images = field_data_obj.images if isinstance(field_data_obj.images, list) else []
+    accepted = await queue_field_image_analysis(field_data_id, uploaded_images, current_user.id)
+    response.headers["Location"] = accepted["status_url"]
+    return accepted
+
+# Resumable upload endpoints for field collectors on poor connections
+def upload_http_error(error: UploadError) -> HTTPException:
+    headers = {"Upload-Offset": str(error.offset)} if error.offset is not None else None
+    return HTTPException(status_code=error.status_code, detail=error.detail, headers=headers)
+
+async def get_upload_session(upload_id: str, current_user: User) -> dict:
+    try:
+        session = await get_session(db, upload_id)
+    except UploadError as e:
+        raise upload_http_error(e)
     
-    # Update field data with images and analysis
-    update_data = {
-        "images": existing_images + [img["data_url"] for img in uploaded_images],
-        "image_metadata": uploaded_images,
-        "credibility_score": avg_credibility,
-        "analysis_results": analysis_results
-    }
+    if current_user.role != UserRole.ADMIN and session["user_id"] != current_user.id:
+        raise HTTPException(status_code=403, detail="Not authorized")
+    return session
+
+@api_router.post("/field-data/{field_data_id}/uploads", status_code=201)
+async def create_upload_session(
+    field_data_id: str,
+    upload: UploadSessionCreate,
+    current_user: User = Depends(get_current_active_user)
+):
+    """Start a resumable image upload for field data"""
+    field_data_dict = await db.field_data.find_one({"id": field_data_id}, {"collector_id": 1})
+    if not field_data_dict:
+        raise HTTPException(status_code=404, detail="Field data not found")
     
-    await db.field_data.update_one(
-        {"id": field_data_id},
-        {"$set": update_data}
+    # Check permissions
+    if (current_user.role == UserRole.USER and 
+        field_data_dict["collector_id"] != current_user.id):
+        raise HTTPException(status_code=403, detail="Not authorized")
+    
+    try:
+        session = await create_session(
+            db, field_data_id, current_user.id,
+            upload.filename, upload.content_type, upload.size, upload.sha256
+        )
+    except UploadError as e:
+        raise upload_http_error(e)
+    
+    return session_status(session)
+
+@api_router.head("/uploads/{upload_id}")
+async def head_upload_offset(
+    upload_id: str,
+    current_user: User = Depends(get_current_active_user)
+):
+    """Report the current upload offset in the Upload-Offset header"""
+    session = await get_upload_session(upload_id, current_user)
+    return Response(headers={
+        "Upload-Offset": str(session["offset"]),
+        "Upload-Length": str(session["size"]),
+        "Cache-Control": "no-store"
+    })
+
+@api_router.get("/uploads/{upload_id}")
+async def get_upload_status(
+    upload_id: str,
+    current_user: User = Depends(get_current_active_user)
+):
+    """Get the current offset and status of a resumable upload"""
+    session = await get_upload_session(upload_id, current_user)
+    return session_status(session)
+
+@api_router.put("/uploads/{upload_id}")
+async def upload_chunk(
+    upload_id: str,
+    request: Request,
+    offset: Optional[int] = None,
+    current_user: User = Depends(get_current_active_user)
+):
+    """
+    Append a chunk at the given offset (query param or Upload-Offset header)
+    The raw request body is the chunk; it is staged in MongoDB part by part
+    """
+    session = await get_upload_session(upload_id, current_user)
+    
+    if offset is None:
+        header = request.headers.get("upload-offset")
+        if header is None or not header.isdigit():
+            raise HTTPException(status_code=400, detail="Chunk offset is required")
+        offset = int(header)
+    
+    try:
+        new_offset = await append_chunk(db, session, offset, request.stream())
+    except UploadError as e:
+        raise upload_http_error(e)
+    
+    return JSONResponse(
+        {"upload_id": upload_id, "offset": new_offset, "size": session["size"]},
+        headers={"Upload-Offset": str(new_offset)}
     )
+
+@api_router.post("/uploads/{upload_id}/finalize", status_code=202)
+async def finalize_upload(
+    upload_id: str,
+    response: Response,
+    current_user: User = Depends(get_current_active_user)
+):
+    """Store a completed upload and queue its analysis like a regular image upload"""
+    session = await get_upload_session(upload_id, current_user)
+    
+    field_data_dict = await db.field_data.find_one({"id": session["field_data_id"]}, {"id": 1})
+    if not field_data_dict:
+        raise HTTPException(status_code=404, detail="Field data not found")
+    
+    try:
+        await begin_finalize(db, session)
+    except UploadError as e:
+        raise upload_http_error(e)
+    
+    try:
+        # Stream the staged parts into GridFS one at a time
+        stored = await get_image_store(db).put_stream(
+            iter_upload(db, upload_id), session["filename"], session["content_type"],
+            metadata={"field_data_id": session["field_data_id"], "uploaded_by": current_user.id}
+        )
+    except Exception:
+        await reopen_session(db, session)
+        raise
+    
+    await complete_session(db, session, stored["blob_id"])
+    image_data = stored_image_entry(stored, session["filename"])
+    
+    accepted = await queue_field_image_analysis(session["field_data_id"], [image_data], current_user.id)
+    response.headers["Location"] = accepted["status_url"]
+    return accepted
+
+@api_router.delete("/uploads/{upload_id}")
+async def cancel_upload(
+    upload_id: str,
+    current_user: User = Depends(get_current_active_user)
+):
+    """Abort a resumable upload and discard the received bytes"""
+    session = await get_upload_session(upload_id, current_user)
+    await abort_session(db, session)
+    return {"message": "Upload cancelled"}
+
+async def viewable_image_ids(user: User, metadata: Dict[str, Dict[str, Any]]) -> set:
+    """
+    Blob ids (keys of `metadata`) the user may see
+    Users see images of their own projects and of field data they collected or
+    that belongs to their projects; validators and admins see every image
+    """
+    if user.role != UserRole.USER:
+        return set(metadata)
+    
+    field_data_ids = list({meta["field_data_id"] for meta in metadata.values() if meta.get("field_data_id")})
+    field_data = {
+        entry["id"]: entry
+        async for entry in db.field_data.find(
+            {"id": {"$in": field_data_ids}}, {"_id": 0, "id": 1, "project_id": 1, "collector_id": 1}
+        )
+    }
+    project_ids = {meta["project_id"] for meta in metadata.values() if meta.get("project_id")}
+    project_ids |= {entry["project_id"] for entry in field_data.values() if entry.get("project_id")}
+    owned = {
+        project["id"]
+        async for project in db.projects.find(
+            {"id": {"$in": list(project_ids)}, "owner_id": user.id}, {"_id": 0, "id": 1}
+        )
+    }
+    
+    def viewable(meta: Dict[str, Any]) -> bool:
+        if meta.get("project_id"):
+            return meta["project_id"] in owned
+        entry = field_data.get(meta.get("field_data_id"))
+        return bool(entry) and (entry.get("collector_id") == user.id or entry.get("project_id") in owned)
+    
+    return {blob_id for blob_id, meta in metadata.items() if viewable(meta)}
+
+@api_router.post("/images/signed-urls")
+async def sign_image_urls(
+    request: ImageSignRequest,
+    current_user: User = Depends(get_current_active_user)
+):
+    """
+    Short-lived signed URLs for <img> tags, keyed by the stored image URL
+    URLs that are not stored images, or that the user may not see, are left out
+    """
+    blob_ids = {url: blob_id_from_url(url) for url in request.urls if blob_id_from_url(url)}
+    metadata = await get_image_store(db).metadata_many(blob_ids.values())
+    viewable = await viewable_image_ids(current_user, metadata)
+    
+    now = time.time()
+    urls, expires = {}, None
+    for url, blob_id in blob_ids.items():
+        if blob_id in viewable:
+            urls[url], expires = signed_image_url(blob_id, SECRET_KEY, now)
     
     return {
-        "message": f"Uploaded {len(uploaded_images)} images successfully",
-        "images": uploaded_images,
-        "credibility_score": avg_credibility,
-        "analysis_results": analysis_results
+        "urls": urls,
+        "expires_at": datetime.fromtimestamp(expires, timezone.utc).isoformat() if expires else None
     }
 
-@api_router.get("/field-data", response_model=List[FieldData])
+@api_router.api_route("/images/{blob_id}", methods=["GET", "HEAD"])
+async def get_image(
+    blob_id: str,
+    request: Request,
+    exp: Optional[int] = None,
+    sig: Optional[str] = None,
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(optional_security)
+):
+    """
+    Serve a stored image straight from GridFS
+    Callers send either a bearer token for a user who may see the image or the
+    `exp`/`sig` of a URL from POST /images/signed-urls (<img> tags cannot set
+    headers). Supports conditional requests (If-None-Match -> 304) and single
+    byte ranges
+    """
+    user = None
+    if sig is not None:
+        if exp is None or not verify_image_signature(blob_id, exp, sig, SECRET_KEY):
+            raise HTTPException(status_code=403, detail="Image link is invalid or has expired")
+    else:
+        user = await user_for_token(credentials.credentials) if credentials else None
+        if user is None or not user.is_active:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Could not validate credentials",
+                headers={"WWW-Authenticate": "Bearer"},
+            )
+    
+    try:
+        grid_out = await get_image_store(db).open(blob_id)
+    except NoFile:
+        raise HTTPException(status_code=404, detail="Image not found")
+    
+    if user is not None and not await viewable_image_ids(user, {blob_id: grid_out.metadata or {}}):
+        raise HTTPException(status_code=403, detail="Not authorized to view this image")
+    
+    headers = image_headers(grid_out)
+    if etag_matches(request.headers.get("if-none-match"), headers["ETag"]):
+        return Response(status_code=304, headers=headers)
+    
+    size = grid_out.length
+    start, end, status_code = 0, size - 1, 200
+    
+    # If-Range: only honour the range when the client's copy is still current
+    if_range = request.headers.get("if-range")
+    if not if_range or if_range == headers["ETag"]:
+        try:
+            byte_range = parse_byte_range(request.headers.get("range"), size)
+        except ValueError:
+            return Response(status_code=416, headers={**headers, "Content-Range": f"bytes */{size}"})
+        if byte_range:
+            start, end = byte_range
+            status_code = 206
+            headers["Content-Range"] = f"bytes {start}-{end}/{size}"
+    
+    headers["Content-Length"] = str(end - start + 1)
+    media_type = (grid_out.metadata or {}).get("content_type", "application/octet-stream")
+    if request.method == "HEAD":
+        return Response(status_code=status_code, headers=headers, media_type=media_type)
+    
+    return StreamingResponse(
+        iter_blob(grid_out, start, end),
+        status_code=status_code,
+        media_type=media_type,
+        headers=headers
+    )
+
+# Analysis job endpoints
+async def get_visible_job(job_id: str, current_user: User) -> dict:
+    job = await get_job_queue(db).get(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    
+    if current_user.role == UserRole.USER and job.get("user_id") != current_user.id:
+        raise HTTPException(status_code=403, detail="Not authorized")
+    return job
+
+@api_router.get("/jobs/{job_id}")
+async def get_job(
+    job_id: str,
+    current_user: User = Depends(get_current_active_user)
+):
+    """Get the status and result of an analysis job"""
+    job = await get_visible_job(job_id, current_user)
+    return job_status(job)
+
+@api_router.get("/jobs/{job_id}/events")
+async def stream_job_events(
+    job_id: str,
+    request: Request,
+    current_user: User = Depends(get_current_active_user)
+):
+    """Server-sent events for an analysis job; the stream ends once the job settles"""
+    job = await get_visible_job(job_id, current_user)
+    
+    async def events():
+        current, last_status = job, None
+        while True:
+            if current["status"] != last_status:
+                last_status = current["status"]
+                payload = json.dumps(job_status(current), default=str)
+                yield f"event: {last_status}\ndata: {payload}\n\n"
+            if last_status in TERMINAL_STATUSES or await request.is_disconnected():
+                break
+            await asyncio.sleep(1)
+            current = await get_job_queue(db).get(job_id) or current
+    
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-store"}
+    )
+
+@api_router.websocket("/ws/updates")
+async def updates_socket(
+    websocket: WebSocket,
+    token: str,
+    collections: Optional[str] = None,
+    project_id: Optional[str] = None
+):
+    """
+    Push project, credit and MRV report changes the user may see
+    Browsers cannot set headers on a WebSocket, so the access token is a query
+    parameter. `collections` is a comma-separated subset of projects,credits,mrv_reports.
+    """
+    user = await user_for_token(token)
+    if user is None or not user.is_active:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+        return
+    
+    wanted = [name for name in (collections or "").split(",") if name] or list(CHANGE_FEED_COLLECTIONS)
+    if any(name not in CHANGE_FEED_COLLECTIONS for name in wanted):
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION, reason="Unknown collection")
+        return
+    
+    privileged = user.role in [UserRole.ADMIN, UserRole.VALIDATOR]
+    if project_id and not privileged:
+        project = await db.projects.find_one({"id": project_id}, {"_id": 0, "owner_id": 1})
+        if not project or project["owner_id"] != user.id:
+            await websocket.close(code=status.WS_1008_POLICY_VIOLATION, reason="Not authorized for this project")
+            return
+    
+    await websocket.accept()
+    feed = get_change_feed(db)
+    subscription = feed.subscribe(Subscription(user.id, privileged, wanted, project_id))
+    await websocket.send_json({"type": "subscribed", "collections": wanted, "project_id": project_id})
+    
+    async def forward():
+        while True:
+            message = await subscription.get()
+            await websocket.send_text(message)
+            if message == UNAVAILABLE:
+                await websocket.close(code=status.WS_1011_INTERNAL_ERROR, reason="Change streams unavailable")
+                return
+    
+    sender = asyncio.create_task(forward())
+    try:
+        # Client messages are ignored; receiving is how a disconnect is noticed
+        while not sender.done():
+            await websocket.receive_text()
+    except (WebSocketDisconnect, RuntimeError):
+        pass
+    finally:
+        sender.cancel()
+        feed.unsubscribe(subscription)
+
+@api_router.get("/field-data", response_model=FieldDataPage)
 async def get_field_data(
     project_id: Optional[str] = None,
     validated: Optional[bool] = None,
+    cursor: Optional[str] = None,
+    limit: int = PAGE_DEFAULT_LIMIT,
     current_user: User = Depends(get_current_active_user)
 ):
-    """Get field data entries"""
+    """Get field data entries, newest first, one page at a time"""
     query = {}
     
     if project_id:
@@ -671,8 +1999,36 @@ async def get_field_data(
     if current_user.role == UserRole.USER:
         query["collector_id"] = current_user.id
     
-    field_data_list = await db.field_data.find(query).to_list(1000)
-    return [FieldData(**data) for data in field_data_list]
+    field_data_list, next_cursor = await fetch_page(reader("lists").field_data, query, cursor, limit)
+    return trusted_page(FieldDataPage, FieldData, field_data_list, next_cursor)
+
+@api_router.get("/field-data/{field_data_id}/analysis")
+async def get_field_data_analysis(
+    field_data_id: str,
+    current_user: User = Depends(get_current_active_user)
+):
+    """Full analysis results and image metadata, read back from the archive if they were moved there"""
+    field_data_dict = await db.field_data.find_one(
+        {"id": field_data_id},
+        {"_id": 0, "id": 1, "collector_id": 1, "credibility_score": 1, "analysis_status": 1,
+         "analysis_results": 1, "image_metadata": 1, "analysis_archive": 1}
+    )
+    if not field_data_dict:
+        raise HTTPException(status_code=404, detail="Field data not found")
+    
+    if (current_user.role == UserRole.USER and 
+        field_data_dict["collector_id"] != current_user.id):
+        raise HTTPException(status_code=403, detail="Not authorized")
+    
+    field_data_dict = await get_analysis_archive(db).rehydrate(field_data_dict)
+    return {
+        "field_data_id": field_data_id,
+        "credibility_score": field_data_dict.get("credibility_score"),
+        "analysis_status": field_data_dict.get("analysis_status"),
+        "analysis_results": field_data_dict.get("analysis_results") or [],
+        "image_metadata": field_data_dict.get("image_metadata") or [],
+        "archive": field_data_dict.get("analysis_archive")
+    }
 
 @api_router.put("/field-data/{field_data_id}/validate")
 async def validate_field_data(
@@ -694,6 +2050,37 @@ async def validate_field_data(
     
     return {"message": "Field data validated successfully"}
 
+@api_router.delete("/field-data/{field_data_id}")
+async def delete_field_data(
+    field_data_id: str,
+    current_user: User = Depends(get_current_active_user)
+):
+    """Delete a field data entry with its image blobs, photo hashes, archive and uploads"""
+    field_data_dict = await db.field_data.find_one({"id": field_data_id})
+    if not field_data_dict:
+        raise HTTPException(status_code=404, detail="Field data not found")
+    
+    field_data_obj = FieldData(**field_data_dict)
+    
+    # Check permissions
+    if (current_user.role == UserRole.USER and 
+        field_data_obj.collector_id != current_user.id):
+        raise HTTPException(status_code=403, detail="Not authorized")
+    
+    await db.field_data.delete_one({"id": field_data_id})
+    
+    # Deleted photos should no longer count as prior submissions
+    await remove_image_hashes(field_data_id)
+    await get_analysis_archive(db).discard(field_data_id)
+    await discard_field_data_uploads(db, field_data_id)
+    await get_image_store(db).delete_many(
+        [image.get(field) for image in field_data_obj.image_metadata or []
+         for field in ("blob_id", "thumbnail_blob_id")] +
+        [blob_id_from_url(url) for url in field_data_obj.images]
+    )
+    
+    return {"message": "Field data deleted successfully"}
+
 # Credit endpoints
 @api_router.post("/credits", response_model=Credit)
 async def create_credit(
@@ -707,19 +2094,47 @@ async def create_credit(
     if not project:
         raise HTTPException(status_code=404, detail="Project not found")
     
-    credit = Credit(**credit_data.dict())
+    credit = Credit(**credit_data.dict(), owner_id=project["owner_id"])
     await db.credits.insert_one(credit.dict())
+    await apply_metrics_delta(db.projects, credit.project_id,
+                              credit_transition_delta(None, credit.status, credit.amount))
     
     return credit
 
-@api_router.get("/credits", response_model=List[Credit])
+@api_router.post("/credits/batch")
+async def create_credits_batch(
+    batch: CreditBatchCreate,
+    current_user: User = Depends(require_role([UserRole.ADMIN, UserRole.VALIDATOR]))
+):
+    """Create many credits in one request, with an outcome per item (admin/validator only)"""
+    if len(batch.credits) > CREDIT_BATCH_MAX_ITEMS:
+        raise HTTPException(status_code=413, detail=f"At most {CREDIT_BATCH_MAX_ITEMS} credits per request")
+    return await insert_credits(batch.credits)
+
+@api_router.post("/credits/batch-issue")
+async def issue_credits_batch(
+    batch: CreditBatchIssue,
+    current_user: User = Depends(require_role([UserRole.ADMIN, UserRole.VALIDATOR]))
+):
+    """Issue many credits in one request, with an outcome per item (admin/validator only)"""
+    if len(batch.items) > CREDIT_BATCH_MAX_ITEMS:
+        raise HTTPException(status_code=413, detail=f"At most {CREDIT_BATCH_MAX_ITEMS} credits per request")
+    return await issue_credits(batch.items)
+
+@api_router.get("/credits", response_model=Union[CreditPage, CreditSummaryPage])
 async def get_credits(
     project_id: Optional[str] = None,
     status: Optional[CreditStatus] = None,
     vintage: Optional[str] = None,
+    cursor: Optional[str] = None,
+    limit: int = PAGE_DEFAULT_LIMIT,
+    view: ListView = ListView.FULL,
     current_user: User = Depends(get_current_active_user)
 ):
-    """Get carbon credits"""
+    """
+    Get carbon credits, newest first, one page at a time
+    `view=summary` returns CreditSummary items (see CreditSummaryPage)
+    """
     query = {}
     
     if project_id:
@@ -741,13 +2156,15 @@ async def get_credits(
     
     # Filter by user permissions
     if current_user.role == UserRole.USER:
-        # Get user's projects
-        user_projects = await db.projects.find({"owner_id": current_user.id}).to_list(1000)
-        project_ids = [p["id"] for p in user_projects]
-        query["project_id"] = {"$in": project_ids}
+        # Ownership is denormalized onto each credit
+        query["owner_id"] = current_user.id
     
-    credits = await db.credits.find(query).to_list(1000)
-    return [Credit(**credit) for credit in credits]
+    if view == ListView.SUMMARY:
+        credits, next_cursor = await fetch_page(reader("lists").credits, query, cursor, limit, CREDIT_SUMMARY_PROJECTION)
+        return trusted_page(CreditSummaryPage, CreditSummary, credits, next_cursor)
+    
+    credits, next_cursor = await fetch_page(reader("lists").credits, query, cursor, limit)
+    return trusted_page(CreditPage, Credit, credits, next_cursor)
 
 @api_router.put("/credits/{credit_id}/issue")
 async def issue_credit(
@@ -766,17 +2183,59 @@ async def issue_credit(
         if credit.status not in [CreditStatus.DRAFT, CreditStatus.PENDING]:
             raise HTTPException(status_code=400, detail="Credit cannot be issued in current status")
     
-    await db.credits.update_one(
-        {"id": credit_id},
+    # Status in the filter: of two concurrent issues only one counts towards metrics
+    issuable = [CreditStatus.DRAFT, CreditStatus.PENDING]
+    previous = await db.credits.find_one_and_update(
+        {"id": credit_id, "status": {"$in": issuable}},
         {"$set": {
             "status": CreditStatus.ISSUED,
             "issued_to": issued_to,
             "updated_at": datetime.now(timezone.utc)
-        }}
+        }},
+        projection={"_id": 0, "status": 1}
     )
+    if not previous:
+        raise HTTPException(status_code=409, detail="Credit status changed, please retry")
+    await apply_metrics_delta(db.projects, credit.project_id,
+                              credit_transition_delta(previous["status"], CreditStatus.ISSUED, credit.amount))
     
     return {"message": "Credit issued successfully"}
 
+@api_router.put("/credits/{credit_id}/retire")
+async def retire_credit(
+    credit_id: str,
+    current_user: User = Depends(get_current_active_user)
+):
+    """Retire an issued credit (its holder or admin/validator)"""
+    credit_dict = await db.credits.find_one({"id": credit_id})
+    if not credit_dict:
+        raise HTTPException(status_code=404, detail="Credit not found")
+    
+    credit = Credit(**credit_dict)
+    if credit.status != CreditStatus.ISSUED:
+        raise HTTPException(status_code=400, detail="Credit must be issued before retirement")
+    
+    # Check if user owns the credit or is admin
+    if (current_user.role == UserRole.USER and 
+        credit.issued_to != current_user.id):
+        raise HTTPException(status_code=403, detail="Not authorized to retire this credit")
+    
+    result = await db.credits.update_one(
+        {"id": credit_id, "status": CreditStatus.ISSUED},
+        {"$set": {
+            "status": CreditStatus.RETIRED,
+            "retired_by": current_user.id,
+            "retired_at": datetime.now(timezone.utc),
+            "updated_at": datetime.now(timezone.utc)
+        }}
+    )
+    if result.modified_count == 0:
+        raise HTTPException(status_code=409, detail="Credit status changed, please retry")
+    await apply_metrics_delta(db.projects, credit.project_id,
+                              credit_transition_delta(CreditStatus.ISSUED, CreditStatus.RETIRED, credit.amount))
+    
+    return {"message": "Credit retired successfully"}
+
 @api_router.get("/credits/stats/summary")
 async def get_credit_stats(
     current_user: User = Depends(get_current_active_user)
@@ -786,33 +2245,22 @@ async def get_credit_stats(
     
     # Filter by user permissions
     if current_user.role == UserRole.USER:
-        user_projects = await db.projects.find({"owner_id": current_user.id}).to_list(1000)
-        project_ids = [p["id"] for p in user_projects]
-        query["project_id"] = {"$in": project_ids}
-    
-    # Get all credits for calculation
-    credits = await db.credits.find(query).to_list(1000)
-    
-    stats = {
-        "total_credits": len(credits),
-        "issued_credits": len([c for c in credits if c["status"] == CreditStatus.ISSUED]),
-        "retired_credits": len([c for c in credits if c["status"] == CreditStatus.RETIRED]),
-        "pending_credits": len([c for c in credits if c["status"] == CreditStatus.PENDING]),
-        "total_amount": sum(c["amount"] for c in credits),
-        "issued_amount": sum(c["amount"] for c in credits if c["status"] == CreditStatus.ISSUED),
-        "retired_amount": sum(c["amount"] for c in credits if c["status"] == CreditStatus.RETIRED)
-    }
+        query["owner_id"] = current_user.id
     
-    return stats
+    return await aggregate_credit_stats(query)
 
 # Validation endpoints for dMRV Studio
-@api_router.get("/validation/queue", response_model=List[Project])
+@api_router.get("/validation/queue", response_model=ProjectPage)
 async def get_validation_queue(
+    cursor: Optional[str] = None,
+    limit: int = PAGE_DEFAULT_LIMIT,
     current_user: User = Depends(require_role([UserRole.VALIDATOR, UserRole.ADMIN]))
 ):
-    """Get projects in validation queue (in_review status)"""
-    projects = await db.projects.find({"status": ProjectStatus.IN_REVIEW}).to_list(1000)
-    return [Project(**project) for project in projects]
+    """Get projects in validation queue (in_review status), newest first"""
+    projects, next_cursor = await fetch_page(
+        reader("validation_queue").projects, {"status": ProjectStatus.IN_REVIEW}, cursor, limit
+    )
+    return trusted_page(ProjectPage, Project, projects, next_cursor)
 
 @api_router.put("/validation/projects/{project_id}/approve")
 async def approve_project(
@@ -885,48 +2333,44 @@ async def generate_mrv_report(
     current_user: User = Depends(require_role([UserRole.VALIDATOR, UserRole.ADMIN]))
 ):
     """Generate MRV report with analysis data and hash, then store on blockchain"""
-    project_dict = await db.projects.find_one({"id": project_id})
-    if not project_dict:
-        raise HTTPException(status_code=404, detail="Project not found")
+    now = datetime.now(timezone.utc)
     
     # Generate MRV hash
     data_string = json.dumps({
         "project_id": project_id,
-        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "timestamp": now.isoformat(),
         "validator_id": current_user.id,
         **analysis_data
     }, sort_keys=True)
     
     mrv_hash = hashlib.sha256(data_string.encode()).hexdigest()
     mrv_hash_hex = f"0x{mrv_hash}"
+    reported_metrics = mrv_metrics(analysis_data)
+    blockchain_ready = BLOCKCHAIN_AVAILABLE and blockchain
     
-    # Store report data in database
     report = {
         "id": str(uuid.uuid4()),
         "project_id": project_id,
         "validator_id": current_user.id,
         "analysis_data": analysis_data,
+        "reported_metrics": reported_metrics,  # What this report set on project metrics
         "mrv_hash": mrv_hash_hex,
-        "created_at": datetime.now(timezone.utc),
-        "blockchain_status": "pending"
+        "created_at": now,
+        "blockchain_status": "pending" if blockchain_ready else "blockchain_unavailable"
     }
     
-    await db.mrv_reports.insert_one(report)
-    
-    # Update project with MRV hash
-    await db.projects.update_one(
-        {"id": project_id},
-        {"$set": {
-            "mrv_hash": mrv_hash_hex,
-            "updated_at": datetime.now(timezone.utc)
-        }}
-    )
+    # Store the report and set the project's hash and metrics in one transaction
+    store = get_mrv_report_store(db)
+    project_dict = await store.create(report, reported_metrics, now)
+    if not project_dict:
+        raise HTTPException(status_code=404, detail="Project not found")
     
     logger.info(f"MRV report generated for project {project_id} with hash {mrv_hash}")
+    await record_readings([mrv_measurement(report)])
     
     # Store on blockchain
     blockchain_result = None
-    if BLOCKCHAIN_AVAILABLE and blockchain:
+    if blockchain_ready:
         try:
             logger.info(f"📤 Attempting to store MRV hash on blockchain for project {project_id}")
             
@@ -954,49 +2398,31 @@ async def generate_mrv_report(
             if blockchain_result:
                 logger.info(f"✅ MRV hash stored on blockchain: {blockchain_result.get('transaction_hash')}")
                 
-                # Update report with blockchain info
-                await db.mrv_reports.update_one(
-                    {"id": report["id"]},
-                    {"$set": {
-                        "blockchain_status": "confirmed",
-                        "blockchain_tx_hash": blockchain_result.get("transaction_hash"),
-                        "blockchain_block": blockchain_result.get("block_number"),
-                        "blockchain_explorer_url": blockchain_result.get("explorer_url")
-                    }}
-                )
-                
-                # Also update project
-                await db.projects.update_one(
-                    {"id": project_id},
-                    {"$set": {
-                        "blockchain_tx_hash": blockchain_result.get("transaction_hash"),
-                        "blockchain_verified": True
-                    }}
-                )
-                
-                report["blockchain_tx_hash"] = blockchain_result.get("transaction_hash")
-                report["blockchain_explorer_url"] = blockchain_result.get("explorer_url")
+                # Update report and project with blockchain info together
+                report_changes = {
+                    "blockchain_status": "confirmed",
+                    "blockchain_tx_hash": blockchain_result.get("transaction_hash"),
+                    "blockchain_block": blockchain_result.get("block_number"),
+                    "blockchain_explorer_url": blockchain_result.get("explorer_url")
+                }
+                await store.settle(report["id"], report_changes, project_id, {
+                    "blockchain_tx_hash": blockchain_result.get("transaction_hash"),
+                    "blockchain_verified": True
+                })
             else:
                 logger.warning(f"⚠️ Failed to store MRV hash on blockchain for project {project_id}")
-                await db.mrv_reports.update_one(
-                    {"id": report["id"]},
-                    {"$set": {"blockchain_status": "failed"}}
-                )
+                report_changes = {"blockchain_status": "failed"}
+                await store.settle(report["id"], report_changes)
         except Exception as e:
             logger.error(f"❌ Error storing MRV hash on blockchain: {e}")
-            await db.mrv_reports.update_one(
-                {"id": report["id"]},
-                {"$set": {
-                    "blockchain_status": "failed",
-                    "blockchain_error": str(e)
-                }}
-            )
+            report_changes = {
+                "blockchain_status": "failed",
+                "blockchain_error": str(e)
+            }
+            await store.settle(report["id"], report_changes)
+        report.update(report_changes)
     else:
         logger.warning("⚠️ Blockchain not available - MRV hash stored in database only")
-        await db.mrv_reports.update_one(
-            {"id": report["id"]},
-            {"$set": {"blockchain_status": "blockchain_unavailable"}}
-        )
     
     response = {
         "message": "MRV report generated successfully",
@@ -1050,14 +2476,18 @@ async def issue_credit_blockchain(
     mock_token_id = str(abs(hash(credit_id)) % 10000)
     
     # Update credit with blockchain data
-    await db.credits.update_one(
+    previous = await db.credits.find_one_and_update(
         {"id": credit_id},
         {"$set": {
             "blockchain_tx_hash": mock_tx_hash,
             "blockchain_token_id": mock_token_id,
             "status": CreditStatus.ISSUED
-        }}
+        }},
+        projection={"_id": 0, "status": 1, "amount": 1, "project_id": 1}
     )
+    if previous:
+        await apply_metrics_delta(db.projects, previous["project_id"],
+                                  credit_transition_delta(previous["status"], CreditStatus.ISSUED, previous["amount"]))
     
     return {
         "message": "Credit issued on blockchain (mock)",
@@ -1166,16 +2596,185 @@ async def get_custom_imagery(
 
 # ============================================
 
+# Export endpoints for registry partners
+@api_router.get("/exports/{dataset}")
+async def export_dataset(
+    dataset: str,
+    format: ExportFormat = ExportFormat.NDJSON,
+    project_id: Optional[str] = None,
+    status: Optional[str] = None,
+    current_user: User = Depends(get_current_active_user)
+):
+    """
+    Stream a full dump of projects, field data or credits as NDJSON or CSV
+    Users export only their own records; image data is never included
+    """
+    if dataset not in DATASETS:
+        raise HTTPException(status_code=404, detail=f"Unknown dataset; expected one of {', '.join(DATASETS)}")
+    
+    query = {}
+    if project_id:
+        query["id" if dataset == "projects" else "project_id"] = project_id
+    if status:
+        query["status"] = status
+    
+    # Filter by user permissions
+    if current_user.role == UserRole.USER:
+        owner_field = "collector_id" if dataset == "field_data" else "owner_id"
+        query[owner_field] = current_user.id
+    
+    filename = f"{dataset}-{datetime.now(timezone.utc):%Y%m%d}.{format.value}"
+    return StreamingResponse(
+        stream_export(reader("exports")[dataset], dataset, query, format),
+        media_type=MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
+
 # Health check
 @api_router.get("/health")
 async def health_check():
-    return {"status": "healthy", "timestamp": datetime.now(timezone.utc)}
+    return {
+        "status": "degraded" if pending_migrations else "healthy",
+        "timestamp": datetime.now(timezone.utc),
+        "pending_migrations": pending_migrations
+    }
+
+@api_router.get("/admin/indexes")
+async def get_index_report(
+    current_user: User = Depends(require_role([UserRole.ADMIN]))
+):
+    """Report missing, unused and undeclared indexes per collection"""
+    return await index_report(db)
+
+def enabled_database_metrics():
+    if not DB_METRICS_ENABLED:
+        raise HTTPException(status_code=404, detail="Database metrics are disabled")
+    return get_database_metrics()
+
+@api_router.get("/admin/db-metrics")
+async def get_db_metrics(
+    current_user: User = Depends(require_role([UserRole.ADMIN]))
+):
+    """Connection pool state, checkout waits and per-command latency since startup or the last reset"""
+    return enabled_database_metrics().snapshot(DB_POOL_OPTIONS)
+
+@api_router.post("/admin/db-metrics/reset")
+async def reset_db_metrics(
+    current_user: User = Depends(require_role([UserRole.ADMIN]))
+):
+    """Restart the metrics window, returning the snapshot of the window just closed"""
+    metrics = enabled_database_metrics()
+    snapshot = metrics.snapshot(DB_POOL_OPTIONS)
+    metrics.reset()
+    return snapshot
+
+@api_router.post("/admin/archive/analysis")
+async def archive_analysis_results(
+    older_than_days: Optional[int] = None,
+    max_batches: Optional[int] = None,
+    current_user: User = Depends(require_role([UserRole.ADMIN]))
+):
+    """Move analysis payloads older than older_than_days (default ANALYSIS_ARCHIVE_AFTER_DAYS) to the cold tier now"""
+    if older_than_days is not None and older_than_days < 0:
+        raise HTTPException(status_code=400, detail="older_than_days must not be negative")
+    return await get_analysis_archive(db).run(older_than_days, max_batches)
+
+@api_router.post("/admin/metrics/reconcile")
+async def reconcile_project_metrics(
+    project_id: Optional[str] = None,
+    repair: bool = True,
+    current_user: User = Depends(require_role([UserRole.ADMIN]))
+):
+    """Recompute project metrics from credits and MRV reports and report (and repair) drift"""
+    drift = await reconcile_metrics(db, [project_id] if project_id else None, repair=repair)
+    return {"repaired": repair, "drift": drift, "summary": summarize_drift(drift)}
 
 # Include the router in the main app
 app.include_router(api_router)
 
+@app.on_event("startup")
+async def create_measurements_collection():
+    # Before bootstrap_indexes, which would otherwise create it as a regular collection
+    try:
+        await ensure_measurements_collection(db)
+    except Exception as e:
+        logger.error(f"Error creating measurements collection: {e}")
+
+@app.on_event("startup")
+async def bootstrap_indexes():
+    if not ENSURE_INDEXES:
+        return
+    try:
+        failed = await ensure_indexes(db)
+        if not failed:
+            logger.info("✅ Database indexes are in place")
+        # Usage counters restart with mongod, so unused indexes are left to /api/admin/indexes
+        for line in summarize_report(await index_report(db), ("missing", "undeclared")):
+            logger.warning(f"⚠️ Index report: {line}")
+    except Exception as e:
+        logger.error(f"Error bootstrapping database indexes: {e}")
+
+@app.on_event("startup")
+async def migrate_credit_owners():
+    await run_migration("credit_owners", backfill_credit_owners)
+
+@app.on_event("startup")
+async def migrate_sort_keys():
+    await run_migration("sort_keys", lambda: backfill_sort_keys(db))
+
+@app.on_event("startup")
+async def migrate_project_geometry():
+    try:
+        await backfill_geometry(db)
+    except Exception as e:
+        logger.error(f"Error backfilling project geometry: {e}")
+
+@app.on_event("startup")
+async def start_inference_service():
+    if INFERENCE_AVAILABLE:
+        try:
+            await get_inference_service().start()
+        except Exception as e:
+            logger.error(f"Error starting credibility inference service: {e}")
+
+@app.on_event("startup")
+async def start_upload_cleaner():
+    get_upload_cleaner(db).start()
+
+@app.on_event("startup")
+async def load_phash_index():
+    if PHASH_INDEX_AVAILABLE:
+        try:
+            loaded = await get_phash_index().sync(db.image_hashes)
+            logger.info(f"✅ Loaded {loaded} perceptual hashes for duplicate detection")
+        except Exception as e:
+            logger.error(f"Error loading perceptual hash index: {e}")
+
+@app.on_event("startup")
+async def start_analysis_workers():
+    if ANALYSIS_WORKERS > 0:
+        get_job_queue(db).start(run_analysis_job, on_failed=record_analysis_failure)
+
+@app.on_event("startup")
+async def start_metrics_reconciler():
+    get_metrics_reconciler(db).start()
+
+@app.on_event("startup")
+async def start_analysis_archiver():
+    get_analysis_archive(db).start()
+
 @app.on_event("shutdown")
 async def shutdown_db_client():
+    for task in migration_tasks:
+        task.cancel()
+    await get_job_queue(db).stop()
+    await get_metrics_reconciler(db).stop()
+    await get_upload_cleaner(db).stop()
+    await get_analysis_archive(db).stop()
+    close_password_hasher()
+    await get_change_feed(db).stop()
+    if INFERENCE_AVAILABLE:
+        await get_inference_service().stop()
     client.close()
 
 # Vercel handler
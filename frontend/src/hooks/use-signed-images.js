@@ -0,0 +1,36 @@
+import { useEffect, useState } from 'react';
+import { imagesAPI } from '../services/api';
+
+// Signed URLs for stored images, keyed by stored URL; pass the map to imageSrc.
+// Re-signs shortly before the current URLs expire
+export const useSignedImages = (urls) => {
+  const [signedUrls, setSignedUrls] = useState({});
+  const key = urls.filter(Boolean).join('\n');
+
+  useEffect(() => {
+    let cancelled = false;
+    let timer = null;
+
+    const sign = async () => {
+      try {
+        const { urls: signed, expires_at: expiresAt } = await imagesAPI.sign(key ? key.split('\n') : []);
+        if (cancelled) return;
+        setSignedUrls(signed);
+        if (expiresAt) {
+          const refreshIn = Math.max(Date.parse(expiresAt) - Date.now() - 60000, 60000);
+          timer = setTimeout(sign, refreshIn);
+        }
+      } catch (error) {
+        console.error('Failed to sign image URLs:', error);
+      }
+    };
+
+    sign();
+    return () => {
+      cancelled = true;
+      clearTimeout(timer);
+    };
+  }, [key]);
+
+  return signedUrls;
+};
@@ -8,7 +8,8 @@ import { Button } from '../components/ui/button';
 import { Badge } from '../components/ui/badge';
 import { Upload, BarChart3, FileText, ShoppingCart, Clock, Loader2, FolderKanban, Award, TrendingUp, Activity, ArrowUpRight, Sparkles } from 'lucide-react';
 import { useNavigate } from 'react-router-dom';
-import { projectsAPI, creditsAPI } from '../services/api';
+import { projectsAPI, creditsAPI, imageSrc } from '../services/api';
+import { useSignedImages } from '../hooks/use-signed-images';
 
 export default function Dashboard() {
   const navigate = useNavigate();
@@ -22,6 +23,7 @@ export default function Dashboard() {
   const [recentProjects, setRecentProjects] = useState([]);
   const [loading, setLoading] = useState(true);
   const [runTour, setRunTour] = useState(false);
+  const signedImages = useSignedImages(recentProjects.map((project) => project.images?.[0]));
 
   useEffect(() => {
     const fetchDashboardData = async () => {
@@ -29,14 +31,15 @@ export default function Dashboard() {
         setLoading(true);
         
         // Fetch projects and credits data
-        const [projectsData, creditsStats] = await Promise.all([
-          projectsAPI.getAll(),
+        const [projectsPage, projectStats, creditsStats] = await Promise.all([
+          projectsAPI.getPage({ limit: 3 }),
+          projectsAPI.getStats().catch(() => ({ total_projects: 0 })),
           creditsAPI.getStats().catch(() => ({ total_credits: 0, issued_credits: 0, pending_credits: 0 }))
         ]);
 
-        setRecentProjects(projectsData.slice(0, 3)); // Get 3 most recent projects
+        setRecentProjects(projectsPage.items); // Get 3 most recent projects
         setStats({
-          total_projects: projectsData.length,
+          ...projectStats,
           ...creditsStats
         });
       } catch (error) {
@@ -298,7 +301,7 @@ export default function Dashboard() {
                   {project.images && project.images.length > 0 ? (
                     <div className="flex-shrink-0 w-16 h-16 rounded-lg overflow-hidden bg-gradient-to-br from-emerald-50 to-sky-50">
                       <img 
-                        src={project.images[0]} 
+                        src={imageSrc(project.images[0], signedImages)} 
                         alt={project.title}
                         className="w-full h-full object-cover"
                         onError={(e) => {
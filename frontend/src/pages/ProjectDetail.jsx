@@ -14,7 +14,8 @@ import {
   ExternalLink,
   Trash2
 } from 'lucide-react';
-import { projectsAPI } from '../services/api';
+import { projectsAPI, imageSrc } from '../services/api';
+import { useSignedImages } from '../hooks/use-signed-images';
 import { toast } from '../components/ui/use-toast';
 
 export default function ProjectDetail() {
@@ -23,6 +24,7 @@ export default function ProjectDetail() {
   const [project, setProject] = useState(null);
   const [loading, setLoading] = useState(true);
   const [selectedImageIndex, setSelectedImageIndex] = useState(0);
+  const signedImages = useSignedImages(project?.images || []);
 
   useEffect(() => {
     fetchProject();
@@ -139,7 +141,7 @@ export default function ProjectDetail() {
               {/* Main Image */}
               <div className="aspect-video bg-gradient-to-br from-emerald-50 to-sky-50">
                 <img
-                  src={project.images[selectedImageIndex]}
+                  src={imageSrc(project.images[selectedImageIndex], signedImages)}
                   alt={`${project.title} - Image ${selectedImageIndex + 1}`}
                   className="w-full h-full object-cover"
                   onError={(e) => {
@@ -162,7 +164,7 @@ export default function ProjectDetail() {
                       }`}
                     >
                       <img
-                        src={image}
+                        src={imageSrc(image, signedImages)}
                         alt={`Thumbnail ${index + 1}`}
                         className="w-full h-full object-cover"
                         onError={(e) => {
@@ -5,7 +5,8 @@ import { Button } from '../components/ui/button';
 import MetricTile from '../components/MetricTile';
 import Chip from '../components/Chip';
 import { Plus, Filter, Grid3X3, List, ExternalLink, Loader2 } from 'lucide-react';
-import { projectsAPI } from '../services/api';
+import { projectsAPI, imageSrc } from '../services/api';
+import { useSignedImages } from '../hooks/use-signed-images';
 import { toast } from '../components/ui/use-toast';
 
 export default function Projects() {
@@ -15,6 +16,7 @@ export default function Projects() {
   const [filters, setFilters] = useState([]);
   const [projects, setProjects] = useState([]);
   const [loading, setLoading] = useState(true);
+  const signedImages = useSignedImages(projects.map((project) => project.images?.[0]));
 
   const filterOptions = {
     ecosystem: ['Mangrove', 'Seagrass', 'Salt Marsh'],
@@ -216,7 +218,7 @@ export default function Projects() {
             {project.images && project.images.length > 0 && (
               <div className="aspect-video w-full bg-gradient-to-br from-emerald-50 to-sky-50 overflow-hidden">
                 <img 
-                  src={project.images[0]} 
+                  src={imageSrc(project.images[0], signedImages)} 
                   alt={project.title}
                   className="w-full h-full object-cover"
                   onError={(e) => {
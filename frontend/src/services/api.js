@@ -11,6 +11,37 @@ const api = axios.create({
   },
 });
 
+// Stored images come back as API paths (/api/images/{id}). <img> tags cannot send
+// the bearer token, so they load the short-lived signed URLs from
+// imagesAPI.sign (see useSignedImages). Data URLs pass through
+const isStoredImage = (src) => Boolean(src) && src.startsWith('/api/images/');
+
+export const imageSrc = (src, signedUrls = {}) => {
+  if (!isStoredImage(src)) return src;
+  return signedUrls[src] ? `${API_BASE_URL}${signedUrls[src]}` : undefined;
+};
+
+// List endpoints return one page: { items, next_cursor }. Pass next_cursor back
+// as `cursor` to fetch the following page.
+const getPage = async (path, params) => {
+  const response = await api.get(`${path}?${params.toString()}`);
+  return response.data;
+};
+
+// Screens that show a whole collection walk every page at the maximum page size
+const getAllPages = async (path, params) => {
+  const items = [];
+  let cursor = null;
+  params.set('limit', '200');
+  do {
+    if (cursor) params.set('cursor', cursor);
+    const page = await getPage(path, params);
+    items.push(...page.items);
+    cursor = page.next_cursor;
+  } while (cursor);
+  return items;
+};
+
 // Token management
 let authToken = localStorage.getItem('auth_token');
 
@@ -101,7 +132,19 @@ export const projectsAPI = {
       if (value) params.append(key, value);
     });
     
-    const response = await api.get(`/projects?${params.toString()}`);
+    return getAllPages('/projects', params);
+  },
+
+  getPage: async (filters = {}) => {
+    const params = new URLSearchParams();
+    Object.entries(filters).forEach(([key, value]) => {
+      if (value) params.append(key, value);
+    });
+    return getPage('/projects', params);
+  },
+
+  getStats: async () => {
+    const response = await api.get('/projects/stats/summary');
     return response.data;
   },
 
@@ -110,6 +153,63 @@ export const projectsAPI = {
     return response.data;
   },
 
+  // One page of ranked results; pass page.next_cursor back as cursor
+  search: async (q, { status, ecosystemType, cursor, limit } = {}) => {
+    const params = new URLSearchParams({ q });
+    if (status) params.append('status', status);
+    if (ecosystemType) params.append('ecosystem_type', ecosystemType);
+    if (limit) params.append('limit', limit);
+    if (cursor) params.append('cursor', cursor);
+    const response = await api.get('/projects/search', { params });
+    return response.data;
+  },
+
+  // GeoJSON FeatureCollection of projects intersecting [minLng, minLat, maxLng, maxLat]
+  getInBounds: async (bounds, { within = false, limit } = {}) => {
+    const params = { bbox: bounds.join(','), within };
+    if (limit) params.limit = limit;
+    const response = await api.get('/projects/geo', { params });
+    return response.data;
+  },
+
+  getNear: async (lng, lat, maxDistance) => {
+    const response = await api.get('/projects/geo', {
+      params: { near: `${lng},${lat}`, max_distance: maxDistance },
+    });
+    return response.data;
+  },
+
+  getIntersecting: async (geometry, limit) => {
+    const response = await api.post('/projects/geo/intersects', { geometry, limit });
+    return response.data;
+  },
+
+  getMetrics: async (projectId) => {
+    const response = await api.get(`/projects/${projectId}/metrics`);
+    return response.data;
+  },
+
+  // One metric's readings over time; filters: { start, end, plot_id, source, limit }
+  getMeasurements: async (projectId, metric, filters = {}) => {
+    const response = await api.get(`/projects/${projectId}/measurements`, {
+      params: { metric, ...filters },
+    });
+    return response.data;
+  },
+
+  // Count/mean/min/max per day, week, month, quarter or year
+  getMeasurementBuckets: async (projectId, metric, unit = 'week', filters = {}) => {
+    const response = await api.get(`/projects/${projectId}/measurements/buckets`, {
+      params: { metric, unit, ...filters },
+    });
+    return response.data;
+  },
+
+  recordMeasurements: async (projectId, readings) => {
+    const response = await api.post(`/projects/${projectId}/measurements`, { readings });
+    return response.data;
+  },
+
   update: async (projectId, projectData) => {
     const response = await api.put(`/projects/${projectId}`, projectData);
     return response.data;
@@ -158,14 +258,19 @@ export const fieldDataAPI = {
     return response.data;
   },
 
+  // Rows come back as {index, status, id|error|errors}; resend only the failures
+  createBulk: async (rows) => {
+    const response = await api.post('/field-data/bulk', { rows });
+    return response.data;
+  },
+
   getAll: async (filters = {}) => {
     const params = new URLSearchParams();
     Object.entries(filters).forEach(([key, value]) => {
       if (value !== undefined && value !== null) params.append(key, value);
     });
     
-    const response = await api.get(`/field-data?${params.toString()}`);
-    return response.data;
+    return getAllPages('/field-data', params);
   },
 
   getById: async (fieldDataId) => {
@@ -173,6 +278,17 @@ export const fieldDataAPI = {
     return response.data;
   },
 
+  delete: async (fieldDataId) => {
+    const response = await api.delete(`/field-data/${fieldDataId}`);
+    return response.data;
+  },
+
+  // Full analysis results and image metadata, including archived ones
+  getAnalysis: async (fieldDataId) => {
+    const response = await api.get(`/field-data/${fieldDataId}/analysis`);
+    return response.data;
+  },
+
   uploadImages: async (fieldDataId, files) => {
     const formData = new FormData();
     files.forEach((file, index) => {
@@ -206,8 +322,7 @@ export const creditsAPI = {
       if (value) params.append(key, value);
     });
     
-    const response = await api.get(`/credits?${params.toString()}`);
-    return response.data;
+    return getAllPages('/credits', params);
   },
 
   getById: async (creditId) => {
@@ -220,6 +335,18 @@ export const creditsAPI = {
     return response.data;
   },
 
+  // Items come back as {index, status, id|credit_id, error|errors}
+  createBatch: async (credits) => {
+    const response = await api.post('/credits/batch', { credits });
+    return response.data;
+  },
+
+  // items: [{credit_id, issued_to}]
+  issueBatch: async (items) => {
+    const response = await api.post('/credits/batch-issue', { items });
+    return response.data;
+  },
+
   issueOnBlockchain: async (creditId) => {
     const response = await api.post(`/credits/${creditId}/issue-blockchain`);
     return response.data;
@@ -231,6 +358,21 @@ export const creditsAPI = {
   }
 };
 
+// Images API
+export const imagesAPI = {
+  // Resolves to { urls: { storedUrl: signedUrl }, expires_at }; signs 200 URLs per request
+  sign: async (urls) => {
+    const stored = [...new Set(urls.filter(isStoredImage))];
+    const signed = { urls: {}, expires_at: null };
+    for (let start = 0; start < stored.length; start += 200) {
+      const response = await api.post('/images/signed-urls', { urls: stored.slice(start, start + 200) });
+      Object.assign(signed.urls, response.data.urls);
+      signed.expires_at = signed.expires_at || response.data.expires_at;
+    }
+    return signed;
+  }
+};
+
 // Health API
 export const healthAPI = {
   check: async () => {
@@ -242,8 +384,7 @@ export const healthAPI = {
 // Validation API for dMRV Studio
 export const validationAPI = {
   getQueue: async () => {
-    const response = await api.get('/validation/queue');
-    return response.data;
+    return getAllPages('/validation/queue', new URLSearchParams());
   },
 
   approveProject: async (projectId, notes = null) => {
@@ -262,4 +403,45 @@ export const validationAPI = {
   }
 };
 
+// Live updates: pushed project, credit and MRV report changes over a WebSocket.
+// onMessage receives {type: 'change', collection, operation, id, project_id,
+// changes|document} and {type: 'resync'} when the client should refetch.
+// Returns a function that closes the connection. If the server has no change
+// streams ({type: 'unavailable'}) the socket closes and callers keep polling.
+export const subscribeUpdates = (onMessage, { collections = [], projectId = null } = {}) => {
+  const params = new URLSearchParams({ token: authToken || '' });
+  if (collections.length) params.append('collections', collections.join(','));
+  if (projectId) params.append('project_id', projectId);
+  const url = `${API_BASE_URL.replace(/^http/, 'ws')}/api/ws/updates?${params.toString()}`;
+
+  let socket = null;
+  let closed = false;
+  let retryDelay = 1000;
+
+  const connect = () => {
+    socket = new WebSocket(url);
+    socket.onopen = () => { retryDelay = 1000; };
+    socket.onmessage = (event) => {
+      const message = JSON.parse(event.data);
+      if (message.type === 'unavailable') {
+        closed = true;
+      }
+      onMessage(message);
+    };
+    socket.onclose = (event) => {
+      // 1008: bad token or forbidden project; reconnecting will not help
+      if (closed || event.code === 1008) return;
+      setTimeout(connect, retryDelay);
+      retryDelay = Math.min(retryDelay * 2, 30000);
+      onMessage({ type: 'resync' });
+    };
+  };
+
+  connect();
+  return () => {
+    closed = true;
+    if (socket) socket.close();
+  };
+};
+
 export default api;
\ No newline at end of file
@@ -0,0 +1,75 @@
+"""
+Test keyset pagination cursors
+"""
+import os
+import sys
+from datetime import datetime, timezone
+
+import pytest
+
+# Add backend to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "backend"))
+
+from pagination import (  # noqa: E402
+    CursorError, PAGE_DEFAULT_LIMIT, PAGE_MAX_LIMIT, after_cursor, clamp_limit,
+    decode_cursor, decode_ranked_cursor, encode_cursor, encode_ranked_cursor
+)
+
+
+def test_cursor_round_trip_timezone_aware():
+    created_at = datetime(2024, 5, 1, 12, 30, 15, 123000, tzinfo=timezone.utc)
+    cursor = encode_cursor({"created_at": created_at, "id": "project-1"})
+    assert decode_cursor(cursor) == (created_at, "project-1")
+
+
+def test_cursor_round_trip_timezone_naive():
+    # Motor returns naive UTC datetimes unless the client is tz_aware
+    created_at = datetime(2024, 5, 1, 12, 30, 15, 123000)
+    decoded_at, doc_id = decode_cursor(encode_cursor({"created_at": created_at, "id": "project-1"}))
+    assert decoded_at == created_at
+    assert decoded_at.tzinfo is None
+    assert doc_id == "project-1"
+
+
+def test_cursor_is_url_safe_without_padding():
+    cursor = encode_cursor({"created_at": datetime(2024, 1, 1), "id": "a" * 7})
+    assert "=" not in cursor
+    assert "+" not in cursor and "/" not in cursor
+
+
+def test_ranked_cursor_round_trip():
+    created_at = datetime(2024, 5, 1, 12, 30, tzinfo=timezone.utc)
+    cursor = encode_ranked_cursor({"score": 1.75, "created_at": created_at, "id": "project-2"})
+    assert decode_ranked_cursor(cursor) == (1.75, created_at, "project-2")
+
+
+@pytest.mark.parametrize("cursor", ["", "not-a-cursor", "eyJ0IjoxfQ", "e30"])
+def test_malformed_cursor_raises_cursor_error(cursor):
+    with pytest.raises(CursorError):
+        decode_cursor(cursor)
+
+
+def test_plain_cursor_is_not_a_ranked_cursor():
+    cursor = encode_cursor({"created_at": datetime(2024, 1, 1), "id": "project-1"})
+    with pytest.raises(CursorError):
+        decode_ranked_cursor(cursor)
+
+
+def test_after_cursor_keyset():
+    created_at = datetime(2024, 5, 1, 12, 30)
+    cursor = encode_cursor({"created_at": created_at, "id": "project-1"})
+    keyset = {"$or": [
+        {"created_at": {"$lt": created_at}},
+        {"created_at": created_at, "id": {"$lt": "project-1"}},
+    ]}
+    assert after_cursor({}, cursor) == keyset
+    assert after_cursor({"status": "draft"}, cursor) == {"$and": [{"status": "draft"}, keyset]}
+    assert after_cursor({"status": "draft"}, None) == {"status": "draft"}
+
+
+@pytest.mark.parametrize("limit, expected", [
+    (None, PAGE_DEFAULT_LIMIT), (0, PAGE_DEFAULT_LIMIT), (-5, PAGE_DEFAULT_LIMIT),
+    (10, 10), (PAGE_MAX_LIMIT + 1, PAGE_MAX_LIMIT),
+])
+def test_clamp_limit(limit, expected):
+    assert clamp_limit(limit) == expected